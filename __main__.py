@@ -2,11 +2,12 @@ import sys
 from src.vista.InterfazRecetario import App_Recetario
 # from src.logica.LogicaMock import LogicaMock
 from src.logica.logica_recetario import LogicaRecetario
+from src.logica.logica_recetario_cache import LogicaRecetarioCache
 
 if __name__ == '__main__':
     # Punto inicial de la aplicación
 
-    logica = LogicaRecetario()
+    logica = LogicaRecetarioCache(LogicaRecetario())
 
     app = App_Recetario(sys.argv, logica)
     sys.exit(app.exec_())
\ No newline at end of file
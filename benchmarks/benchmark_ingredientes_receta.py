@@ -0,0 +1,75 @@
+'''
+Mide el tiempo de LogicaRecetario.dar_ingredientes_receta a medida que crece el
+catálogo de ingredientes. El número de ingredientes de la receta se mantiene fijo,
+por lo que el tiempo debe mantenerse constante sin importar el tamaño del catálogo.
+
+Uso:
+    python -m benchmarks.benchmark_ingredientes_receta
+'''
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from src.logica.logica_recetario import LogicaRecetario
+from src.modelo.declarative_base import Base, crear_motor
+from src.modelo.ingrediente import Ingrediente
+from src.modelo.ingrediente_receta import IngredienteReceta
+from src.modelo.receta import Receta
+
+TAMANOS_CATALOGO = [1000, 10000, 50000]
+INGREDIENTES_POR_RECETA = 15
+REPETICIONES = 50
+
+
+def preparar_base_datos(session, tamano_catalogo):
+    session.bulk_insert_mappings(Ingrediente, [
+        {
+            'nombre': 'Ingrediente {}'.format(i),
+            'unidadMedida': 'libra',
+            'sitioCompra': 'Plaza',
+            'valorUnidad': 1000 + i
+        }
+        for i in range(tamano_catalogo)
+    ])
+    receta = Receta(nombre='Receta', tiempoPreparacion='01:00:00', personasBase=4,
+                    caloriasPorcion=500, instrucciones='Mezclar')
+    session.add(receta)
+    session.flush()
+
+    # Los ingredientes de la receta quedan repartidos por todo el catálogo
+    paso = tamano_catalogo // INGREDIENTES_POR_RECETA
+    session.bulk_insert_mappings(IngredienteReceta, [
+        {'receta': receta.id, 'ingrediente': 1 + i * paso, 'cantidad': i + 1}
+        for i in range(INGREDIENTES_POR_RECETA)
+    ])
+    session.commit()
+    return receta.id
+
+
+def medir(tamano_catalogo):
+    with tempfile.TemporaryDirectory() as directorio:
+        motor = crear_motor(url='sqlite:///' + os.path.join(directorio, 'benchmark.sqlite'))
+        Base.metadata.create_all(motor)
+        session = sessionmaker(bind=motor)()
+        id_receta = preparar_base_datos(session, tamano_catalogo)
+
+        logica = LogicaRecetario(motor)
+
+        tiempos = []
+        for _ in range(REPETICIONES):
+            inicio = time.perf_counter()
+            logica.dar_ingredientes_receta(id_receta)
+            tiempos.append(time.perf_counter() - inicio)
+
+        session.close()
+        motor.dispose()
+        return statistics.median(tiempos)
+
+
+if __name__ == '__main__':
+    print('{:>10}  {:>12}'.format('catalogo', 'mediana (ms)'))
+    for tamano in TAMANOS_CATALOGO:
+        print('{:>10}  {:>12.3f}'.format(tamano, medir(tamano) * 1000))
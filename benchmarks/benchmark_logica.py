@@ -0,0 +1,273 @@
+'''
+Mide los métodos de LogicaRecetario sobre recetarios sintéticos de distintos tamaños
+(ver benchmarks.generador_datos): listas completas y paginadas, búsqueda, detalle,
+validaciones, escrituras, ingredientes de una receta, preparación y lista de compras.
+
+De cada operación se reportan los percentiles 50 y 95 del tiempo, la cantidad de sentencias
+SQL por llamada y el pico de memoria de una llamada (tracemalloc). Cada tamaño se mide sobre
+una copia de su base de datos, así las escrituras no cambian la base guardada y todas las
+corridas parten del mismo estado.
+
+Con --salida los resultados se guardan en JSON. Con --comparar se comparan contra un archivo
+guardado antes y se marcan como regresión las operaciones cuyo p50 crece más que la tolerancia
+(50 % por defecto), cuyo pico de memoria crece más de 25 % o que hacen más consultas; en ese
+caso el proceso termina con código 1. Conviene guardar la base en la misma máquina.
+
+Por defecto se miden 1k y 10k filas, que corren en unos segundos. --completo mide 1k, 10k, 100k
+y 1M: en una máquina de desarrollo la base de 1M tarda unos 5 minutos en generarse la primera
+vez (ocupa 2 GB) y medirla otros 5, y dar_ingredientes llega a un pico de 1,4 GB de memoria.
+
+Uso:
+    python -m benchmarks.benchmark_logica [--tamanos 1000 10000 | --completo] [--repeticiones 30]
+                                          [--salida resultados.json] [--comparar base.json] [--tolerancia 0.5]
+'''
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import sqlalchemy
+from sqlalchemy import event
+
+from benchmarks.generador_datos import DIRECTORIO, SEMILLA, dar_base_datos, dar_vocabulario
+from src.logica.logica_recetario import LogicaRecetario
+from src.modelo.declarative_base import crear_motor
+
+# Por defecto se miden los tamaños que corren en pocos minutos; --completo mide los cuatro
+TAMANOS = [1000, 10000]
+TAMANOS_COMPLETOS = [1000, 10000, 100000, 1000000]
+REPETICIONES = 30
+# Las listas completas crecen con el recetario (con 1M de filas cada llamada toma segundos): se
+# repiten menos veces a partir de FILAS_LISTAS_COMPLETAS, pero al menos REPETICIONES_LISTAS_COMPLETAS
+REPETICIONES_LISTAS_COMPLETAS = 3
+FILAS_LISTAS_COMPLETAS = 1000
+TAMANO_PAGINA = 50
+PARES_POR_LISTA = 10
+# Los tiempos varían entre corridas (sobre todo las escrituras, que esperan al disco); la cantidad
+# de consultas y la memoria son casi deterministas y se comparan con menos holgura
+TOLERANCIA = 0.5
+TOLERANCIA_MEMORIA = 0.25
+# Diferencias menores que éstas se consideran ruido aunque superen la tolerancia
+DIFERENCIA_MINIMA_MS = 0.5
+DIFERENCIA_MINIMA_KB = 64
+
+
+def percentil(valores, porcentaje):
+    ''' Percentil por rango más cercano de una lista de valores '''
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(porcentaje / 100 * len(ordenados)) - 1)]
+
+
+def dar_operaciones(logica, tamano, cantidad, semilla):
+    '''
+    Retorna las operaciones a medir como tuplas (nombre, llamar, lista_completa, escritura).
+    llamar(i) hace la i-ésima llamada, con i entre 0 y cantidad - 1; los argumentos se eligen
+    al azar con la semilla, así dos corridas hacen exactamente las mismas llamadas.
+    '''
+    aleatorio = random.Random(semilla)
+    elegir = lambda: [aleatorio.randint(1, tamano) for _ in range(cantidad)]
+    ids_recetas, ids_ingredientes = elegir(), elegir()
+    recetas = [logica.dar_receta(id_receta) for id_receta in ids_recetas]
+    palabras = [plato.split()[0] for plato in dar_vocabulario(semilla)['platos']]
+    busquedas = [aleatorio.choice(palabras) for _ in range(cantidad)]
+    listas_pares = [[(aleatorio.randint(1, tamano), aleatorio.randint(1, 20)) for _ in range(PARES_POR_LISTA)]
+                    for _ in range(cantidad)]
+    costos = [aleatorio.randint(0, 5000000) for _ in range(cantidad)]
+    creadas = {'recetas': [], 'ingredientes': []}
+
+    def nombre_nuevo(prefijo, i):
+        return '{} benchmark {}'.format(prefijo, i)
+
+    def crear_receta(i):
+        cambio = logica.crear_receta(nombre_nuevo('Receta', i), '01:00:00', 4, 500, 'Mezclar y hornear')
+        creadas['recetas'].append(cambio['receta']['id'])
+
+    def crear_ingrediente(i):
+        cambio = logica.crear_ingrediente(nombre_nuevo('Ingrediente', i), 'libra', 1000, 'Plaza')
+        creadas['ingredientes'].append(cambio['ingrediente']['id'])
+
+    return [
+        ('dar_recetas', lambda i: logica.dar_recetas(), True, False),
+        ('dar_recetas_pagina', lambda i: logica.dar_recetas_pagina(TAMANO_PAGINA), False, False),
+        ('dar_recetas_pagina (despues_de)', lambda i: logica.dar_recetas_pagina(
+            TAMANO_PAGINA, {'id': recetas[i]['id'], 'nombre': recetas[i]['nombre']}), False, False),
+        ('dar_recetas_por_costo', lambda i: logica.dar_recetas_por_costo(), True, False),
+        ('dar_recetas_por_costo (rango)', lambda i: logica.dar_recetas_por_costo(
+            costos[i], costos[i] + 10000), False, False),
+        ('buscar_recetas', lambda i: logica.buscar_recetas(busquedas[i], TAMANO_PAGINA), False, False),
+        ('dar_ingredientes', lambda i: logica.dar_ingredientes(), True, False),
+        ('dar_ingredientes_pagina', lambda i: logica.dar_ingredientes_pagina(TAMANO_PAGINA), False, False),
+        ('dar_receta', lambda i: logica.dar_receta(ids_recetas[i]), False, False),
+        ('dar_ingredientes_receta', lambda i: logica.dar_ingredientes_receta(ids_recetas[i]), False, False),
+        ('validar_crear_editar_receta', lambda i: logica.validar_crear_editar_receta(
+            -1, nombre_nuevo('Receta', i), '01:00:00', 4, 500, 'Mezclar'), False, False),
+        ('validar_crear_editar_ingrediente', lambda i: logica.validar_crear_editar_ingrediente(
+            nombre_nuevo('Ingrediente', i), 'libra', 1000, 'Plaza'), False, False),
+        ('validar_crear_editar_ingReceta', lambda i: logica.validar_crear_editar_ingReceta(
+            recetas[i], ids_ingredientes[i], 2), False, False),
+        ('dar_preparacion', lambda i: logica.dar_preparacion(ids_recetas[i], 10), False, False),
+        ('dar_preparaciones', lambda i: logica.dar_preparaciones(listas_pares[i]), False, False),
+        ('dar_lista_compras', lambda i: logica.dar_lista_compras(listas_pares[i]), False, False),
+        # Las escrituras trabajan sobre las filas que crean las primeras
+        ('crear_receta', crear_receta, False, True),
+        ('crear_ingrediente', crear_ingrediente, False, True),
+        ('agregar_ingrediente_receta', lambda i: logica.agregar_ingrediente_receta(
+            {'id': creadas['recetas'][i]}, ids_ingredientes[i], 2), False, True),
+        ('editar_receta', lambda i: logica.editar_receta(
+            creadas['recetas'][i], nombre_nuevo('Receta editada', i), '02:00:00', 6, 400, 'Hervir'), False, True),
+        ('editar_ingrediente', lambda i: logica.editar_ingrediente(
+            creadas['ingredientes'][i], nombre_nuevo('Ingrediente editado', i), 'kilo', 2000, 'Plaza'), False, True),
+        ('eliminar_receta', lambda i: logica.eliminar_receta(creadas['recetas'][i]), False, True),
+        ('eliminar_ingrediente', lambda i: logica.eliminar_ingrediente(creadas['ingredientes'][i]), False, True),
+    ]
+
+
+def medir_operacion(motor, llamar, repeticiones, escritura):
+    '''
+    Hace repeticiones llamadas medidas y una más con tracemalloc (que hace más lentas las
+    llamadas, por eso no se cuenta en los tiempos). Las lecturas se llaman una vez antes para
+    no medir la compilación de las consultas.
+    '''
+    if not escritura:
+        llamar(0)
+
+    sentencias = []
+    contar = lambda *args: sentencias.append(1)
+    event.listen(motor, 'before_cursor_execute', contar)
+    tiempos = []
+    # Como en timeit, el recolector de basura no corre durante las llamadas medidas
+    gc.collect()
+    gc.disable()
+    try:
+        for i in range(repeticiones):
+            inicio = time.perf_counter()
+            llamar(i)
+            tiempos.append(time.perf_counter() - inicio)
+    finally:
+        gc.enable()
+        event.remove(motor, 'before_cursor_execute', contar)
+
+    tracemalloc.start()
+    try:
+        llamar(repeticiones)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'p50_ms': round(percentil(tiempos, 50) * 1000, 3),
+        'p95_ms': round(percentil(tiempos, 95) * 1000, 3),
+        'consultas': round(len(sentencias) / repeticiones, 2),
+        'memoria_pico_kb': round(pico / 1024, 1),
+        'repeticiones': repeticiones
+    }
+
+
+def medir_tamano(tamano, repeticiones, directorio, semilla):
+    ruta = dar_base_datos(tamano, directorio, semilla)
+    with tempfile.TemporaryDirectory() as temporal:
+        copia = os.path.join(temporal, os.path.basename(ruta))
+        shutil.copyfile(ruta, copia)
+        motor = crear_motor(url='sqlite:///' + copia)
+        logica = LogicaRecetario(motor)
+
+        # Cada operación hace a lo sumo repeticiones + 1 llamadas (la última con tracemalloc)
+        resultados = {}
+        for nombre, llamar, lista_completa, escritura in dar_operaciones(logica, tamano, repeticiones + 1, semilla):
+            cantidad = repeticiones
+            if lista_completa:
+                cantidad = min(repeticiones, max(REPETICIONES_LISTAS_COMPLETAS,
+                                                 repeticiones * FILAS_LISTAS_COMPLETAS // tamano))
+            resultados[nombre] = medir_operacion(motor, llamar, cantidad, escritura)
+            print('{:>10}  {:<34} {:>10.3f} {:>10.3f} {:>9.1f} {:>12.1f}'.format(
+                tamano, nombre, resultados[nombre]['p50_ms'], resultados[nombre]['p95_ms'],
+                resultados[nombre]['consultas'], resultados[nombre]['memoria_pico_kb']))
+        motor.dispose()
+    return resultados
+
+
+def comparar(resultados, base, tolerancia=TOLERANCIA):
+    '''
+    Retorna las regresiones de resultados frente a base como tuplas (tamaño, operación, métrica,
+    valor base, valor actual). Sólo se comparan los tamaños y operaciones medidos en ambos.
+    '''
+    regresiones = []
+    for tamano, operaciones in resultados['resultados'].items():
+        for nombre, actual in operaciones.items():
+            anterior = base['resultados'].get(tamano, {}).get(nombre)
+            if anterior == None:
+                continue
+            metricas = [('p50_ms', DIFERENCIA_MINIMA_MS, tolerancia),
+                        ('memoria_pico_kb', DIFERENCIA_MINIMA_KB, TOLERANCIA_MEMORIA),
+                        ('consultas', 0, 0)]
+            for metrica, diferencia_minima, tolerancia_metrica in metricas:
+                if (actual[metrica] > anterior[metrica] * (1 + tolerancia_metrica) and
+                        actual[metrica] - anterior[metrica] > diferencia_minima):
+                    regresiones.append((tamano, nombre, metrica, anterior[metrica], actual[metrica]))
+    return regresiones
+
+
+def dar_entorno():
+    return {
+        'python': platform.python_version(),
+        'sqlalchemy': sqlalchemy.__version__,
+        'sqlite': sqlite3.sqlite_version,
+        'plataforma': platform.platform()
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description='Mide los métodos de la lógica sobre recetarios sintéticos')
+    tamanos = parser.add_mutually_exclusive_group()
+    tamanos.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS)
+    tamanos.add_argument('--completo', dest='tamanos', action='store_const', const=TAMANOS_COMPLETOS,
+                         help='Mide los recetarios de 1k, 10k, 100k y 1M de filas')
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES)
+    parser.add_argument('--directorio', default=DIRECTORIO, help='Donde se guardan las bases de datos generadas')
+    parser.add_argument('--semilla', type=int, default=SEMILLA)
+    parser.add_argument('--salida', help='Archivo JSON donde se guardan los resultados')
+    parser.add_argument('--comparar', help='Archivo JSON de una corrida anterior contra el que se compara')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help='Aumento relativo del p50 que se considera regresión')
+    argumentos = parser.parse_args(argumentos)
+
+    print('{:>10}  {:<34} {:>10} {:>10} {:>9} {:>12}'.format(
+        'tamano', 'operacion', 'p50 (ms)', 'p95 (ms)', 'consultas', 'memoria (KB)'))
+    resultados = {
+        'semilla': argumentos.semilla,
+        'entorno': dar_entorno(),
+        'resultados': {
+            str(tamano): medir_tamano(tamano, argumentos.repeticiones, argumentos.directorio, argumentos.semilla)
+            for tamano in argumentos.tamanos
+        }
+    }
+
+    if argumentos.salida != None:
+        with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+    if argumentos.comparar != None:
+        with open(argumentos.comparar, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        if base['semilla'] != resultados['semilla']:
+            print('Advertencia: la base se midió con otra semilla y otros datos')
+        regresiones = comparar(resultados, base, argumentos.tolerancia)
+        for tamano, nombre, metrica, anterior, actual in regresiones:
+            print('REGRESION {:>10}  {:<34} {:<16} {:>10} -> {}'.format(tamano, nombre, metrica, anterior, actual))
+        if len(regresiones) > 0:
+            return 1
+        print('Sin regresiones frente a {}'.format(argumentos.comparar))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
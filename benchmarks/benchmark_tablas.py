@@ -0,0 +1,101 @@
+'''
+Mide, sin pantalla (plataforma offscreen de Qt), el tiempo de poblar las listas de
+ingredientes y de ingredientes de una receta con 10.000 filas y el de editar una fila.
+Con --grilla N también mide, como referencia, la grilla anterior que creaba un widget por
+celda. Con unos cientos de filas ya toma segundos, por eso no se mide por defecto.
+
+Uso:
+    python -m benchmarks.benchmark_tablas [--filas N] [--grilla N]
+'''
+import argparse
+import os
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QApplication, QGridLayout, QLabel, QPushButton, QScrollArea, QWidget
+
+from src.logica.indice_prefijos import IndicePrefijos
+from src.vista.VistaListaIngredientes import VistaListaIngredientes
+from src.vista.VistaListaIngredientesReceta import VistaListaIngredientesReceta
+
+FILAS = 10000
+
+
+def dar_ingredientes(cantidad):
+    return [
+        {'id': i, 'nombre': 'Ingrediente {:05d}'.format(i), 'unidad': 'libra', 'valor': 1000 + i,
+         'sitioCompra': 'Plaza {}'.format(i % 10)}
+        for i in range(cantidad)
+    ]
+
+
+def dar_ingredientes_receta(cantidad):
+    return [
+        {'ingrediente': 'Ingrediente {:05d}'.format(i), 'unidad': 'libra', 'cantidad': float(i % 7 + 1)}
+        for i in range(cantidad)
+    ]
+
+
+def medir(aplicacion, poblar, ventana):
+    ''' Retorna los segundos que toma poblar la ventana y pintarla '''
+    inicio = time.perf_counter()
+    poblar()
+    aplicacion.processEvents()
+    ventana.grab()
+    return time.perf_counter() - inicio
+
+
+def poblar_grilla(ingredientes):
+    ''' Reproduce la vista anterior: etiquetas y botones por cada fila dentro de un QGridLayout '''
+    ventana = QScrollArea()
+    ventana.setWidgetResizable(True)
+    contenido = QWidget()
+    distribuidor = QGridLayout(contenido)
+    ventana.setWidget(contenido)
+    ventana.resize(700, 300)
+    ventana.show()
+    for numero_fila, ingrediente in enumerate(ingredientes):
+        for columna, llave in enumerate(['nombre', 'unidad', 'valor', 'sitioCompra']):
+            distribuidor.addWidget(QLabel(str(ingrediente[llave])), numero_fila, columna)
+        for columna, icono in [(4, 'src/recursos/004-edit-button.png'), (5, 'src/recursos/005-delete.png')]:
+            boton = QPushButton('')
+            boton.setIcon(QIcon(icono))
+            distribuidor.addWidget(boton, numero_fila, columna)
+    return ventana
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description='Mide el tiempo de poblar las tablas de ingredientes')
+    parser.add_argument('--filas', type=int, default=FILAS)
+    parser.add_argument('--grilla', type=int, default=0, help='Filas con las que se mide la grilla anterior')
+    argumentos = parser.parse_args(argumentos)
+
+    aplicacion = QApplication.instance() or QApplication([])
+    ingredientes = dar_ingredientes(argumentos.filas)
+    resultados = []
+
+    vista = VistaListaIngredientes(None)
+    resultados.append(('ingredientes', medir(aplicacion, lambda: vista.mostrar_ingredientes(ingredientes), vista)))
+    resultados.append(('ingredientes (editar fila)', medir(
+        aplicacion, lambda: vista.modelo_ingredientes.actualizar_fila(5, dict(ingredientes[5], valor=1)), vista)))
+    vista.hide()
+
+    vista_receta = VistaListaIngredientesReceta(None, {'nombre': 'Receta'}, IndicePrefijos(ingredientes))
+    resultados.append(('ingredientes receta', medir(
+        aplicacion, lambda: vista_receta.mostrar_ing_receta(dar_ingredientes_receta(argumentos.filas)), vista_receta)))
+    vista_receta.hide()
+
+    if argumentos.grilla > 0:
+        ventanas = []
+        resultados.append(('grilla anterior ({} filas)'.format(argumentos.grilla), medir(
+            aplicacion, lambda: ventanas.append(poblar_grilla(ingredientes[:argumentos.grilla])), QWidget())))
+
+    print('{:>28}  {:>10}'.format('tabla ({} filas)'.format(argumentos.filas), 'tiempo (ms)'))
+    for nombre, segundos in resultados:
+        print('{:>28}  {:>10.1f}'.format(nombre, segundos * 1000))
+
+
+if __name__ == '__main__':
+    main()
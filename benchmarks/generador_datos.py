@@ -0,0 +1,142 @@
+'''
+Generador determinista de recetarios sintéticos para los benchmarks.
+
+Los textos salen de Faker con FoodProvider (platos, ingredientes, medidas, descripciones) y
+compañías para los sitios de compra, con una semilla fija. Faker sólo se usa para llenar
+unas listas de vocabulario: las filas se arman combinando esas listas con random.Random(semilla),
+así generar un millón de filas toma segundos y la misma semilla produce siempre la misma base
+de datos. A cada nombre se le agrega un número para que no se repita.
+
+Un recetario de tamaño N tiene N recetas, N ingredientes y INGREDIENTES_POR_RECETA líneas por receta.
+Las bases de datos se guardan en un directorio y se reutilizan mientras no cambie el tamaño,
+la semilla o VERSION_GENERADOR.
+
+Uso:
+    python -m benchmarks.generador_datos --tamano 10000 [--directorio .benchmarks]
+'''
+import argparse
+import os
+import random
+import time
+
+from faker import Faker
+from faker.providers import company
+from faker_food import FoodProvider
+from sqlalchemy import insert
+from sqlalchemy.schema import CreateTable
+
+from src.logica.importacion import en_lotes
+from src.logica.logica_recetario import LogicaRecetario
+from src.modelo.declarative_base import crear_motor
+from src.modelo.ingrediente import Ingrediente
+from src.modelo.ingrediente_receta import IngredienteReceta
+from src.modelo.receta import Receta
+
+SEMILLA = 15
+VERSION_GENERADOR = 1
+DIRECTORIO = '.benchmarks'
+INGREDIENTES_POR_RECETA = 8
+TAMANO_LOTE = 5000
+TAMANO_VOCABULARIO = 300
+
+
+def dar_vocabulario(semilla):
+    ''' Listas de textos generadas con Faker; siempre las mismas para la misma semilla '''
+    fake = Faker()
+    fake.add_provider(FoodProvider)
+    fake.add_provider(company)
+    fake.seed_instance(semilla)
+    # FoodProvider elige con el módulo random y no con el generador de Faker: también se fija
+    # esa semilla y después se restaura el estado anterior
+    estado = random.getstate()
+    random.seed(semilla)
+    try:
+        return {
+            'platos': [fake.dish() for _ in range(TAMANO_VOCABULARIO)],
+            'ingredientes': [fake.ingredient() for _ in range(TAMANO_VOCABULARIO)],
+            'unidades': [fake.metric_measurement() for _ in range(20)],
+            'sitios': [fake.company() for _ in range(50)],
+            'descripciones': [fake.dish_description() for _ in range(TAMANO_VOCABULARIO)],
+        }
+    finally:
+        random.setstate(estado)
+
+
+def dar_filas_ingredientes(tamano, vocabulario, aleatorio):
+    for i in range(tamano):
+        yield {
+            'nombre': '{} {}'.format(aleatorio.choice(vocabulario['ingredientes']), i),
+            'unidadMedida': aleatorio.choice(vocabulario['unidades']),
+            'sitioCompra': aleatorio.choice(vocabulario['sitios']),
+            'valorUnidad': aleatorio.randint(100, 250000)
+        }
+
+
+def dar_filas_recetas(tamano, vocabulario, aleatorio):
+    for i in range(tamano):
+        yield {
+            'nombre': '{} {}'.format(aleatorio.choice(vocabulario['platos']), i),
+            'tiempoPreparacion': '{:02d}:{:02d}:00'.format(aleatorio.randint(0, 4), aleatorio.randint(0, 59)),
+            'personasBase': aleatorio.randint(1, 8),
+            'caloriasPorcion': aleatorio.randint(100, 2500),
+            'instrucciones': ' '.join(aleatorio.sample(vocabulario['descripciones'], 4))
+        }
+
+
+def dar_filas_ingredientes_receta(tamano, aleatorio):
+    for id_receta in range(1, tamano + 1):
+        for id_ingrediente in aleatorio.sample(range(1, tamano + 1), min(INGREDIENTES_POR_RECETA, tamano)):
+            yield {'receta': id_receta, 'ingrediente': id_ingrediente, 'cantidad': aleatorio.randint(1, 20) / 2}
+
+
+def poblar(motor, tamano, semilla=SEMILLA):
+    ''' Inserta el recetario de tamaño N en una base de datos con las tablas vacías '''
+    vocabulario = dar_vocabulario(semilla)
+    aleatorio = random.Random(semilla)
+    tablas = [
+        (Ingrediente, dar_filas_ingredientes(tamano, vocabulario, aleatorio)),
+        (Receta, dar_filas_recetas(tamano, vocabulario, aleatorio)),
+        (IngredienteReceta, dar_filas_ingredientes_receta(tamano, aleatorio)),
+    ]
+    with motor.begin() as conexion:
+        for modelo, filas in tablas:
+            sentencia = insert(modelo.__table__)
+            for lote in en_lotes(filas, TAMANO_LOTE):
+                conexion.execute(sentencia, lote)
+
+
+def dar_base_datos(tamano, directorio=DIRECTORIO, semilla=SEMILLA):
+    ''' Retorna la ruta de la base de datos de tamaño N; la genera si todavía no existe '''
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, 'recetario_{}_{}_v{}.sqlite'.format(tamano, semilla, VERSION_GENERADOR))
+    if os.path.exists(ruta):
+        return ruta
+
+    ruta_temporal = ruta + '.tmp'
+    if os.path.exists(ruta_temporal):
+        os.remove(ruta_temporal)
+    motor = crear_motor(url='sqlite:///' + ruta_temporal)
+    # Se crean sólo las tablas base y sin sus índices (CreateTable no los incluye), se cargan las filas
+    # y después la lógica actualiza el esquema como con una base de datos anterior: crea los índices y
+    # calcula receta_costo y el índice de búsqueda de una vez, que es mucho más rápido que mantenerlos
+    # fila por fila durante la carga
+    with motor.begin() as conexion:
+        for modelo in (Ingrediente, Receta, IngredienteReceta):
+            conexion.execute(CreateTable(modelo.__table__))
+    poblar(motor, tamano, semilla)
+    LogicaRecetario(motor)
+    motor.dispose()
+    os.replace(ruta_temporal, ruta)
+    return ruta
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Genera un recetario sintético para los benchmarks')
+    parser.add_argument('--tamano', type=int, required=True)
+    parser.add_argument('--directorio', default=DIRECTORIO)
+    parser.add_argument('--semilla', type=int, default=SEMILLA)
+    argumentos = parser.parse_args()
+
+    inicio = time.perf_counter()
+    print(dar_base_datos(argumentos.tamano, argumentos.directorio, argumentos.semilla))
+    print('{:.1f} s'.format(time.perf_counter() - inicio))
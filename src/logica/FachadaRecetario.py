@@ -6,10 +6,47 @@ class FachadaRecetario:
     def dar_recetas(self):
         ''' Retorna la lista de recetas registradas en el sistema
         Retorna:
-            (list): La lista con los objetos de recetas
+            (list): La lista con los objetos de recetas. Cada receta incluye su 'id',
+            que es el identificador que reciben dar_receta, editar_receta y eliminar_receta, y su
+            'nombre'; los demás datos, como la preparación, se consultan con dar_receta
         '''
         raise NotImplementedError("Método no implementado")
     
+    def dar_recetas_pagina(self, tamano_pagina, despues_de=None):
+        ''' Retorna una página de la lista de recetas ordenada por nombre
+        Parámetros:
+            tamano_pagina (int): La cantidad máxima de recetas a retornar
+            despues_de (dict): La última receta de la página anterior, o None para la primera página
+        Retorna:
+            (list): La lista con las recetas de la página
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def dar_recetas_por_costo(self, costo_minimo=None, costo_maximo=None, descendente=False):
+        ''' Retorna la lista de recetas ordenada por su costo base
+        Parámetros:
+            costo_minimo (float): El costo mínimo de las recetas a retornar, o None
+            costo_maximo (float): El costo máximo de las recetas a retornar, o None
+            descendente (bool): True para ordenar de la más costosa a la más barata
+        Retorna:
+            (list): La lista con las recetas, cada una con su costo
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def buscar_recetas(self, texto, tamano_pagina=50, despues_de=None):
+        ''' Busca las recetas que contienen todas las palabras del texto (o palabras que empiezan
+        por ellas) en su nombre o sus instrucciones, sin distinguir mayúsculas ni tildes
+        Parámetros:
+            texto (string): El texto escrito por el usuario
+            tamano_pagina (int): La cantidad máxima de recetas a retornar
+            despues_de (dict): La última receta de la página anterior, o None para la primera página
+        Retorna:
+            (list): Las recetas de la página, de la más a la menos relevante, cada una con su 'relevancia'.
+            Con demasiadas coincidencias para ordenarlas la relevancia es None y las recetas se
+            entregan en el orden del índice
+        '''
+        raise NotImplementedError("Método no implementado")
+
     def dar_receta(self, id_receta):
         ''' Retorna una receta a partir de su identificador
         Parámetros:
@@ -23,6 +60,8 @@ class FachadaRecetario:
     def validar_crear_editar_receta(self, id_receta, receta, tiempo, personas, calorias, preparacion):
         ''' Valida que una receta se pueda crear o editar
         Parámetros:
+            id_receta (int): El identificador de la receta editada, que no cuenta como otra
+                             receta con el mismo nombre, o -1 si la receta es nueva
             receta (string): El nombre de la receta
             tiempo (string): El tiempo de preparación de la receta
             personas (string): La cantidad de personas de la receta
@@ -42,6 +81,22 @@ class FachadaRecetario:
             personas (string): La cantidad de personas de la receta
             calorias (string): Calorías por porción
             preparación (string): Proceso de preparación de la receta
+        Retorna:
+            (dict): El cambio, para actualizar sólo la fila afectada de la lista: 'receta' con la
+            receta, 'posicion_anterior' y 'posicion' en el orden de dar_recetas (None si la receta
+            no estaba o ya no está en la lista); False si no se pudo crear
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def importar_recetas(self, fuente):
+        ''' Importa recetas con sus ingredientes desde un archivo JSON Lines. Cada línea es un
+        objeto con nombre, tiempo, personas, calorias, preparacion y la lista 'ingredientes'
+        con el nombre, la unidad y la cantidad de cada ingrediente ya registrado
+        Parámetros:
+            fuente (string o archivo): La ruta o el archivo abierto a importar
+        Retorna:
+            (dict): La cantidad de recetas 'importados' y la lista de 'errores'
+            con el número de línea y el mensaje de cada receta rechazada
         '''
         raise NotImplementedError("Método no implementado")
 
@@ -53,6 +108,10 @@ class FachadaRecetario:
             personas (string): La cantidad de personas de la receta
             calorias (string): Calorías por porción
             preparación (string): Proceso de preparación de la receta
+        Retorna:
+            (dict): El cambio, para actualizar sólo la fila afectada de la lista: 'receta' con la
+            receta, 'posicion_anterior' y 'posicion' en el orden de dar_recetas (None si la receta
+            no estaba o ya no está en la lista); False si no se pudo editar
         '''
         raise NotImplementedError("Método no implementado")
 
@@ -60,6 +119,10 @@ class FachadaRecetario:
         ''' Elimina una receta de la lista de recetas
         Parámetros:
             id_receta (int): El identificador de la receta que se desea eliminar
+        Retorna:
+            (dict): El cambio, para actualizar sólo la fila afectada de la lista: 'receta' con la
+            receta, 'posicion_anterior' y 'posicion' en el orden de dar_recetas (None si la receta
+            no estaba o ya no está en la lista); False si no se pudo eliminar
         '''
         raise NotImplementedError("Método no implementado")
     
@@ -71,6 +134,16 @@ class FachadaRecetario:
         '''
         raise NotImplementedError("Método no implementado")
     
+    def dar_ingredientes_pagina(self, tamano_pagina, despues_de=None):
+        ''' Retorna una página de la lista de ingredientes ordenada por nombre, unidad y sitio de compra
+        Parámetros:
+            tamano_pagina (int): La cantidad máxima de ingredientes a retornar
+            despues_de (dict): El último ingrediente de la página anterior, o None para la primera página
+        Retorna:
+            (list): La lista con los ingredientes de la página
+        '''
+        raise NotImplementedError("Método no implementado")
+    
     def dar_ingrediente(self, id_ingrediente):
         ''' Retorna un ingrediente dado su id
         Retorna:
@@ -78,13 +151,15 @@ class FachadaRecetario:
         '''
         raise NotImplementedError("Método no implementado")
 
-    def validar_crear_editar_ingrediente(self, nombre, unidad, valor, sitioCompra):
+    def validar_crear_editar_ingrediente(self, nombre, unidad, valor, sitioCompra, id_ingrediente=None):
         ''' Valida que un ingrediente se pueda crear o editar
         Parámetros:
             nombre (string): El nombre del ingrediente
             unidad (string): Unidad
             valor (string): Valor del ingrediente para la unidad
             sitioCompra (string): lugar en el que se compra el ingrediente
+            id_ingrediente (int): Al editar, el identificador del ingrediente editado, que no
+                                  cuenta como otro ingrediente con el mismo nombre y unidad
         Retorna:
             (string): El mensaje de error generado al presentarse errores en la
             validación o una cadena de caracteres vacía si no hay errores.
@@ -99,10 +174,27 @@ class FachadaRecetario:
             unidad (string): Unidad
             valor (string): Valor del ingrediente para la unidad
             sitioCompra (string): lugar en el que se compra el ingrediente
+        Retorna:
+            (dict): El cambio, para actualizar sólo la fila afectada de la lista: 'ingrediente' con el
+            ingrediente, 'posicion_anterior' y 'posicion' en el orden de dar_ingredientes (None si el
+            ingrediente no estaba o ya no está en la lista); False si no se pudo crear
         '''
         raise NotImplementedError("Método no implementado")
 
 
+    def importar_ingredientes(self, fuente, formato=None):
+        ''' Importa ingredientes desde un archivo CSV o JSON Lines con las columnas
+        nombre, unidad, valor y sitioCompra. Cada fila se valida con las mismas reglas
+        de validar_crear_editar_ingrediente
+        Parámetros:
+            fuente (string o archivo): La ruta o el archivo abierto a importar
+            formato (string): 'csv' o 'jsonl'; si no se indica se deduce de la extensión
+        Retorna:
+            (dict): La cantidad de ingredientes 'importados' y la lista de 'errores'
+            con el número de línea del archivo ('fila') y el mensaje de cada fila rechazada
+        '''
+        raise NotImplementedError("Método no implementado")
+
     def editar_ingrediente(self, id_ingrediente, nombre, unidad, valor, sitioCompras):
         ''' Edita un ingrediente
         Parámetros:
@@ -111,6 +203,10 @@ class FachadaRecetario:
             unidad (string): Unidad
             valor (string): Valor del ingrediente para la unidad
             sitioCompra (string): lugar en el que se compra el ingrediente
+        Retorna:
+            (dict): El cambio, para actualizar sólo la fila afectada de la lista: 'ingrediente' con el
+            ingrediente, 'posicion_anterior' y 'posicion' en el orden de dar_ingredientes (None si el
+            ingrediente no estaba o ya no está en la lista); False si no se pudo editar
         '''
         raise NotImplementedError("Método no implementado")
 
@@ -118,6 +214,20 @@ class FachadaRecetario:
         ''' Elimina un ingrediente de la lista de ingredientes
         Parámetros:
             id_ingrediente (int): El identificador del ingrediente que se desea eliminar
+        Retorna:
+            (dict): El cambio, para actualizar sólo la fila afectada de la lista: 'ingrediente' con el
+            ingrediente, 'posicion_anterior' y 'posicion' en el orden de dar_ingredientes (None si el
+            ingrediente no estaba o ya no está en la lista); False si no se pudo eliminar
+        '''
+        raise NotImplementedError("Método no implementado")
+    
+    def exportar_recetario(self, directorio, formato='jsonl'):
+        ''' Exporta las recetas, los ingredientes y los ingredientes de cada receta
+        Parámetros:
+            directorio (string): El directorio donde se escriben los archivos
+            formato (string): 'jsonl' o 'csv'
+        Retorna:
+            (dict): La cantidad de filas escritas en cada archivo
         '''
         raise NotImplementedError("Método no implementado")
     
@@ -134,34 +244,45 @@ class FachadaRecetario:
         ''' agregar el ingrediente a la recceta con la cantidad 
         Parámetros:
             receta  : La receta
-            ingrediente: El ingrediente que se va a agregar a la recita
+            ingrediente: El id del ingrediente que se va a agregar a la recita (también se acepta
+                         el diccionario con sus datos)
             cantidad: cantidad del ingredeite para la receta
-
+        Retorna:
+            (dict): El cambio, para insertar sólo la fila nueva en la lista: 'ingrediente_receta' con
+            el ingrediente, la unidad y la cantidad, 'posicion_anterior' en None y 'posicion' en el
+            orden de dar_ingredientes_receta; False si el ingrediente no existe
         '''
    
     def editar_ingrediente_receta(self, id_ingrediente_receta, receta, ingrediente, cantidad):
         ''' Edita los datos de un ingrediente
         Parámetros:
-            id_ingrediente_receta identificador de la receta
+            id_ingrediente_receta: posición del ingrediente en la lista de dar_ingredientes_receta
             receta:receta a la que pertene
-            ingrediente: ingrediente de la receeta
+            ingrediente: id del ingrediente de la receeta, o el diccionario con sus datos
             cantidad: cantidad del ingrendiente para la receta
-        
+        Retorna:
+            (dict): El cambio, para actualizar sólo la fila afectada de la lista: 'ingrediente_receta'
+            con el ingrediente, la unidad y la cantidad, 'posicion_anterior' y 'posicion' en el orden
+            de dar_ingredientes_receta; False si no se pudo editar
         '''
 
     def validar_crear_editar_ingReceta(self,receta, ingrediente, cantidad):
         ''' Valida si se puede crear o editar un ingrediente de una recieta
         Parámetros:
             receta:receta a la que pertenece
-            ingrediente: ingrediente de la receeta
+            ingrediente: id del ingrediente de la receeta, o el diccionario con sus datos
             cantidad: cantidad del ingrendiente para la receta
         '''
 
     def eliminar_ingrediente_receta(self, id_ingrediente_receta, receta):
         ''' Elimina un ingrediente de una receta de su lista de ingredientes
         Parámetros:
-            id_ingrediente_receta (int): El identificador del ingrediente de la receta que se desea eliminar
+            id_ingrediente_receta (int): La posición en la lista de dar_ingredientes_receta del
+                                         ingrediente de la receta que se desea eliminar
             receta:receta a la que pertenece
+        Retorna:
+            (dict): El cambio, como en editar_ingrediente_receta, con 'posicion' None;
+            False si el ingrediente no está en la receta
         '''
         raise NotImplementedError("Método no implementado")
 		
@@ -169,8 +290,44 @@ class FachadaRecetario:
         ''' retorna los datos de preparación de una receta para cantidad de personas que entra como parametro
         Parámetros:
             id_receta: identificador de la receta que se va a preparar
-            cantidad_personas: cantidad personas para las que se va a preparar la receta
+            cantidad_personas: cantidad personas para las que se va a preparar la receta, o una lista
+                               de cantidades para calcular varios escenarios en una sola llamada
         Retorna:
             (dic) diccionario con los datos de preparacion de la receta: nombre, cantidad peronas, calorias, costo, tiempo de preparacion},
                   (list) ingredientes de la receta 
+            Si cantidad_personas es una lista se retorna la lista de diccionarios, uno por escenario
+            False si la receta no existe y 'Numero de Personas Invalido' si no tiene personas base
+            o si cantidad_personas no es un entero positivo
         '''
+
+    def dar_preparaciones(self, lista_pares):
+        ''' retorna los datos de preparación de varias recetas en una sola llamada
+        Parámetros:
+            lista_pares: lista de tuplas (id_receta, cantidad_personas)
+        Retorna:
+            (list) un diccionario por cada par con la misma forma que retorna dar_preparacion,
+                   o False en la posición de las recetas que no existen y 'Numero de Personas Invalido'
+                   en la de las recetas sin personas base o los pares cuya cantidad de personas no es
+                   un entero positivo
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def dar_lista_compras(self, lista_pares):
+        ''' retorna la lista de compras consolidada de un menú
+        Parámetros:
+            lista_pares: lista de tuplas (id_receta, cantidad_personas)
+        Retorna:
+            (dict) con la lista 'sitios' (un diccionario por sitio de compra con su nombre en 'sitio',
+                   sus 'ingredientes' con nombre, unidad, cantidad y valor, y su 'subtotal') y el 'total'.
+                   Las recetas que no existen o no tienen personas base no se incluyen.
+            'Numero de Personas Invalido' si alguna cantidad de personas no es un entero positivo
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def dar_contador_cambios(self):
+        ''' Retorna un número que aumenta cada vez que se confirma un cambio en los datos
+        Retorna:
+            (int) el valor actual del contador; si es igual al de una consulta anterior,
+                  los datos no han cambiado desde esa consulta
+        '''
+        raise NotImplementedError("Método no implementado")
@@ -2,6 +2,8 @@
 Esta clase es tan sólo un mock con datos para probar la interfaz
 '''
 from src.logica.FachadaRecetario import FachadaRecetario
+from src.logica.indice_prefijos import normalizar
+import re
 
 
 class LogicaMock(FachadaRecetario):
@@ -32,82 +34,186 @@ class LogicaMock(FachadaRecetario):
                              {'nombre': 'Papa criolla', 'unidad': 'libra', 'cantidad': 2, 'valor': 8180},
                              {'nombre': 'Papa pastusa', 'unidad': 'libra', 'cantidad': 4, 'valor': 4000},
                              {'nombre': 'Aguacate', 'unidad': 'unidad', 'cantidad': 2,'valor': 10000}]}
+        self.contador_cambios = 0
 
 
 
     def dar_recetas(self):
-        return self.recetas.copy()
+        #En el mock el identificador de cada receta es su posición en la lista
+        return [dict(receta, id=indice) for indice, receta in enumerate(self.recetas)]
     
+    def dar_recetas_pagina(self, tamano_pagina, despues_de=None):
+        recetas = sorted(self.dar_recetas(), key=lambda x: (x['nombre'], x['id']))
+        if despues_de != None:
+            recetas = [receta for receta in recetas if (receta['nombre'], receta['id']) > (despues_de['nombre'], despues_de['id'])]
+        return recetas[:tamano_pagina]
+    
+    def buscar_recetas(self, texto, tamano_pagina=50, despues_de=None):
+        #Las recetas que tienen todas las palabras en el nombre o la preparación, en el orden de la lista
+        palabras = re.findall(r'\w+', normalizar(texto or ''))
+        if len(palabras) == 0:
+            return []
+        recetas = []
+        for receta in self.dar_recetas():
+            contenido = normalizar(receta['nombre'] + ' ' + receta['preparacion'])
+            if all(palabra in contenido for palabra in palabras):
+                recetas.append(dict(receta, relevancia=None))
+        if despues_de != None:
+            recetas = [receta for receta in recetas if receta['id'] > despues_de['id']]
+        return recetas[:tamano_pagina]
+
     def dar_receta(self, id_receta):
-        return self.recetas[id_receta].copy()
+        return dict(self.recetas[id_receta], id=id_receta)
+
+    def dar_posicion_receta(self, id_receta):
+        #Posición de la receta en el orden (nombre, id) de dar_recetas_pagina
+        llave = (self.recetas[id_receta]['nombre'], id_receta)
+        return len([indice for indice, receta in enumerate(self.recetas) if (receta['nombre'], indice) < llave])
     
     def validar_crear_editar_receta(self, id_receta, receta, tiempo, personas, calorias, preparacion):
         return ""
     
     def crear_receta(self, receta, tiempo, personas, calorias, preparacion):
+        self.contador_cambios += 1
         self.recetas.append({'nombre': receta, 'tiempo': tiempo, 'personas': personas, 'calorias': calorias, 'preparacion': preparacion})
+        id_receta = len(self.recetas) - 1
+        return {'receta': self.dar_receta(id_receta), 'posicion_anterior': None, 'posicion': self.dar_posicion_receta(id_receta)}
 
     def editar_receta(self, id_receta, receta, tiempo, personas, calorias, preparacion):
+        self.contador_cambios += 1
+        posicion_anterior = self.dar_posicion_receta(id_receta)
         self.recetas[id_receta]['nombre'] = receta
         self.recetas[id_receta]['tiempo'] = tiempo
         self.recetas[id_receta]['personas'] = personas
         self.recetas[id_receta]['calorias'] = calorias
         self.recetas[id_receta]['preparacion'] = preparacion
+        return {'receta': self.dar_receta(id_receta), 'posicion_anterior': posicion_anterior,
+                'posicion': self.dar_posicion_receta(id_receta)}
 
     def eliminar_receta(self, id_receta):
+        self.contador_cambios += 1
+        cambio = {'receta': self.dar_receta(id_receta), 'posicion_anterior': self.dar_posicion_receta(id_receta),
+                  'posicion': None}
         del self.recetas[id_receta]
+        return cambio
 
 
     def dar_ingredientes(self):
-        return self.ingredientes.copy()
+        return [dict(ingrediente, id=indice) for indice, ingrediente in enumerate(self.ingredientes)]
+
+    def dar_ingredientes_pagina(self, tamano_pagina, despues_de=None):
+        llave = lambda x: (x['nombre'], x['unidad'], x['sitioCompra'], x['id'])
+        ingredientes = sorted(self.dar_ingredientes(), key=llave)
+        if despues_de != None:
+            ingredientes = [ingrediente for ingrediente in ingredientes if llave(ingrediente) > llave(despues_de)]
+        return ingredientes[:tamano_pagina]
     
     def dar_ingrediente(self, id_ingrediente):
         return self.ingredientes[id_ingrediente].copy()
 
-    def validar_crear_editar_ingrediente(self, nombre, unidad, valor, sitioCompra):
+    def validar_crear_editar_ingrediente(self, nombre, unidad, valor, sitioCompra, id_ingrediente=None):
         return ""
 		
     def crear_ingrediente(self, nombre, unidad, valor, sitioCompras):
+        self.contador_cambios += 1
         self.ingredientes.append({'nombre': nombre, 'unidad': unidad, 'valor': valor, 'sitioCompra': sitioCompras})
+        #En el mock los ingredientes se listan en el orden en que se crearon
+        id_ingrediente = len(self.ingredientes) - 1
+        return {'ingrediente': dict(self.ingredientes[id_ingrediente], id=id_ingrediente),
+                'posicion_anterior': None, 'posicion': id_ingrediente}
  
 
     def editar_ingrediente(self, id_ingrediente, nombre, unidad, valor, sitioCompras):
+        self.contador_cambios += 1
         self.ingredientes[id_ingrediente]['nombre'] = nombre
         self.ingredientes[id_ingrediente]['unidad'] = unidad
         self.ingredientes[id_ingrediente]['valor'] = valor
         self.ingredientes[id_ingrediente]['sitioCompra'] = sitioCompras
+        return {'ingrediente': dict(self.ingredientes[id_ingrediente], id=id_ingrediente),
+                'posicion_anterior': id_ingrediente, 'posicion': id_ingrediente}
 
 
     def eliminar_ingrediente(self, id_ingrediente):
+        self.contador_cambios += 1
+        cambio = {'ingrediente': dict(self.ingredientes[id_ingrediente], id=id_ingrediente),
+                  'posicion_anterior': id_ingrediente, 'posicion': None}
         del self.ingredientes[id_ingrediente]
+        return cambio
 
     def dar_ingredientes_receta(self, id_receta):
         receta = self.dar_receta(id_receta)
         return list(filter(lambda x: x['receta'] == receta['nombre'], self.ingredientes_recetas))
     
     def agregar_ingrediente_receta(self, receta, ingrediente, cantidad):
+        self.contador_cambios += 1
+        #El ingrediente llega como su id (su posición en la lista) o como el diccionario con sus datos
+        if isinstance(ingrediente, int):
+            ingrediente = self.ingredientes[ingrediente]
         self.ingredientes_recetas.append({'receta': receta['nombre'], 'ingrediente': ingrediente['nombre'], 'unidad': ingrediente['unidad'],'cantidad': cantidad})
+        #La línea nueva queda de última entre las de su receta
+        posicion = len([x for x in self.ingredientes_recetas if x['receta'] == receta['nombre']]) - 1
+        return {'ingrediente_receta': dict(self.ingredientes_recetas[-1]), 'posicion_anterior': None, 'posicion': posicion}
 
     def editar_ingrediente_receta(self, id_ingrediente_receta, receta, ingrediente, cantidad):
+        self.contador_cambios += 1
+        if isinstance(ingrediente, int):
+            ingrediente = self.ingredientes[ingrediente]
         ingredientes_receta = list(filter(lambda x: x['receta'] == receta['nombre'], self.ingredientes_recetas))
         ingredientes_receta[id_ingrediente_receta]['ingrediente'] = ingrediente['nombre']
+        ingredientes_receta[id_ingrediente_receta]['unidad'] = ingrediente['unidad']
         ingredientes_receta[id_ingrediente_receta]['cantidad'] = cantidad
+        #En el mock las líneas de la receta se listan en el orden en que se agregaron
+        return {'ingrediente_receta': dict(ingredientes_receta[id_ingrediente_receta]),
+                'posicion_anterior': id_ingrediente_receta, 'posicion': id_ingrediente_receta}
 
     def eliminar_ingrediente_receta(self, id_ingrediente_receta, receta):
+        self.contador_cambios += 1
         indice_en_receta = 0
         iteracion = 0
+        cambio = False
         for ingrediente_receta in self.ingredientes_recetas:
             if ingrediente_receta['receta'] == receta['nombre']:
                 if indice_en_receta == id_ingrediente_receta:
+                    cambio = {'ingrediente_receta': dict(ingrediente_receta),
+                              'posicion_anterior': id_ingrediente_receta, 'posicion': None}
                     del self.ingredientes_recetas[iteracion]
 				
                 indice_en_receta+=1
 			
             iteracion+=1
+        return cambio
 
     def validar_crear_editar_ingReceta(self,receta, ingrediente, cantidad):
+        if ingrediente == None:
+            return "Ingrediente Invalido"
         return ""
 
+    def dar_contador_cambios(self):
+        return self.contador_cambios
+
     def dar_preparacion(self, id_receta,cantidad_personas):
         return self.preparacion
 
+
+    def dar_lista_compras(self, lista_pares):
+        sitios = {}
+        for id_receta, personas in lista_pares:
+            receta = self.recetas[id_receta]
+            for ingrediente_receta in self.dar_ingredientes_receta(id_receta):
+                ingrediente = [i for i in self.ingredientes if i['nombre'] == ingrediente_receta['ingrediente']][0]
+                ingredientes_sitio = sitios.setdefault(ingrediente['sitioCompra'], {})
+                cantidad = ingrediente_receta['cantidad'] * personas / receta['personas']
+                ingredientes_sitio[ingrediente['nombre']] = ingredientes_sitio.get(ingrediente['nombre'], 0) + cantidad
+
+        lista = {'sitios': [], 'total': 0}
+        for sitio in sorted(sitios):
+            ingredientes = []
+            for nombre in sorted(sitios[sitio]):
+                ingrediente = [i for i in self.ingredientes if i['nombre'] == nombre][0]
+                cantidad = sitios[sitio][nombre]
+                ingredientes.append({'nombre': nombre, 'unidad': ingrediente['unidad'], 'cantidad': round(cantidad, 2),
+                                     'valor': round(cantidad * ingrediente['valor'], 2)})
+            subtotal = round(sum(i['valor'] for i in ingredientes), 2)
+            lista['sitios'].append({'sitio': sitio, 'ingredientes': ingredientes, 'subtotal': subtotal})
+            lista['total'] += subtotal
+        return lista
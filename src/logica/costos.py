@@ -0,0 +1,39 @@
+'''
+Mantenimiento de la tabla receta_costo.
+
+Los disparadores de la base de datos mantienen el costo de cada receta al agregar,
+editar o eliminar ingredientes de una receta y al cambiar el valor de un ingrediente.
+Este módulo permite verificar la tabla y reconstruirla si quedó inconsistente.
+
+Uso desde la línea de comandos:
+    python -m src.logica.costos verificar
+    python -m src.logica.costos reconstruir
+'''
+import argparse
+import sys
+
+from src.modelo.declarative_base import engine
+from src.modelo.esquema import actualizar_esquema
+from src.modelo.receta_costo import reconstruir_costos, verificar_costos
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description='Verifica o reconstruye el costo guardado de las recetas')
+    parser.add_argument('accion', choices=['verificar', 'reconstruir'])
+    argumentos = parser.parse_args(argumentos)
+
+    actualizar_esquema(engine)
+    with engine.begin() as conexion:
+        if argumentos.accion == 'reconstruir':
+            print('{} recetas recalculadas'.format(reconstruir_costos(conexion)))
+            return 0
+
+        diferencias = verificar_costos(conexion)
+    for diferencia in diferencias:
+        print('receta {receta}: guardado {costo_guardado}, calculado {costo_calculado}'.format(**diferencia))
+    print('{} recetas con diferencias'.format(len(diferencias)))
+    return 1 if len(diferencias) > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
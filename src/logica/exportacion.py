@@ -0,0 +1,149 @@
+'''
+Exportación en streaming del recetario completo a archivos JSON Lines o CSV.
+
+Las consultas proyectan sólo las columnas necesarias y se leen por lotes con
+yield_per, de modo que la memoria usada no depende del tamaño de la base de datos.
+
+Uso desde la línea de comandos:
+    python -m src.logica.exportacion DIRECTORIO [--formato jsonl|csv]
+'''
+import argparse
+import csv
+import io
+import json
+import os
+from itertools import groupby
+
+from src.modelo.declarative_base import Session, engine
+from src.modelo.esquema import actualizar_esquema
+from src.modelo.ingrediente import Ingrediente
+from src.modelo.ingrediente_receta import IngredienteReceta
+from src.modelo.receta import Receta
+
+TAMANO_LOTE = 1000
+
+COLUMNAS_INGREDIENTES = ['nombre', 'unidad', 'valor', 'sitioCompra']
+COLUMNAS_RECETAS = ['nombre', 'tiempo', 'personas', 'calorias', 'preparacion']
+COLUMNAS_INGREDIENTES_RECETA = ['receta', 'ingrediente', 'unidad', 'cantidad']
+
+
+def dar_filas_ingredientes(session):
+    consulta = session.query(
+        Ingrediente.nombre, Ingrediente.unidadMedida, Ingrediente.valorUnidad, Ingrediente.sitioCompra
+    ).order_by(Ingrediente.id).yield_per(TAMANO_LOTE)
+    for fila in consulta:
+        yield dict(zip(COLUMNAS_INGREDIENTES, fila))
+
+
+def dar_filas_recetas(session):
+    consulta = session.query(
+        Receta.nombre, Receta.tiempoPreparacion, Receta.personasBase, Receta.caloriasPorcion, Receta.instrucciones
+    ).order_by(Receta.id).yield_per(TAMANO_LOTE)
+    for fila in consulta:
+        yield dict(zip(COLUMNAS_RECETAS, fila))
+
+
+def dar_filas_ingredientes_receta(session):
+    consulta = session.query(
+        Receta.nombre, Ingrediente.nombre, Ingrediente.unidadMedida, IngredienteReceta.cantidad
+    ).join(
+        Receta, IngredienteReceta.receta == Receta.id
+    ).join(
+        Ingrediente, IngredienteReceta.ingrediente == Ingrediente.id
+    ).order_by(IngredienteReceta.receta, IngredienteReceta.id).yield_per(TAMANO_LOTE)
+    for fila in consulta:
+        yield dict(zip(COLUMNAS_INGREDIENTES_RECETA, fila))
+
+
+def dar_recetas_con_ingredientes(session):
+    '''
+    Retorna las recetas con la lista de sus ingredientes, en el formato que recibe
+    LogicaRecetario.importar_recetas. Se recorre una sola consulta ordenada por receta
+    y se agrupan las filas consecutivas, así sólo hay una receta en memoria a la vez.
+    '''
+    consulta = session.query(
+        Receta.id, Receta.nombre, Receta.tiempoPreparacion, Receta.personasBase, Receta.caloriasPorcion,
+        Receta.instrucciones, Ingrediente.nombre, Ingrediente.unidadMedida, IngredienteReceta.cantidad
+    ).outerjoin(
+        IngredienteReceta, IngredienteReceta.receta == Receta.id
+    ).outerjoin(
+        Ingrediente, IngredienteReceta.ingrediente == Ingrediente.id
+    ).order_by(Receta.id, IngredienteReceta.id).yield_per(TAMANO_LOTE)
+
+    for id_receta, filas in groupby(consulta, key=lambda fila: fila[0]):
+        filas = list(filas)
+        receta = dict(zip(COLUMNAS_RECETAS, filas[0][1:6]))
+        receta['ingredientes'] = [
+            {'nombre': fila[6], 'unidad': fila[7], 'cantidad': fila[8]}
+            for fila in filas if fila[6] != None
+        ]
+        yield receta
+
+
+def escribir_jsonl(ruta, filas):
+    cantidad = 0
+    with io.open(ruta, 'w', encoding='utf-8') as archivo:
+        for fila in filas:
+            archivo.write(json.dumps(fila, ensure_ascii=False))
+            archivo.write('\n')
+            cantidad += 1
+    return cantidad
+
+
+def escribir_csv(ruta, columnas, filas):
+    cantidad = 0
+    with io.open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=columnas)
+        escritor.writeheader()
+        for fila in filas:
+            escritor.writerow(fila)
+            cantidad += 1
+    return cantidad
+
+
+def exportar_recetario(session, directorio, formato='jsonl'):
+    ''' Escribe el recetario en el directorio indicado.
+    Con formato 'jsonl' se generan ingredientes.jsonl y recetas.jsonl (cada receta con sus
+    ingredientes), que pueden volver a cargarse con importar_ingredientes e importar_recetas.
+    Con formato 'csv' se generan ingredientes.csv, recetas.csv e ingredientes_receta.csv.
+    Retorna:
+        (dict): La cantidad de filas escritas en cada archivo
+    '''
+    os.makedirs(directorio, exist_ok=True)
+    if formato == 'jsonl':
+        return {
+            'ingredientes': escribir_jsonl(os.path.join(directorio, 'ingredientes.jsonl'),
+                                           dar_filas_ingredientes(session)),
+            'recetas': escribir_jsonl(os.path.join(directorio, 'recetas.jsonl'),
+                                      dar_recetas_con_ingredientes(session))
+        }
+    elif formato == 'csv':
+        return {
+            'ingredientes': escribir_csv(os.path.join(directorio, 'ingredientes.csv'),
+                                         COLUMNAS_INGREDIENTES, dar_filas_ingredientes(session)),
+            'recetas': escribir_csv(os.path.join(directorio, 'recetas.csv'),
+                                    COLUMNAS_RECETAS, dar_filas_recetas(session)),
+            'ingredientes_receta': escribir_csv(os.path.join(directorio, 'ingredientes_receta.csv'),
+                                                COLUMNAS_INGREDIENTES_RECETA, dar_filas_ingredientes_receta(session))
+        }
+    raise ValueError('Formato no soportado: ' + formato)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description='Exporta el recetario completo a JSON Lines o CSV')
+    parser.add_argument('directorio', help='Directorio donde se escriben los archivos')
+    parser.add_argument('--formato', choices=['jsonl', 'csv'], default='jsonl')
+    argumentos = parser.parse_args(argumentos)
+
+    actualizar_esquema(engine)
+    session = Session()
+    try:
+        cantidades = exportar_recetario(session, argumentos.directorio, argumentos.formato)
+    finally:
+        session.close()
+    for archivo, cantidad in cantidades.items():
+        print('{}: {} filas'.format(archivo, cantidad))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+'''
+Funciones para leer en streaming los archivos que se importan al recetario
+'''
+import csv
+import io
+import json
+import os
+from itertools import islice
+
+
+def dar_formato(fuente, formato=None):
+    ''' Retorna el formato de la fuente ('csv' o 'jsonl') a partir de su extensión
+    Parámetros:
+        fuente (string o archivo): La ruta o el archivo abierto a leer
+        formato (string): El formato explícito, si se conoce
+    '''
+    if formato != None:
+        return formato
+    nombre = fuente if isinstance(fuente, str) else getattr(fuente, 'name', '')
+    extension = os.path.splitext(nombre)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    elif extension in ('.jsonl', '.json', '.ndjson'):
+        return 'jsonl'
+    raise ValueError('No se reconoce el formato de la fuente: ' + str(nombre))
+
+
+def leer_filas(fuente, formato=None):
+    ''' Retorna un generador con una tupla (número de línea, dict) por cada fila de un archivo
+    CSV o JSON Lines. El número es la línea del archivo donde está la fila, contando el
+    encabezado del CSV y las líneas en blanco del JSON Lines, que se saltan. Las líneas JSON
+    que no se pueden interpretar como un objeto se entregan como None.
+    Parámetros:
+        fuente (string o archivo): La ruta o el archivo abierto a leer
+        formato (string): 'csv' o 'jsonl'; si no se indica se deduce de la extensión
+    '''
+    formato = dar_formato(fuente, formato)
+    if isinstance(fuente, str):
+        with io.open(fuente, 'r', encoding='utf-8', newline='') as archivo:
+            yield from leer_filas(archivo, formato)
+        return
+
+    if formato == 'csv':
+        lector = csv.DictReader(fuente)
+        for fila in lector:
+            yield lector.line_num, fila
+    elif formato == 'jsonl':
+        for numero_linea, linea in enumerate(fuente, start=1):
+            linea = linea.strip()
+            if linea != '':
+                try:
+                    fila = json.loads(linea)
+                except ValueError:
+                    fila = None
+                yield numero_linea, fila if isinstance(fila, dict) else None
+    else:
+        raise ValueError('Formato no soportado: ' + formato)
+
+
+def en_lotes(elementos, tamano_lote):
+    ''' Agrupa un iterable en listas de a lo sumo tamano_lote elementos sin materializarlo completo '''
+    iterador = iter(elementos)
+    lote = list(islice(iterador, tamano_lote))
+    while lote:
+        yield lote
+        lote = list(islice(iterador, tamano_lote))
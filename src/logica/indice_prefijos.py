@@ -0,0 +1,87 @@
+'''
+Índice en memoria para buscar ingredientes por las primeras letras de su nombre.
+
+Cada palabra del nombre aporta una llave (el nombre desde esa palabra, en minúsculas y sin
+tildes) a un arreglo ordenado. Buscar un prefijo es una búsqueda binaria hasta la primera
+llave que empieza por él y un recorrido sólo de las llaves que coinciden, así que el costo no
+depende de cuántos ingredientes hay sino de cuántos se piden. Las altas, ediciones y
+eliminaciones se aplican sobre el arreglo sin reconstruirlo.
+'''
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+RESULTADOS_POR_DEFECTO = 50
+
+
+def normalizar(texto):
+    ''' Minúsculas y sin tildes, para comparar como lo hace la búsqueda de recetas '''
+    return ''.join(letra for letra in unicodedata.normalize('NFD', texto.lower()) if not unicodedata.combining(letra))
+
+
+def dar_llaves(nombre):
+    ''' El nombre normalizado a partir de cada una de sus palabras '''
+    nombre = normalizar(nombre)
+    return {nombre[palabra.start():] for palabra in re.finditer(r'\w+', nombre)}
+
+
+class IndicePrefijos():
+
+    def __init__(self, ingredientes=()):
+        self.ingredientes = {ingrediente['id']: ingrediente for ingrediente in ingredientes}
+        self.llaves = sorted((llave, self.dar_orden(ingrediente))
+                             for ingrediente in self.ingredientes.values()
+                             for llave in dar_llaves(ingrediente['nombre']))
+
+    def dar_orden(self, ingrediente):
+        # Entre llaves iguales, el orden de la lista de ingredientes; el id al final identifica la entrada
+        return (ingrediente['nombre'], ingrediente['unidad'], ingrediente['sitioCompra'], ingrediente['id'])
+
+    def __len__(self):
+        return len(self.ingredientes)
+
+    def dar_ingrediente(self, id_ingrediente):
+        return self.ingredientes.get(id_ingrediente)
+
+    def agregar(self, ingrediente):
+        self.ingredientes[ingrediente['id']] = ingrediente
+        for llave in dar_llaves(ingrediente['nombre']):
+            insort(self.llaves, (llave, self.dar_orden(ingrediente)))
+
+    def eliminar(self, id_ingrediente):
+        ingrediente = self.ingredientes.pop(id_ingrediente, None)
+        if ingrediente == None:
+            return
+        for llave in dar_llaves(ingrediente['nombre']):
+            entrada = (llave, self.dar_orden(ingrediente))
+            posicion = bisect_left(self.llaves, entrada)
+            if posicion < len(self.llaves) and self.llaves[posicion] == entrada:
+                del self.llaves[posicion]
+
+    def actualizar(self, ingrediente):
+        self.eliminar(ingrediente['id'])
+        self.agregar(ingrediente)
+
+    def aplicar_cambio(self, cambio):
+        ''' Aplica el cambio que retornan crear_ingrediente, editar_ingrediente y eliminar_ingrediente '''
+        ingrediente = cambio['ingrediente']
+        if cambio['posicion'] == None:
+            self.eliminar(ingrediente['id'])
+        else:
+            self.actualizar(ingrediente)
+
+    def buscar(self, texto, limite=RESULTADOS_POR_DEFECTO):
+        ''' Retorna hasta limite ingredientes cuyo nombre, desde alguna de sus palabras, empieza por texto '''
+        prefijo = normalizar(texto.strip())
+        resultados = []
+        ids = set()
+        posicion = bisect_left(self.llaves, (prefijo,))
+        while len(resultados) < limite and posicion < len(self.llaves):
+            llave, orden = self.llaves[posicion]
+            if not llave.startswith(prefijo):
+                break
+            if orden[-1] not in ids:
+                ids.add(orden[-1])
+                resultados.append(self.ingredientes[orden[-1]])
+            posicion += 1
+        return resultados
@@ -2,56 +2,238 @@ from src.logica.FachadaRecetario import FachadaRecetario
 from src.modelo.ingrediente import Ingrediente
 from src.modelo.ingrediente_receta import IngredienteReceta
 from src.modelo.receta import Receta
-from src.modelo.declarative_base import Session, engine, Base
+from src.modelo.receta_costo import RecetaCosto
+from src.modelo.receta_busqueda import (LIMITE_RELEVANCIA, PESO_INSTRUCCIONES, PESO_NOMBRE, TABLA_BUSQUEDA,
+                                        dar_consulta_busqueda)
+from src.modelo.declarative_base import Session, engine
+from src.modelo.cambios import dar_contador_cambios
+from src.modelo.esquema import actualizar_esquema
+from src.logica.importacion import en_lotes, leer_filas
+from src.logica import exportacion
+from src.logica.preparacion import calcular_preparaciones
+from sqlalchemy import Float, Integer, and_, bindparam, cast, exists, func, inspect, text, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import scoped_session, sessionmaker, undefer
+from collections.abc import Mapping
+from contextlib import contextmanager
+import functools
+import json
+import numbers
 import re
+import threading
+
+
+def operacion(metodo):
+    ''' Ejecuta el método de la lógica dentro de una unidad de trabajo '''
+    @functools.wraps(metodo)
+    def ejecutar(self, *args, **kwargs):
+        with self.unidad_de_trabajo():
+            return metodo(self, *args, **kwargs)
+    return ejecutar
+
 
 class LogicaRecetario():
 
-    def __init__(self):
-        Base.metadata.create_all(engine)
-        self.session = Session()
-        
-        self.recetas = self.session.query(Receta).all()
-        self.ingredientes = self.session.query(Ingrediente).all()
-        self.ingredientes_recetas = self.session.query(IngredienteReceta).all()
-        
+    def __init__(self, motor=None, sesion_por_hilo=False):
+        '''
+        Cada llamada a la lógica usa su propia sesión, que se confirma al terminar y se
+        revierte si hay un error. Con sesion_por_hilo la sesión se toma de un scoped_session,
+        de modo que otros componentes del mismo hilo pueden compartirla.
+        '''
+        self.motor = engine if motor == None else motor
+        actualizar_esquema(self.motor)
+        fabrica = Session if motor == None else sessionmaker(bind=self.motor)
+        self.fabrica_sesiones = scoped_session(fabrica) if sesion_por_hilo else fabrica
+        self.estado_hilo = threading.local()
+        self.contador_cambios = dar_contador_cambios(self.motor)
+        self.busqueda_texto_completo = TABLA_BUSQUEDA in inspect(self.motor).get_table_names()
+
+    @property
+    def session(self):
+        session = getattr(self.estado_hilo, 'session', None)
+        if session == None:
+            raise RuntimeError('La sesión sólo está disponible dentro de una unidad de trabajo')
+        return session
+
+    @contextmanager
+    def unidad_de_trabajo(self):
+        ''' Abre una sesión para una operación; las unidades anidadas en el mismo hilo usan la sesión externa '''
+        if getattr(self.estado_hilo, 'session', None) != None:
+            yield self.estado_hilo.session
+            return
+
+        session = self.fabrica_sesiones()
+        self.estado_hilo.session = session
+        try:
+            yield session
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            self.estado_hilo.session = None
+            if isinstance(self.fabrica_sesiones, scoped_session):
+                self.fabrica_sesiones.remove()
+            else:
+                session.close()
+
+    def dar_consulta_lista_recetas(self, *columnas):
+        # Las listas sólo proyectan el id y el nombre (y las columnas extra que pidan): no se cargan
+        # objetos Receta ni las instrucciones, que sólo lee dar_receta
+        return self.session.query(Receta.id, Receta.nombre, *columnas)
+
+    @operacion
     def dar_recetas(self):
-        self.recetas = self.session.query(Receta).all()
-        if (len(self.recetas) >= 1):
-            recetas_ordenadas = sorted(self.recetas, key=lambda x: (x.nombre))
-            recetas_ordenadas_lista =[]
-            for receta in recetas_ordenadas:
-                recetas_ordenadas_lista.append(
-                    {
-                    'nombre': receta.nombre,
-                    'tiempoPreparacion': receta.tiempoPreparacion,
-                    'personasBase': receta.personasBase,
-                    'caloriasPorcion': receta.caloriasPorcion,
-                    'instrucciones': receta.instrucciones
-                    }
-                )
-            return recetas_ordenadas_lista
+        recetas = self.dar_consulta_lista_recetas().order_by(Receta.nombre, Receta.id).all()
+        return [self.dar_dict_receta(receta) for receta in recetas]
+
+    @operacion
+    def dar_recetas_pagina(self, tamano_pagina, despues_de=None):
+        # Paginación por llave (nombre, id): el índice de nombre cubre la consulta, el orden y el límite
+        consulta = self.dar_consulta_lista_recetas()
+        if despues_de != None:
+            consulta = consulta.filter(
+                tuple_(Receta.nombre, Receta.id) > tuple_(despues_de['nombre'], despues_de['id'])
+            )
+        recetas = consulta.order_by(Receta.nombre, Receta.id).limit(tamano_pagina).all()
+        return [self.dar_dict_receta(receta) for receta in recetas]
+
+    @operacion
+    def dar_recetas_por_costo(self, costo_minimo=None, costo_maximo=None, descendente=False):
+        # El costo se lee de receta_costo; el índice (costo, receta) resuelve el filtro y el orden
+        consulta = self.dar_consulta_lista_recetas(RecetaCosto.costo).join(RecetaCosto, RecetaCosto.receta == Receta.id)
+        if costo_minimo != None:
+            consulta = consulta.filter(RecetaCosto.costo >= costo_minimo)
+        if costo_maximo != None:
+            consulta = consulta.filter(RecetaCosto.costo <= costo_maximo)
+        if descendente:
+            consulta = consulta.order_by(RecetaCosto.costo.desc(), RecetaCosto.receta.desc())
         else:
+            consulta = consulta.order_by(RecetaCosto.costo, RecetaCosto.receta)
+
+        recetas = []
+        for receta in consulta.all():
+            dict_receta = self.dar_dict_receta(receta)
+            dict_receta['costo'] = receta.costo
+            recetas.append(dict_receta)
+        return recetas
+
+    @operacion
+    def buscar_recetas(self, texto, tamano_pagina=50, despues_de=None):
+        # Ordena por relevancia (bm25: menor es mejor) y pagina por llave (relevancia, id).
+        # Si hay demasiadas coincidencias para calcular bm25 a todas, pagina por id con relevancia None.
+        # El modo se decide en la primera página y las siguientes lo toman del cursor, así una escritura
+        # entre páginas que cruce LIMITE_RELEVANCIA no mezcla los dos órdenes
+        consulta = dar_consulta_busqueda(texto)
+        if consulta == None:
             return []
-        
-    def dar_ingredientes(self):
-        self.ingredientes = self.session.query(Ingrediente).all()
-        if(len(self.ingredientes) >= 1):
-            ingredientes_ordenados = sorted(self.ingredientes, key=lambda x: (x.nombre, x.unidadMedida, x.sitioCompra))
-            self.ingredientes_mock = []
-            for ingrediente in ingredientes_ordenados:
-                self.ingredientes_mock.append(
-                    {
-                    'nombre': ingrediente.nombre,
-                    'unidad': ingrediente.unidadMedida,
-                    'valor': ingrediente.valorUnidad,
-                    'sitioCompra': ingrediente.sitioCompra
-                }
-                )
-            return self.ingredientes_mock
+        if not self.busqueda_texto_completo:
+            return self.buscar_recetas_sin_indice(texto, tamano_pagina, despues_de)
+
+        parametros = {'consulta': consulta, 'tamano_pagina': tamano_pagina, 'limite': LIMITE_RELEVANCIA,
+                      'peso_nombre': PESO_NOMBRE, 'peso_instrucciones': PESO_INSTRUCCIONES}
+        if despues_de != None:
+            parametros.update(relevancia=despues_de['relevancia'], id=despues_de['id'])
+            por_relevancia = despues_de['relevancia'] != None
+        else:
+            coincidencias = self.session.execute(text(
+                'SELECT COUNT(*) FROM (SELECT 1 FROM receta_fts WHERE receta_fts MATCH :consulta LIMIT :limite + 1)'
+            ), parametros).scalar()
+            por_relevancia = coincidencias <= LIMITE_RELEVANCIA
+
+        if por_relevancia:
+            sentencia = """
+                SELECT id, relevancia FROM (
+                    SELECT rowid AS id, bm25(receta_fts, :peso_nombre, :peso_instrucciones) AS relevancia
+                    FROM receta_fts WHERE receta_fts MATCH :consulta
+                ) {}
+                ORDER BY relevancia, id LIMIT :tamano_pagina""".format(
+                'WHERE (relevancia, id) > (:relevancia, :id)' if despues_de != None else '')
         else:
+            sentencia = """
+                SELECT rowid AS id, NULL AS relevancia FROM receta_fts
+                WHERE receta_fts MATCH :consulta {}
+                ORDER BY rowid LIMIT :tamano_pagina""".format(
+                'AND rowid > :id' if despues_de != None else '')
+        resultados = self.session.execute(text(sentencia), parametros).fetchall()
+        if len(resultados) == 0:
             return []
-    
+
+        recetas = {receta.id: receta for receta in
+                   self.dar_consulta_lista_recetas().filter(Receta.id.in_([fila.id for fila in resultados]))}
+        pagina = []
+        for fila in resultados:
+            dict_receta = self.dar_dict_receta(recetas[fila.id])
+            dict_receta['relevancia'] = fila.relevancia
+            pagina.append(dict_receta)
+        return pagina
+
+    def buscar_recetas_sin_indice(self, texto, tamano_pagina, despues_de):
+        # Sin FTS5 se busca cada palabra en el nombre con LIKE (recorre la tabla) y se ordena por id.
+        # Las palabras pueden tener _, que en LIKE es un comodín: se escapa
+        consulta = self.dar_consulta_lista_recetas()
+        for palabra in re.findall(r'\w+', texto):
+            palabra = palabra.replace('_', '\\_')
+            consulta = consulta.filter(Receta.nombre.ilike('%' + palabra + '%', escape='\\'))
+        if despues_de != None:
+            consulta = consulta.filter(Receta.id > despues_de['id'])
+        pagina = []
+        for receta in consulta.order_by(Receta.id).limit(tamano_pagina):
+            dict_receta = self.dar_dict_receta(receta)
+            dict_receta['relevancia'] = None
+            pagina.append(dict_receta)
+        return pagina
+
+    def dar_dict_receta(self, receta):
+        # Recibe una Receta o una fila de dar_consulta_lista_recetas
+        return {
+            'id': receta.id,
+            'nombre': receta.nombre
+        }
+        
+    @operacion
+    def dar_ingredientes(self):
+        ingredientes = self.session.query(Ingrediente).order_by(
+            Ingrediente.nombre, Ingrediente.unidadMedida, Ingrediente.sitioCompra, Ingrediente.id
+        ).all()
+        return [self.dar_dict_ingrediente(ingrediente) for ingrediente in ingredientes]
+
+    @operacion
+    def dar_ingredientes_pagina(self, tamano_pagina, despues_de=None):
+        # Paginación por llave (nombre, unidad, sitio de compra, id) sobre el índice compuesto
+        consulta = self.session.query(Ingrediente)
+        if despues_de != None:
+            consulta = consulta.filter(
+                tuple_(Ingrediente.nombre, Ingrediente.unidadMedida, Ingrediente.sitioCompra, Ingrediente.id) >
+                tuple_(despues_de['nombre'], despues_de['unidad'], despues_de['sitioCompra'], despues_de['id'])
+            )
+        ingredientes = consulta.order_by(
+            Ingrediente.nombre, Ingrediente.unidadMedida, Ingrediente.sitioCompra, Ingrediente.id
+        ).limit(tamano_pagina).all()
+        return [self.dar_dict_ingrediente(ingrediente) for ingrediente in ingredientes]
+
+    def dar_dict_ingrediente(self, ingrediente):
+        return {
+            'id': ingrediente.id,
+            'nombre': ingrediente.nombre,
+            'unidad': ingrediente.unidadMedida,
+            'valor': ingrediente.valorUnidad,
+            'sitioCompra': ingrediente.sitioCompra
+        }
+
+    def dar_posicion_ingrediente(self, ingrediente):
+        # Cantidad de ingredientes antes de éste en el orden de dar_ingredientes, contada sobre el índice compuesto
+        return self.session.query(func.count(Ingrediente.id)).filter(
+            tuple_(Ingrediente.nombre, Ingrediente.unidadMedida, Ingrediente.sitioCompra, Ingrediente.id) <
+            tuple_(ingrediente.nombre, ingrediente.unidadMedida, ingrediente.sitioCompra, ingrediente.id)
+        ).scalar()
+
+    def dar_cambio(self, llave, fila, posicion_anterior, posicion):
+        # Describe una escritura para que la interfaz actualice sólo la fila afectada:
+        # la fila sale de posicion_anterior (None si es nueva) y queda en posicion (None si se eliminó)
+        return {llave: fila, 'posicion_anterior': posicion_anterior, 'posicion': posicion}
+
+    @operacion
     def crear_ingrediente(self, nombre, unidad, valor, sitioCompras):
         
         validacion = self.validar_crear_editar_ingrediente(nombre, unidad, valor, sitioCompras)
@@ -59,18 +241,76 @@ class LogicaRecetario():
         if (validacion == ''):
             ingrediente = Ingrediente(nombre=nombre, unidadMedida=unidad, valorUnidad=valor, sitioCompra=sitioCompras)
             self.session.add(ingrediente)
-            self.session.commit()
-            return True
+            try:
+                self.session.commit()
+            except IntegrityError:
+                # Otro proceso creó el mismo ingrediente después de la validación
+                self.session.rollback()
+                return False
+            return self.dar_cambio('ingrediente', self.dar_dict_ingrediente(ingrediente), None,
+                                   self.dar_posicion_ingrediente(ingrediente))
         else:
             return False
 
-    def validar_crear_editar_ingrediente(self, nombre, unidad, valor, sitioCompra):
+    @operacion
+    def editar_ingrediente(self, id_ingrediente, nombre, unidad, valor, sitioCompras):
+        ingrediente = self.session.query(Ingrediente).get(id_ingrediente)
+        if (ingrediente == None or self.validar_campos_ingrediente(nombre, unidad, valor, sitioCompras) != ''):
+            return False
+
+        posicion_anterior = self.dar_posicion_ingrediente(ingrediente)
+        ingrediente.nombre = nombre
+        ingrediente.unidadMedida = unidad
+        ingrediente.valorUnidad = valor
+        ingrediente.sitioCompra = sitioCompras
+        try:
+            self.session.commit()
+        except IntegrityError:
+            # Ya existe otro ingrediente con el mismo nombre y unidad
+            self.session.rollback()
+            return False
+        return self.dar_cambio('ingrediente', self.dar_dict_ingrediente(ingrediente), posicion_anterior,
+                               self.dar_posicion_ingrediente(ingrediente))
+
+    @operacion
+    def eliminar_ingrediente(self, id_ingrediente):
+        ingrediente = self.session.query(Ingrediente).get(id_ingrediente)
+        if (ingrediente == None):
+            return False
+
+        cambio = self.dar_cambio('ingrediente', self.dar_dict_ingrediente(ingrediente),
+                                 self.dar_posicion_ingrediente(ingrediente), None)
+        # El ingrediente sale también de las recetas que lo usan (cascade de ingredientesRecetas)
+        self.session.delete(ingrediente)
+        self.session.commit()
+        return cambio
+
+    @operacion
+    def validar_crear_editar_ingrediente(self, nombre, unidad, valor, sitioCompra, id_ingrediente=None):
+        validacion = self.validar_campos_ingrediente(nombre, unidad, valor, sitioCompra)
+        if (validacion != ''):
+            return validacion
+
+        # Un solo EXISTS resuelto con el índice único de (nombre, unidad); al editar no cuenta el mismo ingrediente
+        condicion = and_(Ingrediente.nombre == nombre, Ingrediente.unidadMedida == unidad)
+        if id_ingrediente != None:
+            condicion = and_(condicion, Ingrediente.id != id_ingrediente)
+        existe_ingrediente = self.session.query(exists().where(condicion)).scalar()
+        if (not existe_ingrediente):
+            return ''
+        else:
+            return 'Ingrediente ya existe'
+
+    def validar_campos_ingrediente(self, nombre, unidad, valor, sitioCompra):
         valorInt = 0
 
         try:
             valorInt=int(valor)
         except:
             valorInt = 0
+        # int() trunca los decimales: un valor como 2500.75 no es un entero válido
+        if (isinstance(valor, float) and valor != valorInt):
+            valorInt = 0
        
         if ((nombre == None or  nombre == '') or not isinstance(nombre, str) or len(nombre) > 255):
             return 'Nombre incorrecto'
@@ -81,23 +321,118 @@ class LogicaRecetario():
         elif ((sitioCompra == None or  sitioCompra == '') or not isinstance(sitioCompra, str) or len(sitioCompra) > 255):
             return 'Sitio de compra incorrecto'
         else:
-            cantidad_ingredientes =  self.session.query(Ingrediente).count()
-            if (cantidad_ingredientes==0):
-                return ''
-            
-            existe_ingrediente  = self.session.query(Ingrediente).filter(Ingrediente.nombre == nombre, Ingrediente.unidadMedida == unidad).count()
-            if (existe_ingrediente == 0):
-                return ''
-            else:
-                return 'Ingrediente ya existe'
+            return ''
 
+    @operacion
+    def importar_ingredientes(self, fuente, formato=None, tamano_lote=500):
+        reporte = {'importados': 0, 'errores': []}
+        filas = leer_filas(fuente, formato)
+
+        for lote in en_lotes(filas, tamano_lote):
+            validos = []
+            for numero_fila, fila in lote:
+                if fila == None:
+                    reporte['errores'].append({'fila': numero_fila, 'error': 'Formato de fila incorrecto'})
+                    continue
+                nombre, unidad, valor, sitioCompra = fila.get('nombre'), fila.get('unidad'), fila.get('valor'), fila.get('sitioCompra')
+                validacion = self.validar_campos_ingrediente(nombre, unidad, valor, sitioCompra)
+                if (validacion != ''):
+                    reporte['errores'].append({'fila': numero_fila, 'error': validacion})
+                else:
+                    validos.append((numero_fila, {'nombre': nombre, 'unidadMedida': unidad,
+                                                  'valorUnidad': int(valor), 'sitioCompra': sitioCompra}))
+
+            # Una sola consulta por lote para conocer los ingredientes que ya están en el catálogo
+            nombres = {ingrediente['nombre'] for numero_fila, ingrediente in validos}
+            existentes = set(self.session.query(Ingrediente.nombre, Ingrediente.unidadMedida).filter(
+                Ingrediente.nombre.in_(bindparam('nombres', expanding=True))
+            ).params(nombres=list(nombres)).all()) if nombres else set()
+
+            nuevos = []
+            for numero_fila, ingrediente in validos:
+                llave = (ingrediente['nombre'], ingrediente['unidadMedida'])
+                if llave in existentes:
+                    reporte['errores'].append({'fila': numero_fila, 'error': 'Ingrediente ya existe'})
+                else:
+                    existentes.add(llave)
+                    nuevos.append((numero_fila, ingrediente))
+
+            try:
+                self.session.bulk_insert_mappings(Ingrediente, [ingrediente for numero_fila, ingrediente in nuevos])
+                self.session.commit()
+                reporte['importados'] += len(nuevos)
+            except IntegrityError:
+                # Otro proceso creó alguno de los ingredientes; se guardan uno a uno para aislarlo
+                self.session.rollback()
+                for numero_fila, ingrediente in nuevos:
+                    try:
+                        self.session.bulk_insert_mappings(Ingrediente, [ingrediente])
+                        self.session.commit()
+                        reporte['importados'] += 1
+                    except IntegrityError:
+                        self.session.rollback()
+                        reporte['errores'].append({'fila': numero_fila, 'error': 'Ingrediente ya existe'})
+
+        reporte['errores'].sort(key=lambda error: error['fila'])
+        return reporte
+
+    @operacion
     def crear_receta(self, receta, tiempo, personas, calorias, preparacion):
         receta = Receta(nombre=receta, tiempoPreparacion=tiempo, personasBase=personas, caloriasPorcion=calorias, instrucciones=preparacion)
         self.session.add(receta)
         self.session.commit()
-        return ''
-    
+        return self.dar_cambio('receta', self.dar_dict_receta(receta), None, self.dar_posicion_receta(receta))
+
+    @operacion
+    def editar_receta(self, id_receta, receta, tiempo, personas, calorias, preparacion):
+        receta_busqueda = self.session.query(Receta).get(id_receta)
+        if (receta_busqueda == None):
+            return False
+
+        posicion_anterior = self.dar_posicion_receta(receta_busqueda)
+        receta_busqueda.nombre = receta
+        receta_busqueda.tiempoPreparacion = tiempo
+        receta_busqueda.personasBase = personas
+        receta_busqueda.caloriasPorcion = calorias
+        receta_busqueda.instrucciones = preparacion
+        self.session.commit()
+        return self.dar_cambio('receta', self.dar_dict_receta(receta_busqueda), posicion_anterior,
+                               self.dar_posicion_receta(receta_busqueda))
+
+    @operacion
+    def eliminar_receta(self, id_receta):
+        receta = self.session.query(Receta).get(id_receta)
+        if (receta == None):
+            return False
+
+        cambio = self.dar_cambio('receta', self.dar_dict_receta(receta), self.dar_posicion_receta(receta), None)
+        self.session.delete(receta)
+        self.session.commit()
+        return cambio
+
+    def dar_posicion_receta(self, receta):
+        # Cantidad de recetas antes de ésta en el orden (nombre, id) de dar_recetas, contada sobre el índice de nombre
+        return self.session.query(func.count(Receta.id)).filter(
+            tuple_(Receta.nombre, Receta.id) < tuple_(receta.nombre, receta.id)
+        ).scalar()
+
+    @operacion
     def validar_crear_editar_receta(self, id_receta, receta, tiempo, personas, calorias, preparacion):
+        validacion = self.validar_campos_receta(receta, tiempo, personas, calorias, preparacion)
+        if (validacion != ''):
+            return validacion
+
+        # Al editar (id_receta distinto de -1) la misma receta no cuenta como otra con el mismo nombre
+        condicion = Receta.nombre == receta
+        if id_receta != -1:
+            condicion = and_(condicion, Receta.id != id_receta)
+        existe_receta = self.session.query(exists().where(condicion)).scalar()
+        if (not existe_receta):
+            return ''
+        else:
+            return 'Receta ya existe'
+
+    def validar_campos_receta(self, receta, tiempo, personas, calorias, preparacion):
         patron = re.compile(r"^(?:[0-9]+):([0-5][0-9]):([0-5][0-9])$")
         try:
             personasInt=int(personas)
@@ -120,64 +455,250 @@ class LogicaRecetario():
         elif (preparacion == None or  preparacion == '' or not isinstance(preparacion, str)) :
             return 'Instrucciones Receta Invalido'
         else:
-            busqueda = self.session.query(Receta).filter(Receta.nombre == receta).count()
-            if busqueda == 0:
-                return ''
-            else:
-                return 'Receta ya existe'
+            return ''
+
+    @operacion
+    def importar_recetas(self, fuente, tamano_lote=500):
+        reporte = {'importados': 0, 'errores': []}
+        filas = leer_filas(fuente, 'jsonl')
+
+        for lote in en_lotes(filas, tamano_lote):
+            validas = []
+            for numero_fila, fila in lote:
+                if fila == None:
+                    reporte['errores'].append({'fila': numero_fila, 'error': 'Formato de fila incorrecto'})
+                    continue
+                validacion = self.validar_campos_receta(fila.get('nombre'), fila.get('tiempo'), fila.get('personas'),
+                                                        fila.get('calorias'), fila.get('preparacion'))
+                if (validacion == '' and not isinstance(fila.get('ingredientes', []), list)):
+                    validacion = 'Ingredientes Receta Invalido'
+                # El nombre y la unidad de los ingredientes se usan como llaves de conjuntos y diccionarios del lote
+                if (validacion == '' and not all(self.es_ingrediente_importado(ingrediente)
+                                                 for ingrediente in fila.get('ingredientes', []))):
+                    validacion = 'Ingrediente Invalido'
+                if (validacion != ''):
+                    reporte['errores'].append({'fila': numero_fila, 'error': validacion})
+                else:
+                    validas.append((numero_fila, fila))
+
+            # Consultas por lote: recetas que ya existen y llaves naturales (nombre, unidad) de los ingredientes
+            nombres_recetas = {fila['nombre'] for numero_fila, fila in validas}
+            recetas_existentes = {nombre for nombre, in self.session.query(Receta.nombre).filter(
+                Receta.nombre.in_(bindparam('nombres', expanding=True))
+            ).params(nombres=list(nombres_recetas))} if nombres_recetas else set()
+
+            nombres_ingredientes = {ingrediente['nombre'] for numero_fila, fila in validas
+                                    for ingrediente in fila.get('ingredientes', [])}
+            ids_ingredientes = {(nombre, unidad): id_ingrediente for id_ingrediente, nombre, unidad in self.session.query(
+                Ingrediente.id, Ingrediente.nombre, Ingrediente.unidadMedida
+            ).filter(Ingrediente.nombre.in_(bindparam('nombres', expanding=True))).params(
+                nombres=list(nombres_ingredientes)
+            )} if nombres_ingredientes else {}
+
+            recetas = []
+            ingredientes_recetas = []
+            for numero_fila, fila in validas:
+                validacion, lineas = self.resolver_ingredientes_receta(fila.get('ingredientes', []), ids_ingredientes)
+                if (validacion == '' and fila['nombre'] in recetas_existentes):
+                    validacion = 'Receta ya existe'
+                if (validacion != ''):
+                    reporte['errores'].append({'fila': numero_fila, 'error': validacion})
+                    continue
+                recetas_existentes.add(fila['nombre'])
+                recetas.append({'nombre': fila['nombre'], 'tiempoPreparacion': fila['tiempo'],
+                                'personasBase': int(fila['personas']), 'caloriasPorcion': int(fila['calorias']),
+                                'instrucciones': fila['preparacion']})
+                ingredientes_recetas.append(lineas)
+
+            if len(recetas) == 0:
+                continue
+
+            # La primera inserción toma el bloqueo de escritura de SQLite y entrega el id inicial;
+            # mientras la transacción esté abierta los ids siguientes quedan libres y son consecutivos
+            primer_id = self.session.execute(Receta.__table__.insert(), recetas[0]).inserted_primary_key[0]
+            for posicion, receta in enumerate(recetas):
+                receta['id'] = primer_id + posicion
+            if len(recetas) > 1:
+                self.session.execute(Receta.__table__.insert(), recetas[1:])
+
+            lineas_lote = [dict(linea, receta=receta['id'])
+                           for receta, lineas in zip(recetas, ingredientes_recetas) for linea in lineas]
+            if len(lineas_lote) > 0:
+                self.session.execute(IngredienteReceta.__table__.insert(), lineas_lote)
+            self.session.commit()
+            reporte['importados'] += len(recetas)
+
+        reporte['errores'].sort(key=lambda error: error['fila'])
+        return reporte
+
+    def es_ingrediente_importado(self, ingrediente):
+        return (isinstance(ingrediente, dict) and isinstance(ingrediente.get('nombre'), str)
+                and isinstance(ingrediente.get('unidad'), str))
+
+    def resolver_ingredientes_receta(self, ingredientes, ids_ingredientes):
+        lineas = []
+        for ingrediente in ingredientes:
+            id_ingrediente = ids_ingredientes.get((ingrediente['nombre'], ingrediente['unidad']))
+            if id_ingrediente == None:
+                return 'Ingrediente Invalido', []
+            try:
+                cantidad = float(ingrediente.get('cantidad'))
+            except (TypeError, ValueError):
+                cantidad = 0.0
+            if cantidad <= 0:
+                return 'Cantidad invalido', []
+            lineas.append({'ingrediente': id_ingrediente, 'cantidad': cantidad})
+        return '', lineas
     
+    @operacion
+    def exportar_recetario(self, directorio, formato='jsonl'):
+        return exportacion.exportar_recetario(self.session, directorio, formato)
+
+    @operacion
     def dar_ingredientes_receta(self, id_receta):
-        ingrediente_recetas_mostar = []
-        ingredientes_recetas = self.session.query(IngredienteReceta).filter(IngredienteReceta.receta == (id_receta + 1)).all()
-        for ingrediente in ingredientes_recetas:
-            ingrediente_mostrar = self.session.query(Ingrediente).all()[ingrediente.ingrediente -1]
-            ingrediente_recetas_mostar.append({
-                'ingrediente': ingrediente_mostrar.nombre,
-                'unidad': ingrediente_mostrar.unidadMedida,
-                'cantidad': ingrediente.cantidad
-            })
-        
-        ingredientes_receta_ordenados = sorted(ingrediente_recetas_mostar, key=lambda x: (x['ingrediente'], x['unidad'], x['cantidad']))
+        # Una sola consulta: se une con el ingrediente por su llave primaria y se ordena en SQL
+        ingredientes_receta = self.session.query(
+            Ingrediente.nombre,
+            Ingrediente.unidadMedida,
+            IngredienteReceta.cantidad
+        ).join(
+            Ingrediente, IngredienteReceta.ingrediente == Ingrediente.id
+        ).filter(
+            IngredienteReceta.receta == id_receta
+        ).order_by(
+            Ingrediente.nombre, Ingrediente.unidadMedida, IngredienteReceta.cantidad, IngredienteReceta.id
+        ).all()
 
-        return ingredientes_receta_ordenados
+        return [
+            {
+                'ingrediente': nombre,
+                'unidad': unidad,
+                'cantidad': cantidad
+            }
+            for nombre, unidad, cantidad in ingredientes_receta
+        ]
     
+    @operacion
     def dar_receta(self, id_receta):
-        receta = self.session.query(Receta).all()
+        # Búsqueda por llave primaria: usa el mapa de identidad o una consulta por id que ya trae las instrucciones
+        receta = self.session.query(Receta).options(undefer(Receta.instrucciones)).get(id_receta)
 
-        if (len(receta) < id_receta):
+        if (receta == None):
             return False
         else:
             receta_mock = ({
-                    'nombre': receta[id_receta].nombre,
-                    'tiempo': receta[id_receta].tiempoPreparacion,
-                    'personas': receta[id_receta].personasBase,
-                    'calorias': receta[id_receta].caloriasPorcion,
-                    'preparacion': receta[id_receta].instrucciones
+                    'id': receta.id,
+                    'nombre': receta.nombre,
+                    'tiempo': receta.tiempoPreparacion,
+                    'personas': receta.personasBase,
+                    'calorias': receta.caloriasPorcion,
+                    'preparacion': receta.instrucciones
                     })
             return receta_mock
         
+    @operacion
     def agregar_ingrediente_receta(self, receta, ingrediente, cantidad):
 
-        ingrediente_busqueda = self.session.query(Ingrediente).filter(
+        id_ingrediente = self.dar_id_ingrediente(ingrediente)
+        if id_ingrediente == None:
+            return False
+
+        if 'id' in receta:
+            id_receta = receta['id']
+        else:
+            receta_busqueda =  self.session.query(Receta).filter(
+                Receta.nombre == receta['nombre'],
+                Receta.tiempoPreparacion == receta['tiempo'],
+                Receta.personasBase == receta['personas'],
+                Receta.caloriasPorcion == receta['calorias'],
+                Receta.instrucciones == receta['preparacion']
+            ).all()
+            id_receta = receta_busqueda[0].id
+
+        ingrediente_receta = IngredienteReceta(cantidad=cantidad, receta = id_receta, ingrediente=id_ingrediente)
+        self.session.add(ingrediente_receta)
+        self.session.commit()
+        ingrediente = self.session.query(Ingrediente).get(id_ingrediente)
+        return self.dar_cambio('ingrediente_receta', self.dar_dict_ingrediente_receta(ingrediente_receta, ingrediente),
+                               None, self.dar_posicion_ingrediente_receta(ingrediente_receta, ingrediente))
+
+    def dar_id_ingrediente(self, ingrediente):
+        # El ingrediente llega como su id (el selector de ingredientes) o como el diccionario con sus datos.
+        # Con el id, o un diccionario que lo incluye, basta una búsqueda por llave primaria
+        if isinstance(ingrediente, Mapping) and ingrediente.get('id') != None:
+            ingrediente = ingrediente['id']
+        if isinstance(ingrediente, int):
+            return self.session.query(Ingrediente.id).filter(Ingrediente.id == ingrediente).scalar()
+        if not isinstance(ingrediente, Mapping):
+            return None
+        return self.session.query(Ingrediente.id).filter(
             Ingrediente.nombre == ingrediente['nombre'],
             Ingrediente.sitioCompra == ingrediente['sitioCompra'],
             Ingrediente.unidadMedida == ingrediente['unidad'],
             Ingrediente.valorUnidad == ingrediente['valor']
-        ).all()
+        ).limit(1).scalar()
 
-        receta_busqueda =  self.session.query(Receta).filter(
-            Receta.nombre == receta['nombre'],
-            Receta.tiempoPreparacion == receta['tiempo'],
-            Receta.personasBase == receta['personas'],
-            Receta.caloriasPorcion == receta['calorias'],
-            Receta.instrucciones == receta['preparacion']
-        ).all()
+    def dar_linea_receta(self, id_ingrediente_receta, receta):
+        # Como en LogicaMock, id_ingrediente_receta es la posición de la línea en dar_ingredientes_receta
+        if not isinstance(id_ingrediente_receta, int) or id_ingrediente_receta < 0:
+            return None
+        return self.session.query(IngredienteReceta).join(
+            Ingrediente, IngredienteReceta.ingrediente == Ingrediente.id
+        ).filter(
+            IngredienteReceta.receta == receta['id']
+        ).order_by(
+            Ingrediente.nombre, Ingrediente.unidadMedida, IngredienteReceta.cantidad, IngredienteReceta.id
+        ).offset(id_ingrediente_receta).first()
 
-        ingrediente_receta = IngredienteReceta(cantidad=cantidad, receta = receta_busqueda[0].id, ingrediente=ingrediente_busqueda[0].id)
-        self.session.add(ingrediente_receta)
+    def dar_posicion_ingrediente_receta(self, linea, ingrediente):
+        # Cantidad de líneas de la receta antes de ésta en el orden de dar_ingredientes_receta
+        return self.session.query(func.count(IngredienteReceta.id)).join(
+            Ingrediente, IngredienteReceta.ingrediente == Ingrediente.id
+        ).filter(
+            IngredienteReceta.receta == linea.receta,
+            tuple_(Ingrediente.nombre, Ingrediente.unidadMedida, IngredienteReceta.cantidad, IngredienteReceta.id) <
+            tuple_(ingrediente.nombre, ingrediente.unidadMedida, linea.cantidad, linea.id)
+        ).scalar()
+
+    def dar_dict_ingrediente_receta(self, linea, ingrediente):
+        return {
+            'ingrediente': ingrediente.nombre,
+            'unidad': ingrediente.unidadMedida,
+            'cantidad': linea.cantidad
+        }
+
+    @operacion
+    def editar_ingrediente_receta(self, id_ingrediente_receta, receta, ingrediente, cantidad):
+        linea = self.dar_linea_receta(id_ingrediente_receta, receta)
+        id_ingrediente = self.dar_id_ingrediente(ingrediente)
+        try:
+            cantidadFloat = float(cantidad)
+        except (TypeError, ValueError):
+            cantidadFloat = 0.0
+        if (linea == None or id_ingrediente == None or cantidadFloat <= 0):
+            return False
+
+        ingrediente = self.session.query(Ingrediente).get(id_ingrediente)
+        linea.ingrediente = id_ingrediente
+        linea.cantidad = cantidadFloat
         self.session.commit()
-        return True
-        
+        return self.dar_cambio('ingrediente_receta', self.dar_dict_ingrediente_receta(linea, ingrediente),
+                               id_ingrediente_receta, self.dar_posicion_ingrediente_receta(linea, ingrediente))
+
+    @operacion
+    def eliminar_ingrediente_receta(self, id_ingrediente_receta, receta):
+        linea = self.dar_linea_receta(id_ingrediente_receta, receta)
+        if (linea == None):
+            return False
+
+        ingrediente = self.session.query(Ingrediente).get(linea.ingrediente)
+        cambio = self.dar_cambio('ingrediente_receta', self.dar_dict_ingrediente_receta(linea, ingrediente),
+                                 id_ingrediente_receta, None)
+        self.session.delete(linea)
+        self.session.commit()
+        return cambio
+
+    @operacion
     def validar_crear_editar_ingReceta(self, receta, ingrediente, cantidad):
 
         try:
@@ -186,23 +707,136 @@ class LogicaRecetario():
             cantidadFloat = 0.0
 
 
-        self.ingredientes = self.session.query(Ingrediente).all()
-
-        if (len(self.ingredientes)==0):
+        if (self.session.query(Ingrediente.id).first() == None):
             return 'No existen ingredientes'
-        
-        ingredientes = self.session.query(Ingrediente).filter(
-            Ingrediente.nombre == ingrediente['nombre'],
-            Ingrediente.sitioCompra == ingrediente['sitioCompra'],
-            Ingrediente.unidadMedida == ingrediente['unidad'],
-            Ingrediente.valorUnidad == ingrediente['valor']
-        ).all()
 
-        if(len(ingredientes) == 0):
+        if self.dar_id_ingrediente(ingrediente) == None:
             return 'Ingrediente Invalido'
         
         if (cantidadFloat == None or cantidadFloat <= 0):
             return 'Cantidad invalido'
         
         return ''
-        
\ No newline at end of file
+
+    def es_cantidad_personas(self, personas):
+        # Un entero positivo; bool también es entero pero no es una cantidad de personas
+        return isinstance(personas, numbers.Integral) and not isinstance(personas, bool) and personas > 0
+
+    @operacion
+    def dar_preparacion(self, id_receta, cantidad_personas):
+        # Se acepta una sola cantidad de personas o una lista para calcular varios escenarios
+        if isinstance(cantidad_personas, (list, tuple)):
+            return self.dar_preparaciones([(id_receta, personas) for personas in cantidad_personas])
+        return self.dar_preparaciones([(id_receta, cantidad_personas)])[0]
+
+    @operacion
+    def dar_preparaciones(self, lista_pares):
+        lista_pares = list(lista_pares)
+        ids_recetas = list({id_receta for id_receta, personas in lista_pares})
+        if len(ids_recetas) == 0:
+            return []
+
+        # Una sola consulta con las recetas y las líneas de ingredientes de todos los pares
+        filas = self.session.query(
+            Receta.id,
+            Receta.nombre,
+            Receta.personasBase,
+            Receta.caloriasPorcion,
+            Receta.tiempoPreparacion,
+            Ingrediente.nombre,
+            Ingrediente.unidadMedida,
+            IngredienteReceta.cantidad,
+            Ingrediente.valorUnidad
+        ).outerjoin(
+            IngredienteReceta, IngredienteReceta.receta == Receta.id
+        ).outerjoin(
+            Ingrediente, IngredienteReceta.ingrediente == Ingrediente.id
+        ).filter(
+            Receta.id.in_(bindparam('ids', expanding=True))
+        ).order_by(
+            Receta.id, Ingrediente.nombre, Ingrediente.unidadMedida, IngredienteReceta.cantidad
+        ).params(ids=ids_recetas).all()
+
+        recetas = {}
+        lineas = []
+        for id_receta, nombre, personasBase, caloriasPorcion, tiempo, ingrediente, unidad, cantidad, valor in filas:
+            recetas[id_receta] = {
+                'nombre': nombre,
+                'personasBase': personasBase,
+                'caloriasPorcion': caloriasPorcion,
+                'tiempoPreparacion': tiempo
+            }
+            if ingrediente != None:
+                lineas.append((id_receta, ingrediente, unidad, cantidad, valor))
+
+        # Las recetas sin personas base (filas anteriores o importadas) no se pueden escalar
+        sin_personas_base = {id_receta for id_receta, receta in recetas.items()
+                             if receta['personasBase'] == None or receta['personasBase'] <= 0}
+        pares_validos = [par for par in lista_pares if par[0] in recetas and par[0] not in sin_personas_base
+                         and self.es_cantidad_personas(par[1])]
+        preparaciones = iter(calcular_preparaciones(recetas, lineas, pares_validos))
+        resultados = []
+        for id_receta, personas in lista_pares:
+            if id_receta not in recetas:
+                resultados.append(False)
+            elif id_receta in sin_personas_base or not self.es_cantidad_personas(personas):
+                resultados.append('Numero de Personas Invalido')
+            else:
+                resultados.append(next(preparaciones))
+        return resultados
+
+    @operacion
+    def dar_lista_compras(self, lista_pares):
+        # Personas por receta; una receta repetida en el menú suma sus personas
+        personas_receta = {}
+        for id_receta, personas in lista_pares:
+            if not self.es_cantidad_personas(personas):
+                return 'Numero de Personas Invalido'
+            personas_receta[id_receta] = personas_receta.get(id_receta, 0) + personas
+        if len(personas_receta) == 0:
+            return {'sitios': [], 'total': 0}
+
+        # Una sola consulta agrupada: el menú llega como un objeto JSON {id_receta: personas} que
+        # json_each convierte en tabla, y cada línea se escala por personas / personasBase de su receta.
+        # Las recetas sin personas base (0 o NULL) no se pueden escalar y quedan fuera de la lista
+        menu = text('SELECT CAST(key AS INTEGER) AS receta, value AS personas FROM json_each(:menu)').columns(
+            receta=Integer, personas=Float).alias('menu')
+        cantidad = func.sum(IngredienteReceta.cantidad * menu.c.personas / cast(Receta.personasBase, Float))
+        filas = self.session.query(
+            Ingrediente.sitioCompra,
+            Ingrediente.nombre,
+            Ingrediente.unidadMedida,
+            cantidad,
+            cantidad * Ingrediente.valorUnidad
+        ).select_from(
+            menu
+        ).join(
+            Receta, and_(Receta.id == menu.c.receta, Receta.personasBase > 0)
+        ).join(
+            IngredienteReceta, IngredienteReceta.receta == Receta.id
+        ).join(
+            Ingrediente, IngredienteReceta.ingrediente == Ingrediente.id
+        ).group_by(
+            Ingrediente.id
+        ).order_by(
+            Ingrediente.sitioCompra, Ingrediente.nombre, Ingrediente.unidadMedida
+        ).params(menu=json.dumps(personas_receta)).all()
+
+        sitios = []
+        for sitio, nombre, unidad, cantidad_total, valor in filas:
+            if len(sitios) == 0 or sitios[-1]['sitio'] != sitio:
+                sitios.append({'sitio': sitio, 'ingredientes': [], 'subtotal': 0})
+            sitios[-1]['ingredientes'].append({
+                'nombre': nombre,
+                'unidad': unidad,
+                'cantidad': round(cantidad_total, 2),
+                'valor': round(valor, 2)
+            })
+            sitios[-1]['subtotal'] += valor
+        for sitio in sitios:
+            sitio['subtotal'] = round(sitio['subtotal'], 2)
+        return {'sitios': sitios, 'total': round(sum(sitio['subtotal'] for sitio in sitios), 2)}
+
+    def dar_contador_cambios(self):
+        # No consulta la base de datos: el contador aumenta con cada commit que escribió algo
+        return self.contador_cambios.valor
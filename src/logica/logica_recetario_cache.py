@@ -0,0 +1,121 @@
+'''
+Caché de lectura para la lógica del recetario.
+
+LogicaRecetarioCache envuelve una lógica (LogicaRecetario o LogicaMock) y guarda el
+resultado de los métodos de consulta según sus argumentos. Cualquier escritura hecha a
+través de la caché (crear_*, editar_*, eliminar_*, agregar_*, importar_*) incrementa la
+versión y descarta los resultados guardados. Las escrituras hechas directamente sobre la
+base de datos, sin pasar por la caché, no se detectan.
+
+El candado sólo protege el diccionario de resultados y la versión: las llamadas a la lógica
+se hacen fuera de él, así una consulta lenta en un hilo no detiene las de otros hilos. Una
+consulta guarda su resultado sólo si la versión no cambió mientras se hacía; si hubo una
+escritura en el medio, el resultado se retorna pero no se guarda.
+
+Los resultados se guardan inmutables (listas como tuplas y diccionarios como
+MappingProxyType) para que quien los recibe no pueda modificar la copia compartida;
+la conversión se hace una sola vez al guardar y no en cada acierto.
+'''
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+
+METODOS_CONSULTA = (
+    'dar_recetas',
+    'dar_recetas_pagina',
+    'dar_recetas_por_costo',
+    'buscar_recetas',
+    'dar_receta',
+    'dar_ingredientes',
+    'dar_ingredientes_pagina',
+    'dar_ingrediente',
+    'dar_ingredientes_receta',
+    'dar_preparacion',
+    'dar_preparaciones',
+    'dar_lista_compras',
+)
+
+PREFIJOS_ESCRITURA = ('crear_', 'editar_', 'eliminar_', 'agregar_', 'importar_')
+
+TAMANO_MAXIMO = 256
+
+
+def congelar(valor):
+    ''' Retorna una versión inmutable del valor: listas y tuplas como tuplas y diccionarios como MappingProxyType '''
+    if isinstance(valor, Mapping):
+        return MappingProxyType({llave: congelar(elemento) for llave, elemento in valor.items()})
+    if isinstance(valor, (list, tuple)):
+        return tuple(congelar(elemento) for elemento in valor)
+    return valor
+
+
+def dar_llave(valor):
+    ''' Retorna una representación del valor que se puede usar como llave de diccionario '''
+    if isinstance(valor, Mapping):
+        return tuple(sorted((llave, dar_llave(elemento)) for llave, elemento in valor.items()))
+    if isinstance(valor, (list, tuple)):
+        return tuple(dar_llave(elemento) for elemento in valor)
+    return valor
+
+
+class LogicaRecetarioCache():
+
+    def __init__(self, logica, tamano_maximo=TAMANO_MAXIMO):
+        self.logica = logica
+        self.tamano_maximo = tamano_maximo
+        self.resultados = OrderedDict()
+        self.version = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.candado = threading.RLock()
+
+    def __getattr__(self, nombre):
+        # Sólo se llama para los atributos que no tiene la caché: se delegan a la lógica envuelta
+        atributo = getattr(self.logica, nombre)
+        if nombre in METODOS_CONSULTA:
+            return lambda *args, **kwargs: self.consultar(nombre, atributo, args, kwargs)
+        if nombre.startswith(PREFIJOS_ESCRITURA):
+            return lambda *args, **kwargs: self.escribir(atributo, args, kwargs)
+        return atributo
+
+    def consultar(self, nombre, metodo, args, kwargs):
+        llave = (nombre, dar_llave(args), dar_llave(kwargs))
+        with self.candado:
+            if llave in self.resultados:
+                self.aciertos += 1
+                self.resultados.move_to_end(llave)
+                return self.resultados[llave]
+            self.fallos += 1
+            version = self.version
+
+        resultado = congelar(metodo(*args, **kwargs))
+
+        with self.candado:
+            if self.version == version:
+                self.resultados[llave] = resultado
+                if len(self.resultados) > self.tamano_maximo:
+                    self.resultados.popitem(last=False)
+        return resultado
+
+    def escribir(self, metodo, args, kwargs):
+        # La versión cambia después de la escritura: una consulta que empezó antes y termina
+        # después no guarda su resultado, y una que termina antes se descarta aquí
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            self.invalidar()
+
+    def invalidar(self):
+        with self.candado:
+            self.version += 1
+            self.resultados.clear()
+
+    def dar_estadisticas_cache(self):
+        with self.candado:
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tamano': len(self.resultados),
+                'version': self.version
+            }
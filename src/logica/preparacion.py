@@ -0,0 +1,86 @@
+'''
+Cálculo vectorizado de los datos de preparación de recetas.
+
+Las cantidades de los ingredientes se escalan desde las personas base de cada receta
+hasta las personas solicitadas y se valoran con el valor por unidad de cada
+ingrediente. Todos los pares (receta, personas) se calculan en una sola pasada
+como operaciones sobre arreglos de NumPy.
+'''
+import numpy as np
+
+
+def tiempo_a_segundos(tiempo):
+    horas, minutos, segundos = (int(parte) for parte in tiempo.split(':'))
+    return horas * 3600 + minutos * 60 + segundos
+
+
+def segundos_a_tiempo(segundos):
+    minutos, segundos = divmod(int(segundos), 60)
+    horas, minutos = divmod(minutos, 60)
+    return '{}:{:02d}:{:02d}'.format(horas, minutos, segundos)
+
+
+def calcular_preparaciones(recetas, lineas, pares):
+    ''' Calcula los datos de preparación de varios pares (receta, personas)
+    Parámetros:
+        recetas (dict): por id de receta, su nombre, personasBase, caloriasPorcion y tiempoPreparacion
+        lineas (list): tuplas (id_receta, nombre, unidad, cantidad, valorUnidad) de los ingredientes,
+                       con las líneas de cada receta contiguas
+        pares (list): tuplas (id_receta, personas) de recetas que están en recetas
+    Retorna:
+        (list): un diccionario por cada par, con la forma que recibe VistaPreparacion
+    '''
+    ids_lineas = np.array([linea[0] for linea in lineas], dtype=np.int64)
+    cantidades = np.array([linea[3] for linea in lineas], dtype=float)
+    valores_unidad = np.array([linea[4] for linea in lineas], dtype=float)
+
+    # Posición inicial y cantidad de líneas de cada receta
+    ids_con_lineas, inicios, conteos = np.unique(ids_lineas, return_index=True, return_counts=True)
+    rangos = dict(zip(ids_con_lineas.tolist(), zip(inicios.tolist(), conteos.tolist())))
+
+    inicio_par = np.array([rangos.get(id_receta, (0, 0))[0] for id_receta, personas in pares], dtype=np.int64)
+    conteo_par = np.array([rangos.get(id_receta, (0, 0))[1] for id_receta, personas in pares], dtype=np.int64)
+    personas = np.array([personas for id_receta, personas in pares], dtype=float)
+    personas_base = np.array([recetas[id_receta]['personasBase'] for id_receta, p in pares], dtype=float)
+    segundos_base = np.array([tiempo_a_segundos(recetas[id_receta]['tiempoPreparacion'])
+                              for id_receta, p in pares], dtype=float)
+    factores = personas / personas_base
+
+    # Se expande cada par en las líneas de su receta: par_de_linea indica a qué par pertenece
+    # cada posición e indice_linea qué línea de la receta se usa en esa posición
+    fin_par = np.cumsum(conteo_par)
+    par_de_linea = np.repeat(np.arange(len(pares)), conteo_par)
+    indice_linea = np.arange(int(fin_par[-1]) if len(pares) > 0 else 0) - \
+        np.repeat(fin_par - conteo_par - inicio_par, conteo_par)
+
+    cantidades_escaladas = cantidades[indice_linea] * factores[par_de_linea]
+    valores = cantidades_escaladas * valores_unidad[indice_linea]
+    costos = np.bincount(par_de_linea, weights=valores, minlength=len(pares))
+    segundos = np.rint(segundos_base * factores)
+
+    cantidades_escaladas = np.round(cantidades_escaladas, 2).tolist()
+    valores = np.round(valores, 2).tolist()
+    indice_linea = indice_linea.tolist()
+
+    preparaciones = []
+    for posicion_par, (id_receta, cantidad_personas) in enumerate(pares):
+        receta = recetas[id_receta]
+        posiciones = range(int(fin_par[posicion_par] - conteo_par[posicion_par]), int(fin_par[posicion_par]))
+        preparaciones.append({
+            'receta': receta['nombre'],
+            'personas': cantidad_personas,
+            'calorias': receta['caloriasPorcion'],
+            'calorias_totales': receta['caloriasPorcion'] * cantidad_personas,
+            'costo': round(float(costos[posicion_par]), 2),
+            'tiempo_preparacion': segundos_a_tiempo(segundos[posicion_par]),
+            'datos_ingredientes': [
+                {
+                    'nombre': lineas[indice_linea[posicion]][1],
+                    'unidad': lineas[indice_linea[posicion]][2],
+                    'cantidad': cantidades_escaladas[posicion],
+                    'valor': valores[posicion]
+                }
+                for posicion in posiciones
+            ]
+        })
+    return preparaciones
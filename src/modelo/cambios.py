@@ -0,0 +1,48 @@
+'''
+Contador de cambios confirmados en la base de datos de un motor.
+
+El contador aumenta cada vez que se confirma una transacción que ejecutó al menos un
+INSERT, UPDATE o DELETE, sin importar si se hizo desde el ORM o con sentencias del core.
+Quien guarda el valor del contador al cargar unos datos puede saber después, sin consultar
+la base de datos, si algo cambió desde entonces.
+'''
+import threading
+import weakref
+
+from sqlalchemy import event
+
+SENTENCIAS_ESCRITURA = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class ContadorCambios():
+
+    def __init__(self, motor):
+        self.valor = 0
+        self.candado = threading.Lock()
+        event.listen(motor, 'after_cursor_execute', self.registrar_sentencia)
+        event.listen(motor, 'commit', self.registrar_commit)
+        event.listen(motor, 'rollback', self.registrar_rollback)
+
+    def registrar_sentencia(self, conexion, cursor, sentencia, parametros, contexto, executemany):
+        if sentencia.lstrip().upper().startswith(SENTENCIAS_ESCRITURA):
+            conexion.info['cambios_pendientes'] = True
+
+    def registrar_commit(self, conexion):
+        if conexion.info.pop('cambios_pendientes', False):
+            with self.candado:
+                self.valor += 1
+
+    def registrar_rollback(self, conexion):
+        conexion.info.pop('cambios_pendientes', None)
+
+
+contadores = weakref.WeakKeyDictionary()
+candado_contadores = threading.Lock()
+
+
+def dar_contador_cambios(motor):
+    ''' Retorna el contador de cambios del motor; se crea la primera vez que se pide '''
+    with candado_contadores:
+        if motor not in contadores:
+            contadores[motor] = ContadorCambios(motor)
+        return contadores[motor]
@@ -1,9 +1,133 @@
-from sqlalchemy import create_engine
+'''
+Motor, fábrica de sesiones y base declarativa del modelo.
+
+La conexión se configura con variables de entorno:
+    RECETARIO_DB_URL               URL de SQLAlchemy (por defecto sqlite:///aplicacion.sqlite).
+                                   Con sqlite:// se usa una base de datos en memoria compartida
+                                   por todas las sesiones del proceso.
+    RECETARIO_DB_POOL              Tipo de pool: null, static, singleton o queue (por defecto
+                                   queue para un archivo SQLite). static y singleton sólo son
+                                   seguros con la base de datos en memoria: singleton cierra
+                                   conexiones de otros hilos cuando hay más hilos que pool_size
+    RECETARIO_DB_POOL_SIZE         Conexiones del pool queue
+    RECETARIO_SQLITE_JOURNAL_MODE  DELETE, TRUNCATE, PERSIST, MEMORY, WAL u OFF
+    RECETARIO_SQLITE_SYNCHRONOUS   OFF, NORMAL, FULL o EXTRA
+    RECETARIO_SQLITE_CACHE_SIZE    Páginas (positivo) o KiB (negativo) de la caché de SQLite
+    RECETARIO_SQLITE_MMAP_SIZE     Bytes de la base de datos leídos con mmap
+    RECETARIO_SQLITE_BUSY_TIMEOUT  Milisegundos que se espera a que se libere un bloqueo
+
+Los pragmas que no se configuran conservan el valor por defecto de SQLite.
+'''
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool, SingletonThreadPool, StaticPool
+
+URL_POR_DEFECTO = 'sqlite:///aplicacion.sqlite'
+
+POOLS = {
+    'null': NullPool,
+    'static': StaticPool,
+    'singleton': SingletonThreadPool,
+    'queue': QueuePool,
+}
+
+VALORES_JOURNAL_MODE = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+VALORES_SYNCHRONOUS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def dar_configuracion(entorno=None):
+    ''' Lee la configuración del motor desde las variables de entorno
+    Retorna:
+        (dict): url, pool, pool_size y los pragmas de SQLite; None en lo que no está configurado
+    '''
+    entorno = os.environ if entorno == None else entorno
+    return {
+        'url': entorno.get('RECETARIO_DB_URL', URL_POR_DEFECTO),
+        'pool': entorno.get('RECETARIO_DB_POOL'),
+        'pool_size': entorno.get('RECETARIO_DB_POOL_SIZE'),
+        'journal_mode': entorno.get('RECETARIO_SQLITE_JOURNAL_MODE'),
+        'synchronous': entorno.get('RECETARIO_SQLITE_SYNCHRONOUS'),
+        'cache_size': entorno.get('RECETARIO_SQLITE_CACHE_SIZE'),
+        'mmap_size': entorno.get('RECETARIO_SQLITE_MMAP_SIZE'),
+        'busy_timeout': entorno.get('RECETARIO_SQLITE_BUSY_TIMEOUT'),
+    }
+
+
+def es_memoria(url):
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def dar_pragmas(configuracion):
+    ''' Retorna las sentencias PRAGMA de la configuración, validando cada valor '''
+    pragmas = []
+    if configuracion.get('journal_mode') != None:
+        valor = str(configuracion['journal_mode']).upper()
+        if valor not in VALORES_JOURNAL_MODE:
+            raise ValueError('journal_mode no válido: ' + valor)
+        pragmas.append('PRAGMA journal_mode = ' + valor)
+    if configuracion.get('synchronous') != None:
+        valor = str(configuracion['synchronous']).upper()
+        if valor not in VALORES_SYNCHRONOUS:
+            raise ValueError('synchronous no válido: ' + valor)
+        pragmas.append('PRAGMA synchronous = ' + valor)
+    for pragma in ('cache_size', 'mmap_size', 'busy_timeout'):
+        if configuracion.get(pragma) != None:
+            pragmas.append('PRAGMA {} = {:d}'.format(pragma, int(configuracion[pragma])))
+    return pragmas
+
+
+def crear_motor(**configuracion):
+    ''' Crea el motor de la base de datos
+    Parámetros:
+        configuracion: los mismos valores que retorna dar_configuracion; los que no se pasan
+                       se toman de las variables de entorno
+    Retorna:
+        (Engine): El motor, con los pragmas aplicados a cada conexión nueva
+    '''
+    configuracion = dict(dar_configuracion(), **configuracion)
+    url = configuracion['url']
+    argumentos = {}
+
+    if es_memoria(url):
+        # Una sola conexión compartida: cada conexión nueva a :memory: sería una base de datos vacía
+        argumentos['poolclass'] = StaticPool
+        argumentos['connect_args'] = {'check_same_thread': False}
+    elif configuracion.get('pool') != None:
+        argumentos['poolclass'] = POOLS[configuracion['pool']]
+    elif make_url(url).get_backend_name() == 'sqlite':
+        # La lógica abre una sesión por operación: el pool conserva las conexiones abiertas para no
+        # pagar la apertura del archivo ni perder la caché de páginas de SQLite en cada llamada
+        argumentos['poolclass'] = QueuePool
+
+    if argumentos.get('poolclass') == QueuePool:
+        if configuracion.get('pool_size') != None:
+            argumentos['pool_size'] = int(configuracion['pool_size'])
+        if make_url(url).get_backend_name() == 'sqlite':
+            # Una conexión del pool la usa un solo hilo a la vez, pero no siempre el mismo hilo
+            argumentos['connect_args'] = {'check_same_thread': False}
+
+    motor = create_engine(url, **argumentos)
+
+    pragmas = dar_pragmas(configuracion)
+    if motor.dialect.name == 'sqlite' and len(pragmas) > 0:
+        @event.listens_for(motor, 'connect')
+        def aplicar_pragmas(conexion_dbapi, registro_conexion):
+            cursor = conexion_dbapi.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+    return motor
+
 
-engine = create_engine('sqlite:///aplicacion.sqlite')
+engine = crear_motor()
 Session = sessionmaker(bind=engine)
 
 Base = declarative_base()
-session = Session()
\ No newline at end of file
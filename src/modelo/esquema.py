@@ -0,0 +1,46 @@
+import warnings
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+
+from .declarative_base import Base
+from .ingrediente import Ingrediente
+from .ingrediente_receta import IngredienteReceta
+from .receta import Receta
+from .receta_busqueda import crear_busqueda, fts5_disponible, reconstruir_busqueda
+from .receta_costo import RecetaCosto, crear_disparadores_costo, reconstruir_costos
+
+
+def actualizar_esquema(motor):
+    '''
+    Crea las tablas que no existen y agrega a las tablas existentes los índices
+    declarados en los modelos que todavía no están en la base de datos.
+    También crea los disparadores que mantienen receta_costo y, si la tabla es nueva,
+    calcula el costo de las recetas que ya existían. Lo mismo con el índice de búsqueda
+    receta_fts, que sólo se crea si SQLite incluye FTS5.
+    '''
+    costos_nuevos = RecetaCosto.__tablename__ not in inspect(motor).get_table_names()
+    Base.metadata.create_all(motor)
+
+    with motor.begin() as conexion:
+        crear_disparadores_costo(conexion)
+        if costos_nuevos:
+            reconstruir_costos(conexion)
+        if fts5_disponible(conexion):
+            if crear_busqueda(conexion):
+                reconstruir_busqueda(conexion)
+        else:
+            warnings.warn('SQLite no incluye FTS5: la búsqueda de recetas no usará el índice de texto completo')
+
+    inspector = inspect(motor)
+    for tabla in Base.metadata.sorted_tables:
+        indices_existentes = {indice['name'] for indice in inspector.get_indexes(tabla.name)}
+        for indice in tabla.indexes:
+            if indice.name in indices_existentes:
+                continue
+            try:
+                indice.create(motor)
+            except IntegrityError:
+                # Hay datos repetidos de versiones anteriores; la validación sigue evitando nuevos duplicados
+                warnings.warn('No se pudo crear el índice único {}: la tabla {} tiene registros repetidos'.format(
+                    indice.name, tabla.name))
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String 
+from sqlalchemy import Column, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from .declarative_base import Base
 
 class Ingrediente(Base):
     __tablename__ = 'ingrediente'
+    __table_args__ = (
+        Index('ix_ingrediente_nombre_unidad_sitio', 'nombre', 'unidadMedida', 'sitioCompra'),
+        Index('ux_ingrediente_nombre_unidad', 'nombre', 'unidadMedida', unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     nombre = Column(String)
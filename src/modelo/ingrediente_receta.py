@@ -8,5 +8,5 @@ class IngredienteReceta(Base):
 
     id = Column(Integer, primary_key=True)
     cantidad = Column(Float)
-    receta = Column(Integer, ForeignKey('receta.id'))
-    ingrediente =  Column(Integer, ForeignKey('ingrediente.id'))
\ No newline at end of file
+    receta = Column(Integer, ForeignKey('receta.id'), index=True)
+    ingrediente =  Column(Integer, ForeignKey('ingrediente.id'), index=True)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from .declarative_base import Base
 
@@ -7,9 +7,10 @@ class Receta(Base):
     __tablename__ = 'receta'
 
     id = Column(Integer, primary_key=True)
-    nombre = Column(String)
+    nombre = Column(String, index=True)
     tiempoPreparacion = Column(String)
     personasBase = Column(Integer)
     caloriasPorcion = Column(Integer)
-    instrucciones = Column(String)
+    # Puede ser un texto largo: sólo se carga al leer el atributo o con undefer (ver dar_receta)
+    instrucciones = deferred(Column(String))
     ingredientes = relationship('IngredienteReceta', cascade='all, delete, delete-orphan')
\ No newline at end of file
@@ -0,0 +1,94 @@
+'''
+Índice de texto completo (FTS5 de SQLite) sobre el nombre y las instrucciones de las recetas.
+
+receta_fts es una tabla virtual de contenido externo: no guarda una copia del texto, sólo
+el índice, y toma el contenido de la tabla receta. Los disparadores de DISPARADORES_BUSQUEDA
+la mantienen al día con cada inserción, edición o eliminación de recetas.
+
+El tokenizador unicode61 con remove_diacritics 2 ignora mayúsculas y tildes, así "canción",
+"Cancion" y "CANCIÓN" son el mismo término. Los prefijos de 2 y 3 letras se indexan para
+que las búsquedas mientras se escribe no recorran todo el vocabulario.
+'''
+import re
+
+from sqlalchemy import text
+
+TABLA_BUSQUEDA = 'receta_fts'
+
+CREAR_TABLA_BUSQUEDA = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS receta_fts USING fts5(
+        nombre, instrucciones,
+        content='receta', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )'''
+
+# El nombre pesa más que las instrucciones al ordenar por relevancia
+PESO_NOMBRE = 10.0
+PESO_INSTRUCCIONES = 1.0
+
+# bm25 se calcula para todas las coincidencias antes de ordenar. Con más coincidencias que
+# este límite (por ejemplo mientras se escriben las primeras letras) los resultados se
+# entregan en el orden del índice, que sólo lee las filas de la página
+LIMITE_RELEVANCIA = 2000
+
+DISPARADORES_BUSQUEDA = {
+    'tr_receta_fts_insert': '''
+        CREATE TRIGGER IF NOT EXISTS tr_receta_fts_insert AFTER INSERT ON receta
+        BEGIN
+            INSERT INTO receta_fts (rowid, nombre, instrucciones) VALUES (NEW.id, NEW.nombre, NEW.instrucciones);
+        END''',
+    'tr_receta_fts_delete': '''
+        CREATE TRIGGER IF NOT EXISTS tr_receta_fts_delete AFTER DELETE ON receta
+        BEGIN
+            INSERT INTO receta_fts (receta_fts, rowid, nombre, instrucciones)
+            VALUES ('delete', OLD.id, OLD.nombre, OLD.instrucciones);
+        END''',
+    'tr_receta_fts_update': '''
+        CREATE TRIGGER IF NOT EXISTS tr_receta_fts_update AFTER UPDATE OF nombre, instrucciones ON receta
+        BEGIN
+            INSERT INTO receta_fts (receta_fts, rowid, nombre, instrucciones)
+            VALUES ('delete', OLD.id, OLD.nombre, OLD.instrucciones);
+            INSERT INTO receta_fts (rowid, nombre, instrucciones) VALUES (NEW.id, NEW.nombre, NEW.instrucciones);
+        END''',
+}
+
+
+def fts5_disponible(conexion):
+    ''' Indica si la versión de SQLite de la conexión incluye FTS5 '''
+    if conexion.dialect.name != 'sqlite':
+        return False
+    opciones = {fila[0] for fila in conexion.execute(text('PRAGMA compile_options'))}
+    return 'ENABLE_FTS5' in opciones
+
+
+def crear_busqueda(conexion):
+    ''' Crea la tabla de búsqueda y sus disparadores
+    Retorna:
+        (bool): True si la tabla no existía y hay que reconstruirla con reconstruir_busqueda
+    '''
+    existia = conexion.execute(text(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = :nombre"
+    ), nombre=TABLA_BUSQUEDA).scalar() > 0
+    conexion.execute(text(CREAR_TABLA_BUSQUEDA))
+    for disparador in DISPARADORES_BUSQUEDA.values():
+        conexion.execute(text(disparador))
+    return not existia
+
+
+def reconstruir_busqueda(conexion):
+    ''' Vuelve a indexar todas las recetas '''
+    conexion.execute(text("INSERT INTO receta_fts (receta_fts) VALUES ('rebuild')"))
+
+
+def dar_consulta_busqueda(texto):
+    ''' Convierte el texto escrito por el usuario en una consulta FTS5: deben aparecer todas las
+    palabras y las de dos o más letras se buscan como prefijo (las de una letra, que no tienen
+    índice de prefijos, como palabra completa). Los operadores y signos de FTS5 del texto se ignoran.
+    Retorna:
+        (str): La consulta, o None si el texto no tiene palabras
+    '''
+    palabras = re.findall(r'\w+', texto or '')
+    if len(palabras) == 0:
+        return None
+    return ' '.join(('"{}"*' if len(palabra) > 1 else '"{}"').format(palabra) for palabra in palabras)
@@ -0,0 +1,107 @@
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer, text
+
+from .declarative_base import Base
+
+class RecetaCosto(Base):
+    '''
+    Costo base de cada receta (suma de cantidad * valorUnidad de sus ingredientes).
+    La tabla se mantiene con los disparadores de DISPARADORES_COSTO; no se escribe desde el ORM.
+    '''
+    __tablename__ = 'receta_costo'
+    __table_args__ = (
+        Index('ix_receta_costo_costo', 'costo', 'receta'),
+    )
+
+    receta = Column(Integer, ForeignKey('receta.id'), primary_key=True)
+    costo = Column(Float, nullable=False, default=0)
+
+
+# Costo calculado desde cero para las recetas que cumplen la condición sobre r.id
+COSTO_CALCULADO = '''
+    SELECT r.id AS receta, COALESCE(SUM(ir.cantidad * i."valorUnidad"), 0) AS costo
+    FROM receta r
+    LEFT JOIN ingrediente_receta ir ON ir.receta = r.id
+    LEFT JOIN ingrediente i ON i.id = ir.ingrediente
+    WHERE {condicion}
+    GROUP BY r.id
+'''
+
+RECALCULAR_RECETA = '''
+        UPDATE receta_costo SET costo = (
+            SELECT COALESCE(SUM(ir.cantidad * i."valorUnidad"), 0)
+            FROM ingrediente_receta ir JOIN ingrediente i ON i.id = ir.ingrediente
+            WHERE ir.receta = receta_costo.receta
+        ) WHERE {condicion};'''
+
+DISPARADORES_COSTO = {
+    'tr_receta_costo_receta_insert': '''
+        CREATE TRIGGER IF NOT EXISTS tr_receta_costo_receta_insert AFTER INSERT ON receta
+        BEGIN
+            INSERT OR REPLACE INTO receta_costo (receta, costo) VALUES (NEW.id, 0);
+        END''',
+    'tr_receta_costo_receta_delete': '''
+        CREATE TRIGGER IF NOT EXISTS tr_receta_costo_receta_delete AFTER DELETE ON receta
+        BEGIN
+            DELETE FROM receta_costo WHERE receta = OLD.id;
+        END''',
+    'tr_receta_costo_linea_insert': '''
+        CREATE TRIGGER IF NOT EXISTS tr_receta_costo_linea_insert AFTER INSERT ON ingrediente_receta
+        BEGIN''' + RECALCULAR_RECETA.format(condicion='receta_costo.receta = NEW.receta') + '''
+        END''',
+    'tr_receta_costo_linea_delete': '''
+        CREATE TRIGGER IF NOT EXISTS tr_receta_costo_linea_delete AFTER DELETE ON ingrediente_receta
+        BEGIN''' + RECALCULAR_RECETA.format(condicion='receta_costo.receta = OLD.receta') + '''
+        END''',
+    'tr_receta_costo_linea_update': '''
+        CREATE TRIGGER IF NOT EXISTS tr_receta_costo_linea_update
+        AFTER UPDATE OF cantidad, receta, ingrediente ON ingrediente_receta
+        BEGIN''' + RECALCULAR_RECETA.format(
+            condicion='receta_costo.receta IN (OLD.receta, NEW.receta)') + '''
+        END''',
+    'tr_receta_costo_ingrediente_update': '''
+        CREATE TRIGGER IF NOT EXISTS tr_receta_costo_ingrediente_update
+        AFTER UPDATE OF "valorUnidad" ON ingrediente
+        WHEN OLD."valorUnidad" IS NOT NEW."valorUnidad"
+        BEGIN''' + RECALCULAR_RECETA.format(
+            condicion='receta_costo.receta IN (SELECT receta FROM ingrediente_receta WHERE ingrediente = NEW.id)') + '''
+        END''',
+}
+
+
+def crear_disparadores_costo(conexion):
+    for disparador in DISPARADORES_COSTO.values():
+        conexion.execute(text(disparador))
+
+
+def reconstruir_costos(conexion):
+    ''' Recalcula desde cero el costo de todas las recetas
+    Retorna:
+        (int): La cantidad de recetas con costo
+    '''
+    conexion.execute(text('DELETE FROM receta_costo'))
+    conexion.execute(text('INSERT INTO receta_costo (receta, costo) ' + COSTO_CALCULADO.format(condicion='1 = 1')))
+    return conexion.execute(text('SELECT COUNT(*) FROM receta_costo')).scalar()
+
+
+def verificar_costos(conexion, tolerancia=0.005):
+    ''' Compara el costo guardado de cada receta con el costo calculado desde cero
+    Retorna:
+        (list): Un diccionario con receta, costo_guardado y costo_calculado por cada receta que no coincide.
+                costo_guardado es None si la receta no tiene costo y costo_calculado es None si la receta no existe
+    '''
+    calculados = {fila.receta: fila.costo for fila in conexion.execute(
+        text(COSTO_CALCULADO.format(condicion='1 = 1')))}
+    guardados = {fila.receta: fila.costo for fila in conexion.execute(
+        text('SELECT receta, costo FROM receta_costo'))}
+
+    diferencias = []
+    for receta in sorted(set(calculados) | set(guardados)):
+        costo_guardado = guardados.get(receta)
+        costo_calculado = calculados.get(receta)
+        if costo_guardado == None or costo_calculado == None or abs(costo_guardado - costo_calculado) > tolerancia:
+            diferencias.append({
+                'receta': receta,
+                'costo_guardado': costo_guardado,
+                'costo_calculado': costo_calculado
+            })
+    return diferencias
@@ -0,0 +1,108 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from src.logica.logica_recetario_cache import dar_llave
+
+
+class EmisorTarea(QObject):
+    #Objeto que vive en el hilo de la interfaz y recibe los resultados de los hilos de trabajo
+
+    terminada = pyqtSignal(object, object)
+    fallida = pyqtSignal(object, object)
+
+
+class TareaLogica(QRunnable):
+    #Llamada a un método de la lógica que se ejecuta en un hilo del pool
+
+    def __init__(self, metodo, args, emisor):
+        super().__init__()
+        self.metodo = metodo
+        self.args = args
+        self.emisor = emisor
+        self.callbacks = []
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            resultado = self.metodo(*self.args)
+        except Exception as error:
+            self.emisor.fallida.emit(self, error)
+        else:
+            self.emisor.terminada.emit(self, resultado)
+
+
+class FachadaAsincrona(QObject):
+    """
+    Ejecuta los métodos de la lógica en un hilo de trabajo y entrega los resultados en el hilo
+    de la interfaz por medio de señales. Cada hilo de trabajo usa su propia sesión (ver
+    LogicaRecetario.unidad_de_trabajo).
+
+    Las consultas (dar_*, buscar_*) iguales que todavía no han terminado se agrupan en una sola tarea.
+    Las tareas se ejecutan en orden en un solo hilo, así una consulta pedida después de una
+    escritura siempre ve el resultado de la escritura.
+    """
+
+    def __init__(self, logica, pool=None):
+        super().__init__()
+        self.logica = logica
+        if pool == None:
+            pool = QThreadPool(self)
+            pool.setMaxThreadCount(1)
+        self.pool = pool
+        self.consultas_pendientes = {}
+        self.tareas = set()
+
+        self.emisor = EmisorTarea(self)
+        self.emisor.terminada.connect(self.entregar_resultado)
+        self.emisor.fallida.connect(self.entregar_error)
+
+    def llamar(self, nombre, *args, al_terminar=None, al_fallar=None):
+        """
+        Programa la llamada logica.nombre(*args); al_terminar recibe el resultado y al_fallar la excepción
+        """
+        es_consulta = nombre.startswith(('dar_', 'buscar_'))
+        llave = (nombre, dar_llave(args))
+        if es_consulta and llave in self.consultas_pendientes:
+            callbacks = self.consultas_pendientes[llave].callbacks
+            if (al_terminar, al_fallar) not in callbacks:
+                callbacks.append((al_terminar, al_fallar))
+            return
+
+        if not es_consulta:
+            self.invalidar()
+
+        tarea = TareaLogica(getattr(self.logica, nombre), args, self.emisor)
+        tarea.llave = llave if es_consulta else None
+        tarea.callbacks.append((al_terminar, al_fallar))
+        if es_consulta:
+            self.consultas_pendientes[llave] = tarea
+        self.tareas.add(tarea)
+        self.pool.start(tarea)
+
+    def invalidar(self):
+        """
+        Las consultas que se pidan desde ahora no se agrupan con las que ya estaban programadas.
+        Se llama después de cada escritura, incluidas las que se hacen directamente sobre la lógica.
+        """
+        self.consultas_pendientes.clear()
+
+    def terminar_tarea(self, tarea):
+        self.tareas.discard(tarea)
+        if self.consultas_pendientes.get(tarea.llave) is tarea:
+            del self.consultas_pendientes[tarea.llave]
+        return tarea.callbacks
+
+    def entregar_resultado(self, tarea, resultado):
+        for al_terminar, al_fallar in self.terminar_tarea(tarea):
+            if al_terminar != None:
+                al_terminar(resultado)
+
+    def entregar_error(self, tarea, error):
+        for al_terminar, al_fallar in self.terminar_tarea(tarea):
+            if al_fallar != None:
+                al_fallar(error)
+
+    def esperar(self, milisegundos=-1):
+        """
+        Espera a que terminen las tareas programadas; los resultados se entregan al procesar los eventos
+        """
+        return self.pool.waitForDone(milisegundos)
@@ -1,4 +1,6 @@
-from PyQt5.QtWidgets import QApplication
+from collections.abc import Mapping
+
+from PyQt5.QtWidgets import QApplication, QMessageBox
 from .VistaListaRecetas import VistaListaRecetas
 from .VistaReceta import VistaReceta
 from .VistaListaIngredientes import VistaListaIngredientes
@@ -6,6 +8,10 @@ from .VistaListaRecetas import VistaListaRecetas
 #from .VistaPersonasPreparacion import VistaPersonasPreparacion
 from .VistaPreparacion import VistaPreparacion
 from .VistaListaIngredientesReceta import VistaListaIngredientesReceta
+from .VistaListaCompras import VistaListaCompras
+from .FachadaAsincrona import FachadaAsincrona
+from .Navegador import Navegador
+from src.logica.indice_prefijos import IndicePrefijos
 
 
 class App_Recetario(QApplication):
@@ -20,14 +26,94 @@ class App_Recetario(QApplication):
         super(App_Recetario, self).__init__(sys_argv)
 
         self.logica = logica
+        self.fachada_asincrona = FachadaAsincrona(logica)
+        self.navegador = Navegador(logica.dar_contador_cambios)
+        self.indice_ingredientes = None
         self.mostrar_vista_lista_recetas()
 
     def mostrar_vista_lista_recetas(self):
         """
-        Esta función inicializa la ventana de lista de recetas
+        Esta función muestra la ventana de lista de recetas; la lista sólo se recarga si hubo cambios
+        """
+        self.vista_lista_recetas = self.navegador.mostrar('lista_recetas', lambda: VistaListaRecetas(self),
+                                                          lambda vista: vista.refrescar_recetas())
+
+    def refrescar_lista_recetas(self):
+        """
+        Esta función vuelve a cargar la lista de recetas desde la primera página
+        """
+        self.navegador.refrescar('lista_recetas')
+
+    def pedir_pagina_recetas(self, tamano_pagina, despues_de, entregar):
+        """
+        Esta función consulta en segundo plano una página de recetas y la entrega a la lista
+        """
+        self.fachada_asincrona.llamar('dar_recetas_pagina', tamano_pagina, despues_de,
+                                      al_terminar=entregar, al_fallar=self.mostrar_error)
+
+    def buscar_recetas(self, texto, tamano_pagina, despues_de, entregar):
+        """
+        Esta función busca en segundo plano una página de recetas y la entrega a la lista
+        """
+        self.fachada_asincrona.llamar('buscar_recetas', texto, tamano_pagina, despues_de,
+                                      al_terminar=entregar, al_fallar=self.mostrar_error)
+
+    def refrescar_lista_ingredientes(self):
+        """
+        Esta función vuelve a cargar la lista de ingredientes desde la primera página
+        """
+        self.navegador.refrescar('lista_ingredientes')
+
+    def pedir_pagina_ingredientes(self, tamano_pagina, despues_de, entregar):
+        """
+        Esta función consulta en segundo plano una página de ingredientes y la entrega a la lista
+        """
+        self.fachada_asincrona.llamar('dar_ingredientes_pagina', tamano_pagina, despues_de,
+                                      al_terminar=entregar, al_fallar=self.mostrar_error)
+
+    def aplicar_cambio(self, nombre_vista, cambio, contador_anterior):
+        """
+        Esta función lleva a la lista el cambio que informó la lógica después de una escritura, sin
+        volver a consultarla. Si la lógica no informó el cambio, la lista se recarga.
+        """
+        vista = self.navegador.dar_vista(nombre_vista)
+        if vista == None:
+            return
+        if isinstance(cambio, dict):
+            vista.aplicar_cambio(cambio)
+            self.navegador.marcar_vigente(nombre_vista, contador_anterior)
+        else:
+            self.navegador.refrescar(nombre_vista)
+
+    def dar_indice_ingredientes(self):
+        """
+        Esta función retorna el índice de ingredientes del selector; se construye la primera vez que se
+        necesita y después se mantiene con los cambios de cada escritura de ingredientes
+        """
+        if self.indice_ingredientes == None:
+            self.indice_ingredientes = IndicePrefijos(self.logica.dar_ingredientes())
+        return self.indice_ingredientes
+
+    def aplicar_cambio_ingrediente(self, cambio, contador_anterior):
+        """
+        Esta función lleva el cambio de un ingrediente a la lista de ingredientes y al índice del selector
         """
-        self.vista_lista_recetas = VistaListaRecetas(self)
-        self.vista_lista_recetas.mostrar_recetas(self.logica.dar_recetas())
+        if self.indice_ingredientes != None:
+            if isinstance(cambio, dict):
+                self.indice_ingredientes.aplicar_cambio(cambio)
+            else:
+                self.indice_ingredientes = None
+        self.aplicar_cambio('lista_ingredientes', cambio, contador_anterior)
+
+    def mostrar_error(self, error):
+        """
+        Esta función informa un error de una consulta hecha en segundo plano
+        """
+        mensaje_error = QMessageBox()
+        mensaje_error.setIcon(QMessageBox.Critical)
+        mensaje_error.setWindowTitle("Error")
+        mensaje_error.setText("No se pudo consultar la información: " + str(error))
+        mensaje_error.exec_()
 
     def crear_receta(self):
         """
@@ -41,23 +127,28 @@ class App_Recetario(QApplication):
         """
         self.receta_actual = id_receta
         if id_receta != -1:
-            self.mostrar_ventana_receta(self.logica.dar_receta(self.receta_actual))
+            cargar = lambda vista: vista.mostrar_receta(self.logica.dar_receta(id_receta))
         else:
-            self.mostrar_ventana_receta(None)
+            cargar = lambda vista: vista.mostrar_receta(None)
+        # Una receta nueva siempre empieza con el formulario vacío
+        self.vistaReceta = self.navegador.mostrar('receta', lambda: VistaReceta(self), cargar,
+                                                  llave=id_receta, recargar=id_receta == -1)
     
     def eliminar_receta(self, indice):
         """
         Esta función permite eliminar una receta
         """
-        self.logica.eliminar_receta(indice)
-        self.vista_lista_recetas.mostrar_recetas(self.logica.dar_recetas())
+        contador_anterior = self.logica.dar_contador_cambios()
+        cambio = self.logica.eliminar_receta(indice)
+        self.fachada_asincrona.invalidar()
+        self.aplicar_cambio('lista_recetas', cambio, contador_anterior)
 		
     def mostrar_ventana_receta(self, receta):
         """
         Esta función muestra la ventana con la información de una receta
         """
-        self.vistaReceta = VistaReceta(self)
-        self.vistaReceta.mostrar_receta(receta)
+        self.vistaReceta = self.navegador.mostrar('receta', lambda: VistaReceta(self),
+                                                  lambda vista: vista.mostrar_receta(receta), llave=self.receta_actual)
 
 
     def guardar_receta(self, receta, tiempo, personas, calorias, preparacion):
@@ -66,19 +157,21 @@ class App_Recetario(QApplication):
         """
         validacion = self.logica.validar_crear_editar_receta(self.receta_actual, receta, tiempo, personas, calorias, preparacion)
         if validacion == "":
+            contador_anterior = self.logica.dar_contador_cambios()
             if self.receta_actual == -1:
-                self.logica.crear_receta(receta, tiempo, personas, calorias, preparacion)
+                cambio = self.logica.crear_receta(receta, tiempo, personas, calorias, preparacion)
             else:
-                self.logica.editar_receta(self.receta_actual, receta, tiempo, personas, calorias, preparacion)
-            self.vista_lista_recetas.mostrar_recetas(self.logica.dar_recetas())
+                cambio = self.logica.editar_receta(self.receta_actual, receta, tiempo, personas, calorias, preparacion)
+            self.fachada_asincrona.invalidar()
+            self.aplicar_cambio('lista_recetas', cambio, contador_anterior)
         return validacion
     
     def mostrar_ingredientes(self):
         """
         Esta función muestra la ventana con la lista de ingredientes
         """
-        self.vista_lista_ingredientes=VistaListaIngredientes(self)
-        self.vista_lista_ingredientes.mostrar_ingredientes(self.logica.dar_ingredientes())
+        self.vista_lista_ingredientes = self.navegador.mostrar('lista_ingredientes', lambda: VistaListaIngredientes(self),
+                                                               lambda vista: vista.refrescar_ingredientes())
 
     def crear_ingrediente(self, nombre, unidad, valor, sitioCompra):
         """
@@ -86,28 +179,36 @@ class App_Recetario(QApplication):
         """
         validacion = self.logica.validar_crear_editar_ingrediente(nombre, unidad, valor, sitioCompra)
         if validacion == "":
-            self.logica.crear_ingrediente(nombre, unidad, valor, sitioCompra)
+            contador_anterior = self.logica.dar_contador_cambios()
+            cambio = self.logica.crear_ingrediente(nombre, unidad, valor, sitioCompra)
+            self.fachada_asincrona.invalidar()
+            self.aplicar_cambio_ingrediente(cambio, contador_anterior)
         else:
             self.vista_lista_ingredientes.error(validacion)
-        self.vista_lista_ingredientes.mostrar_ingredientes(self.logica.dar_ingredientes())
         return validacion
 
     def editar_ingrediente(self, id, nombre, unidad, valor, sitioCompra):
         """
         Esta función permite editar un ingrediente
         """
-        validacion = self.logica.validar_crear_editar_ingrediente(nombre, unidad, valor, sitioCompra)
+        validacion = self.logica.validar_crear_editar_ingrediente(nombre, unidad, valor, sitioCompra, id)
         if validacion == "":
-            self.logica.editar_ingrediente(id, nombre, unidad, valor, sitioCompra)
+            contador_anterior = self.logica.dar_contador_cambios()
+            cambio = self.logica.editar_ingrediente(id, nombre, unidad, valor, sitioCompra)
+            self.fachada_asincrona.invalidar()
+            self.aplicar_cambio_ingrediente(cambio, contador_anterior)
         else:
             self.vista_lista_ingredientes.error(validacion)
+        return validacion
 
     def eliminar_ingrediente(self, indice):
         """
         Esta función permite eliminar un ingrediente
         """
-        self.logica.eliminar_ingrediente(indice)
-        self.vista_lista_ingredientes.mostrar_ingredientes(self.logica.dar_ingredientes())
+        contador_anterior = self.logica.dar_contador_cambios()
+        cambio = self.logica.eliminar_ingrediente(indice)
+        self.fachada_asincrona.invalidar()
+        self.aplicar_cambio_ingrediente(cambio, contador_anterior)
 
 
     def agregar_ingrediente_receta(self, receta, ingrediente, cantidad):
@@ -117,9 +218,13 @@ class App_Recetario(QApplication):
         
         validacion = self.logica.validar_crear_editar_ingReceta(receta, ingrediente, cantidad)
         if validacion == "":
-            self.logica.agregar_ingrediente_receta(receta, ingrediente, cantidad)
+            contador_anterior = self.logica.dar_contador_cambios()
+            cambio = self.logica.agregar_ingrediente_receta(receta, ingrediente, cantidad)
+            self.fachada_asincrona.invalidar()
+            self.aplicar_cambio('ingredientes_receta', cambio, contador_anterior)
         else:
             self.vista_lista_ingReceta.error(validacion)
+        return validacion
 
 
     
@@ -129,32 +234,68 @@ class App_Recetario(QApplication):
         """
         validacion = self.logica.validar_crear_editar_ingReceta(receta, ingrediente, cantidad)
         if validacion == "":
-            self.logica.editar_ingrediente_receta(id_ingrediente_receta,receta, ingrediente, cantidad)
+            contador_anterior = self.logica.dar_contador_cambios()
+            cambio = self.logica.editar_ingrediente_receta(id_ingrediente_receta,receta, ingrediente, cantidad)
+            self.fachada_asincrona.invalidar()
+            self.aplicar_cambio('ingredientes_receta', cambio, contador_anterior)
         else:
             self.vista_lista_ingReceta.error(validacion)
+        return validacion
 
 			
     def eliminar_ingrediente_receta(self, indice, receta):
         """
         Esta función permite eliminar un ingrediente de una receta especifica
         """
-        self.logica.eliminar_ingrediente_receta(indice, receta)
+        contador_anterior = self.logica.dar_contador_cambios()
+        cambio = self.logica.eliminar_ingrediente_receta(indice, receta)
+        self.fachada_asincrona.invalidar()
+        self.aplicar_cambio('ingredientes_receta', cambio, contador_anterior)
 		
 
     def mostrar_ingredientes_receta(self, receta):
         """
         Esta función muestra la ventana con la lista de ingredientes de una receta
         """
-        ingredientes = self.logica.dar_ingredientes()
-        self.vista_lista_ingReceta = VistaListaIngredientesReceta(self, receta, ingredientes)
-        self.vista_lista_ingReceta.mostrar_ing_receta(self.logica.dar_ingredientes_receta(self.receta_actual))
+        def cargar(vista):
+            vista.asignar_receta(receta, self.dar_indice_ingredientes())
+            vista.mostrar_ing_receta(self.logica.dar_ingredientes_receta(self.receta_actual))
+
+        self.vista_lista_ingReceta = self.navegador.mostrar(
+            'ingredientes_receta', lambda: VistaListaIngredientesReceta(self, receta, self.dar_indice_ingredientes()), cargar, llave=self.receta_actual)
 
 
     def mostrar_preparacion(self, id_receta, cantidad_personas):
         """
         Esta función muestra la preparacieon de una receta para un número de personas
         """
-        self.datos_preparacion = self.logica.dar_preparacion(id_receta, cantidad_personas)
-        self.vista_reporte = VistaPreparacion( self, self.datos_preparacion['receta'])
-        self.vista_reporte.mostrar_datos(self.datos_preparacion)
+        datos_preparacion = self.logica.dar_preparacion(id_receta, cantidad_personas)
+        # Con la caché la preparación llega como un MappingProxyType y no como un dict
+        if not isinstance(datos_preparacion, Mapping):
+            self.mostrar_error(datos_preparacion or 'La receta no existe')
+            self.mostrar_vista_lista_recetas()
+            return
+
+        def cargar(vista):
+            self.datos_preparacion = datos_preparacion
+            vista.mostrar_datos(self.datos_preparacion)
+
+        self.vista_reporte = self.navegador.mostrar('preparacion', lambda: VistaPreparacion(self, ''), cargar,
+                                                    llave=(id_receta, cantidad_personas))
+
+    def mostrar_lista_compras(self):
+        """
+        Esta función muestra la ventana para armar la lista de compras de un menú
+        """
+        self.vista_lista_compras = self.navegador.mostrar('lista_compras', lambda: VistaListaCompras(self),
+                                                          lambda vista: vista.mostrar_recetas())
 
+    def calcular_lista_compras(self, menu):
+        """
+        Esta función calcula la lista de compras de las recetas y personas del menú
+        """
+        lista_compras = self.logica.dar_lista_compras(menu)
+        if not isinstance(lista_compras, Mapping):
+            self.mostrar_error(lista_compras)
+            return
+        self.vista_lista_compras.mostrar_lista_compras(lista_compras)
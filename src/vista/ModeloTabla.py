@@ -0,0 +1,229 @@
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+from PyQt5.QtCore import *
+from .Recursos import dar_icono
+
+TAMANO_PAGINA = 100
+
+
+class ModeloTabla(QAbstractTableModel):
+    """
+    Modelo de tabla sobre una lista de diccionarios. Cada columna es una tupla
+    (encabezado, llave, ayuda): las columnas con llave muestran ese valor de la fila y las
+    columnas sin llave son acciones que pinta un DelegadoBoton.
+
+    Las filas se pueden cambiar una a una (insertar_fila, actualizar_fila, eliminar_fila) sin
+    volver a construir la tabla.
+
+    Si recibe pedir_pagina(tamano, despues_de, entregar), las filas se cargan por páginas a
+    medida que la vista las necesita (canFetchMore/fetchMore). entregar puede llamarse en ese
+    momento o más tarde, por ejemplo cuando termina una consulta en segundo plano.
+    """
+
+    pagina_cargada = pyqtSignal()
+
+    def __init__(self, columnas, pedir_pagina=None, tamano_pagina=TAMANO_PAGINA, parent=None):
+        super().__init__(parent)
+        self.columnas = columnas
+        self.pedir_pagina = pedir_pagina
+        self.tamano_pagina = tamano_pagina
+        self.filas = []
+        self.hay_mas = pedir_pagina != None
+        self.cargando = False
+        self.generacion = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.filas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columnas)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        encabezado, llave, ayuda = self.columnas[index.column()]
+        if role == Qt.DisplayRole and llave != None:
+            return str(self.filas[index.row()][llave])
+        if role == Qt.ToolTipRole and ayuda != None:
+            return ayuda
+        return None
+
+    def headerData(self, seccion, orientacion, role=Qt.DisplayRole):
+        if orientacion == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.columnas[seccion][0]
+        if orientacion == Qt.Horizontal and role == Qt.FontRole:
+            return QFont("Times", weight=QFont.Bold)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.hay_mas and not self.cargando
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self.cargando = True
+        generacion = self.generacion
+        despues_de = self.filas[-1] if len(self.filas) > 0 else None
+        self.pedir_pagina(self.tamano_pagina, despues_de,
+                          lambda pagina: self.agregar_pagina(pagina, generacion))
+
+    def agregar_pagina(self, pagina, generacion):
+        # Una página pedida antes de reiniciar el modelo ya no corresponde a las filas actuales
+        if generacion != self.generacion:
+            return
+        self.cargando = False
+        self.hay_mas = len(pagina) == self.tamano_pagina
+        if len(pagina) > 0:
+            self.beginInsertRows(QModelIndex(), len(self.filas), len(self.filas) + len(pagina) - 1)
+            self.filas.extend(pagina)
+            self.endInsertRows()
+        self.pagina_cargada.emit()
+
+    def reiniciar(self):
+        """
+        Descarta las filas cargadas y vuelve a pedir la primera página
+        """
+        self.beginResetModel()
+        self.filas = []
+        self.hay_mas = self.pedir_pagina != None
+        self.cargando = False
+        self.generacion += 1
+        self.endResetModel()
+        self.fetchMore()
+
+    def asignar_filas(self, filas):
+        """
+        Reemplaza las filas por una lista completa, sin paginación
+        """
+        self.beginResetModel()
+        self.filas = list(filas) if filas != None else []
+        self.hay_mas = False
+        self.cargando = False
+        self.generacion += 1
+        self.endResetModel()
+
+    def insertar_fila(self, numero_fila, fila):
+        """
+        Inserta una fila en la posición indicada; la vista sólo pinta la fila nueva
+        """
+        self.beginInsertRows(QModelIndex(), numero_fila, numero_fila)
+        self.filas.insert(numero_fila, fila)
+        self.endInsertRows()
+
+    def actualizar_fila(self, numero_fila, fila):
+        """
+        Reemplaza los datos de una fila y avisa a la vista que sólo esa fila cambió
+        """
+        self.filas[numero_fila] = fila
+        self.dataChanged.emit(self.index(numero_fila, 0), self.index(numero_fila, len(self.columnas) - 1))
+
+    def eliminar_fila(self, numero_fila):
+        self.beginRemoveRows(QModelIndex(), numero_fila, numero_fila)
+        del self.filas[numero_fila]
+        self.endRemoveRows()
+
+    def aplicar_cambio(self, posicion_anterior, posicion, fila):
+        """
+        Aplica una escritura informada por la lógica: la fila sale de posicion_anterior (None si es
+        nueva) y queda en posicion (None si se eliminó). Las posiciones que caen después de las
+        páginas cargadas se ignoran; esas filas llegan cuando se cargue su página.
+
+        Si hay una página en camino, se pidió antes de la escritura y puede traer o no la fila
+        cambiada: se descarta y se vuelve a pedir desde la última fila cargada después del cambio.
+        """
+        pagina_en_camino = self.cargando
+        if pagina_en_camino:
+            self.generacion += 1
+            self.cargando = False
+
+        if posicion_anterior != None and posicion_anterior < len(self.filas):
+            if posicion == posicion_anterior:
+                self.actualizar_fila(posicion, fila)
+                posicion = None
+            else:
+                self.eliminar_fila(posicion_anterior)
+        if posicion != None and (posicion < len(self.filas) or (posicion == len(self.filas) and not self.hay_mas)):
+            self.insertar_fila(posicion, fila)
+
+        if pagina_en_camino:
+            self.fetchMore()
+
+    def dar_fila(self, numero_fila):
+        return self.filas[numero_fila]
+
+
+class DelegadoBoton(QStyledItemDelegate):
+    """
+    Pinta un botón con ícono en cada celda de una columna de acción y emite presionado con la fila.
+    No crea widgets por fila: sólo se pintan las celdas visibles.
+    """
+
+    presionado = pyqtSignal(int)
+
+    def __init__(self, icono, parent=None):
+        super().__init__(parent)
+        self.icono = icono
+        self.tamano_boton = QSize(40, 40)
+        self.indice_presionado = None
+
+    def dar_rectangulo_boton(self, rectangulo_celda):
+        rectangulo = QRect(QPoint(0, 0), self.tamano_boton)
+        rectangulo.moveCenter(rectangulo_celda.center())
+        return rectangulo
+
+    def paint(self, painter, option, index):
+        opcion = QStyleOptionButton()
+        opcion.rect = self.dar_rectangulo_boton(option.rect)
+        opcion.icon = self.icono
+        opcion.iconSize = QSize(24, 24)
+        opcion.state = QStyle.State_Enabled
+        if self.indice_presionado == QPersistentModelIndex(index):
+            opcion.state |= QStyle.State_Sunken
+        else:
+            opcion.state |= QStyle.State_Raised
+        estilo = option.widget.style() if option.widget != None else QApplication.style()
+        estilo.drawControl(QStyle.CE_PushButton, opcion, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return False
+        if event.button() != Qt.LeftButton or not self.dar_rectangulo_boton(option.rect).contains(event.pos()):
+            self.indice_presionado = None
+            return False
+        if event.type() == QEvent.MouseButtonPress:
+            self.indice_presionado = QPersistentModelIndex(index)
+        elif self.indice_presionado == QPersistentModelIndex(index):
+            self.indice_presionado = None
+            self.presionado.emit(index.row())
+        return True
+
+    def sizeHint(self, option, index):
+        return self.tamano_boton + QSize(8, 8)
+
+
+def crear_tabla(padre, modelo, acciones, alto_fila=48):
+    """
+    Crea una tabla de sólo lectura para el modelo. acciones es una lista de tuplas
+    (columna, nombre del ícono en src/recursos, función) y cada función recibe el número de la fila presionada.
+    La primera columna ocupa el espacio que sobra.
+    """
+    tabla = QTableView(padre)
+    tabla.setModel(modelo)
+    tabla.setSelectionMode(QAbstractItemView.NoSelection)
+    tabla.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    tabla.setFocusPolicy(Qt.NoFocus)
+    tabla.setShowGrid(False)
+    tabla.setWordWrap(True)
+    tabla.verticalHeader().setVisible(False)
+    tabla.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    tabla.verticalHeader().setDefaultSectionSize(alto_fila)
+    tabla.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+    tabla.horizontalHeader().setDefaultAlignment(Qt.AlignLeft)
+
+    for columna, icono, accion in acciones:
+        delegado = DelegadoBoton(dar_icono(icono), tabla)
+        delegado.presionado.connect(accion)
+        tabla.setItemDelegateForColumn(columna, delegado)
+        tabla.horizontalHeader().setSectionResizeMode(columna, QHeaderView.Fixed)
+        tabla.setColumnWidth(columna, 56)
+    return tabla
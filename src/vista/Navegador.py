@@ -0,0 +1,60 @@
+class Navegador():
+    """
+    Mantiene viva una instancia de cada ventana principal y la reutiliza al navegar.
+
+    Cada ventana recuerda el contador de cambios de la lógica (y la llave de lo que muestra, por
+    ejemplo el id de la receta) con el que cargó sus datos. Al volver a mostrarla sólo se
+    recargan los datos si el contador o la llave cambiaron, de modo que ir y volver entre
+    ventanas sin modificar nada no hace consultas.
+    """
+
+    def __init__(self, dar_contador_cambios):
+        self.dar_contador_cambios = dar_contador_cambios
+        self.vistas = {}
+        self.cargas = {}
+        self.versiones = {}
+        self.vista_actual = None
+
+    def mostrar(self, nombre, crear, cargar, llave=None, recargar=False):
+        """
+        Muestra la ventana nombre, creándola con crear() la primera vez. cargar(vista) llena la
+        ventana con los datos y sólo se llama si cambiaron desde la última carga o si recargar es True.
+        """
+        if nombre not in self.vistas:
+            self.vistas[nombre] = crear()
+        vista = self.vistas[nombre]
+        self.cargas[nombre] = cargar
+
+        version = (self.dar_contador_cambios(), llave)
+        if recargar or self.versiones.get(nombre) != version:
+            self.versiones[nombre] = version
+            cargar(vista)
+
+        if self.vista_actual != None and self.vista_actual is not vista:
+            self.vista_actual.hide()
+        self.vista_actual = vista
+        vista.show()
+        vista.raise_()
+        vista.activateWindow()
+        return vista
+
+    def dar_vista(self, nombre):
+        return self.vistas.get(nombre)
+
+    def refrescar(self, nombre):
+        """
+        Vuelve a cargar los datos de la ventana si ya fue creada
+        """
+        if nombre in self.vistas:
+            llave = self.versiones[nombre][1]
+            self.versiones[nombre] = (self.dar_contador_cambios(), llave)
+            self.cargas[nombre](self.vistas[nombre])
+
+    def marcar_vigente(self, nombre, contador_anterior):
+        """
+        Informa que la ventana ya aplicó por su cuenta el último cambio (por ejemplo, actualizó la
+        fila editada). Si estaba al día con contador_anterior, queda al día con el contador actual
+        y no se recarga la próxima vez que se muestre.
+        """
+        if nombre in self.versiones and self.versiones[nombre][0] == contador_anterior:
+            self.versiones[nombre] = (self.dar_contador_cambios(), self.versiones[nombre][1])
@@ -0,0 +1,86 @@
+"""
+Registro de íconos e imágenes compartido por todas las vistas.
+
+Cada imagen se lee y decodifica una sola vez por proceso; las vistas reciben la misma
+instancia de QIcon o QPixmap. Si existe el módulo compilado src/vista/recursos_rc.py, las
+imágenes se leen del paquete de recursos de Qt; si no, de los archivos de src/recursos.
+El módulo compilado se genera con:
+
+    python -m src.vista.Recursos
+"""
+import os
+import subprocess
+
+from PyQt5.QtCore import QFile, Qt
+from PyQt5.QtGui import QIcon, QPixmap
+
+CARPETA_RECURSOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'recursos')
+ARCHIVO_QRC = os.path.join(CARPETA_RECURSOS, 'recursos.qrc')
+MODULO_COMPILADO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recursos_rc.py')
+
+LOGO = 'RecetarioLogo.png'
+
+try:
+    from src.vista import recursos_rc
+except ImportError:
+    recursos_rc = None
+
+iconos = {}
+pixmaps = {}
+
+
+def dar_ruta(nombre):
+    """
+    Retorna la ruta de la imagen: en el paquete de recursos si está compilado, o en la carpeta src/recursos
+    """
+    ruta_recurso = ':/recursos/' + nombre
+    if recursos_rc != None and QFile.exists(ruta_recurso):
+        return ruta_recurso
+    return os.path.join(CARPETA_RECURSOS, nombre)
+
+
+def dar_icono(nombre):
+    """
+    Retorna el ícono compartido para la imagen con ese nombre de archivo
+    """
+    if nombre not in iconos:
+        iconos[nombre] = QIcon(dar_ruta(nombre))
+    return iconos[nombre]
+
+
+def dar_pixmap(nombre, ancho=None, alto=None):
+    """
+    Retorna la imagen compartida, escalada a ancho x alto conservando la proporción.
+    Cada tamaño se escala una sola vez.
+    """
+    llave = (nombre, ancho, alto)
+    if llave not in pixmaps:
+        if ancho == None or alto == None:
+            pixmaps[llave] = QPixmap(dar_ruta(nombre))
+        else:
+            pixmaps[llave] = dar_pixmap(nombre).scaled(ancho, alto, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return pixmaps[llave]
+
+
+def dar_logo(ancho=None, alto=None):
+    return dar_pixmap(LOGO, ancho, alto)
+
+
+def limpiar():
+    """
+    Descarta las imágenes guardadas; se vuelven a leer la próxima vez que se pidan
+    """
+    iconos.clear()
+    pixmaps.clear()
+
+
+def compilar():
+    """
+    Genera src/vista/recursos_rc.py a partir de src/recursos/recursos.qrc con pyrcc5
+    """
+    subprocess.run(['pyrcc5', ARCHIVO_QRC, '-o', MODULO_COMPILADO], check=True)
+    return MODULO_COMPILADO
+
+
+if __name__ == '__main__':
+    print(compilar())
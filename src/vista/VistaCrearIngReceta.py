@@ -3,22 +3,25 @@ from PyQt5 import QtCore
 
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
+from .Recursos import dar_icono
 
 
 class VistaCrearIngReceta(QDialog):
     # Diálogo para crear o editar un ingrediente de una receta
 
-    def __init__(self, ingredienteReceta, interfaz, ingredientes):
+    def __init__(self, ingredienteReceta, interfaz, indice_ingredientes):
         """
-        Constructor del diálogo
+        Constructor del diálogo. indice_ingredientes es el IndicePrefijos en el que se buscan los
+        ingredientes a medida que el usuario escribe; sólo se muestran las coincidencias
         """
         super().__init__()
 
         self.interfaz = interfaz
-        self.ingredientes = ingredientes
+        self.indice_ingredientes = indice_ingredientes
+        self.id_ingrediente = None
 
-        self.setFixedSize(400, 300)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setFixedSize(400, 360)
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
 
         self.resultado = ""
 
@@ -42,11 +45,15 @@ class VistaCrearIngReceta(QDialog):
         etiqueta_ingrediente = QLabel("Ingrediente")
         distribuidor_dialogo.addWidget(etiqueta_ingrediente, numero_fila, 0)
 
-        self.combobox_ingredientes = QComboBox(self)
-        for ingrediente in self.ingredientes:
-            self.combobox_ingredientes.addItem(ingrediente["nombre"] + "[" + ingrediente["unidad"]+"]")
-        self.combobox_ingredientes.setCurrentIndex(0)
-        distribuidor_dialogo.addWidget(self.combobox_ingredientes, numero_fila, 1, 1, 2)
+        self.texto_ingrediente = QLineEdit(self)
+        self.texto_ingrediente.setPlaceholderText("Escriba el nombre del ingrediente")
+        self.texto_ingrediente.textChanged.connect(self.buscar_ingredientes)
+        distribuidor_dialogo.addWidget(self.texto_ingrediente, numero_fila, 1, 1, 2)
+        numero_fila = numero_fila + 1
+
+        self.lista_ingredientes = QListWidget(self)
+        self.lista_ingredientes.currentItemChanged.connect(self.seleccionar_ingrediente)
+        distribuidor_dialogo.addWidget(self.lista_ingredientes, numero_fila, 1, 1, 2)
         numero_fila = numero_fila + 1
 
         etiqueta_cantidad = QLabel("Cantidad")
@@ -76,9 +83,35 @@ class VistaCrearIngReceta(QDialog):
 
         # Si el diálogo se va a usar para editar, se pone la información correspondiente en los campos de texto
         if (ingredienteReceta != None):
-            indice_ingrediente_receta = self.combobox_ingredientes.findText(ingredienteReceta["ingrediente"] + "[" + ingredienteReceta["unidad"]+"]")
-            self.combobox_ingredientes.setCurrentIndex(indice_ingrediente_receta)
+            self.texto_ingrediente.setText(ingredienteReceta["ingrediente"])
+            for fila in range(self.lista_ingredientes.count()):
+                item = self.lista_ingredientes.item(fila)
+                ingrediente = self.indice_ingredientes.dar_ingrediente(item.data(QtCore.Qt.UserRole))
+                if (ingrediente["nombre"], ingrediente["unidad"]) == (ingredienteReceta["ingrediente"], ingredienteReceta["unidad"]):
+                    self.lista_ingredientes.setCurrentItem(item)
+                    break
             self.texto_cantidad.setText(str(ingredienteReceta["cantidad"]))
+        else:
+            self.buscar_ingredientes("")
+
+    def buscar_ingredientes(self, texto):
+        """
+        Esta función muestra los ingredientes cuyo nombre empieza por el texto escrito y conserva
+        el ingrediente seleccionado si sigue entre ellos
+        """
+        id_seleccionado = self.id_ingrediente
+        self.lista_ingredientes.clear()
+        for ingrediente in self.indice_ingredientes.buscar(texto):
+            item = QListWidgetItem("{} [{}] - {}".format(ingrediente["nombre"], ingrediente["unidad"], ingrediente["sitioCompra"]))
+            item.setData(QtCore.Qt.UserRole, ingrediente["id"])
+            self.lista_ingredientes.addItem(item)
+            if ingrediente["id"] == id_seleccionado:
+                self.lista_ingredientes.setCurrentItem(item)
+        if self.lista_ingredientes.currentItem() == None and self.lista_ingredientes.count() > 0:
+            self.lista_ingredientes.setCurrentRow(0)
+
+    def seleccionar_ingrediente(self, item, item_anterior):
+        self.id_ingrediente = item.data(QtCore.Qt.UserRole) if item != None else None
 
     def guardar(self):
         """
@@ -1,6 +1,7 @@
 
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
+from .Recursos import dar_icono
 
 
 class VistaCrearIngrediente(QDialog):
@@ -15,7 +16,7 @@ class VistaCrearIngrediente(QDialog):
         self.interfaz = interfaz
 
         self.setFixedSize(400, 300)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
 
         self.resultado = ""
 
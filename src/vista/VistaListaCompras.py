@@ -0,0 +1,208 @@
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+from PyQt5.QtCore import *
+from .ModeloTabla import ModeloTabla, crear_tabla
+from .Recursos import dar_icono
+
+COLUMNA_PERSONAS = 1
+MAXIMO_PERSONAS = 10000
+
+
+class ModeloMenu(ModeloTabla):
+    """
+    Recetas del menú, cargadas por páginas como la lista de recetas, con una columna editable con
+    las personas de cada una. Las personas se guardan por id de receta y no en las filas, así se
+    conservan aunque se carguen más páginas; cero personas deja la receta fuera del menú.
+    """
+
+    def __init__(self, pedir_pagina, parent=None):
+        super().__init__([("Receta", 'nombre', None), ("Personas", None, None)],
+                         pedir_pagina=pedir_pagina, parent=parent)
+        self.personas = {}
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and index.column() == COLUMNA_PERSONAS and role in (Qt.DisplayRole, Qt.EditRole):
+            return self.personas.get(self.filas[index.row()]['id'], 0)
+        return super().data(index, role)
+
+    def flags(self, index):
+        if index.isValid() and index.column() == COLUMNA_PERSONAS:
+            return Qt.ItemIsEnabled | Qt.ItemIsEditable
+        return super().flags(index)
+
+    def setData(self, index, valor, role=Qt.EditRole):
+        if not index.isValid() or index.column() != COLUMNA_PERSONAS or role != Qt.EditRole:
+            return False
+        id_receta = self.filas[index.row()]['id']
+        if int(valor) > 0:
+            self.personas[id_receta] = int(valor)
+        else:
+            self.personas.pop(id_receta, None)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def reiniciar(self):
+        self.personas = {}
+        super().reiniciar()
+
+    def dar_menu(self):
+        """
+        Retorna las tuplas (id_receta, personas) de las recetas con al menos una persona
+        """
+        return list(self.personas.items())
+
+
+class DelegadoPersonas(QStyledItemDelegate):
+    """
+    Edita las personas de una receta del menú con un QSpinBox que sólo existe mientras se edita la celda
+    """
+
+    def createEditor(self, parent, option, index):
+        campo_personas = QSpinBox(parent)
+        campo_personas.setRange(0, MAXIMO_PERSONAS)
+        return campo_personas
+
+
+class VistaListaCompras(QWidget):
+    #Ventana que muestra la lista de compras consolidada de un menú
+
+    def __init__(self, interfaz):
+        """
+        Constructor de la ventana
+        """
+        super().__init__()
+
+        self.interfaz = interfaz
+
+        #Se establecen las características de la ventana
+        self.titulo = "Recetario - Lista de compras"
+        self.width = 875
+        self.height = 700
+
+        self.inicializar_GUI()
+        self.show()
+
+    def inicializar_GUI(self):
+
+        #inicializamos la ventana
+        self.setWindowTitle(self.titulo)
+        self.setFixedSize(self.width, self.height)
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
+
+        self.distribuidor_base = QVBoxLayout(self)
+
+        #Creación de la tabla para seleccionar las personas de cada receta del menú; las recetas se
+        #cargan por páginas y el campo de personas sólo se crea en la celda que se edita
+        self.modelo_menu = ModeloMenu(self.interfaz.pedir_pagina_recetas, parent=self)
+        self.tabla_menu = crear_tabla(self, self.modelo_menu, [], alto_fila=32)
+        self.tabla_menu.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        self.tabla_menu.setFocusPolicy(Qt.StrongFocus)
+        self.tabla_menu.setItemDelegateForColumn(COLUMNA_PERSONAS, DelegadoPersonas(self.tabla_menu))
+        self.tabla_menu.setColumnWidth(COLUMNA_PERSONAS, 120)
+
+        self.contenedor_tabla_menu = QGroupBox(self)
+        self.contenedor_tabla_menu.setLayout(QHBoxLayout())
+        self.contenedor_tabla_menu.setTitle('Personas por receta')
+        self.contenedor_tabla_menu.layout().addWidget(self.tabla_menu)
+        self.distribuidor_base.addWidget(self.contenedor_tabla_menu)
+
+        #Creación del área con la lista de compras
+        self.tabla_compras = QScrollArea(self)
+        self.tabla_compras.setWidgetResizable(True)
+        self.widget_tabla_compras = QWidget()
+        self.distribuidor_tabla_compras = QGridLayout(self.widget_tabla_compras)
+        self.tabla_compras.setWidget(self.widget_tabla_compras)
+        self.tabla_compras.setStyleSheet('QScrollArea{border:none}')
+
+        self.contenedor_tabla_compras = QGroupBox(self)
+        self.contenedor_tabla_compras.setLayout(QHBoxLayout())
+        self.contenedor_tabla_compras.setTitle('Lista de compras')
+        self.contenedor_tabla_compras.layout().addWidget(self.tabla_compras)
+        self.distribuidor_base.addWidget(self.contenedor_tabla_compras)
+
+        #Creación de los botones de funciones de la ventana
+        self.widget_botones = QWidget()
+        self.distribuidor_botones = QHBoxLayout(self.widget_botones)
+
+        self.btn_calcular = QPushButton("Calcular", self)
+        self.btn_calcular.setFixedSize(200, 40)
+        self.btn_calcular.setToolTip("Calcular la lista de compras")
+        self.btn_calcular.setIcon(dar_icono("reporte.png"))
+        self.btn_calcular.setIconSize(QSize(30, 30))
+        self.btn_calcular.clicked.connect(self.calcular)
+        self.distribuidor_botones.addWidget(self.btn_calcular)
+
+        self.btn_volver = QPushButton("Volver", self)
+        self.btn_volver.setFixedSize(200, 40)
+        self.btn_volver.setToolTip("Volver")
+        self.btn_volver.setIcon(dar_icono("007-back-button.png"))
+        self.btn_volver.setIconSize(QSize(120, 120))
+        self.btn_volver.clicked.connect(self.volver)
+        self.distribuidor_botones.addWidget(self.btn_volver)
+        self.distribuidor_base.addWidget(self.widget_botones, alignment=Qt.AlignCenter)
+
+    def mostrar_recetas(self):
+        """
+        Esta función vuelve a cargar desde la primera página las recetas que se pueden incluir en el menú
+        """
+        #La ventana se reutiliza: se quitan el menú y la lista de compras anteriores
+        while self.distribuidor_tabla_compras.count() > 0:
+            self.distribuidor_tabla_compras.takeAt(0).widget().deleteLater()
+        self.modelo_menu.reiniciar()
+
+    def calcular(self):
+        """
+        Esta función informa a la interfaz las personas de cada receta del menú
+        """
+        #Se confirma el valor de la celda que se esté editando
+        self.tabla_menu.setCurrentIndex(QModelIndex())
+        self.interfaz.calcular_lista_compras(self.modelo_menu.dar_menu())
+
+    def mostrar_lista_compras(self, lista_compras):
+        """
+        Esta función puebla la tabla con los ingredientes agrupados por sitio de compra
+        """
+        while self.distribuidor_tabla_compras.count() > 0:
+            self.distribuidor_tabla_compras.takeAt(0).widget().deleteLater()
+
+        numero_fila = 0
+        for encabezado, columna in [("Ingrediente", 0), ("Unidad", 1), ("Cantidad", 2), ("Valor", 3)]:
+            etiqueta = QLabel(encabezado)
+            etiqueta.setFont(QFont("Times", weight=QFont.Bold))
+            self.distribuidor_tabla_compras.addWidget(etiqueta, numero_fila, columna, Qt.AlignTop)
+
+        for sitio in lista_compras['sitios']:
+            numero_fila = numero_fila + 1
+            etiqueta_sitio = QLabel(sitio['sitio'])
+            etiqueta_sitio.setFont(QFont("Times", weight=QFont.Bold))
+            self.distribuidor_tabla_compras.addWidget(etiqueta_sitio, numero_fila, 0, 1, 4)
+
+            for ingrediente in sitio['ingredientes']:
+                numero_fila = numero_fila + 1
+                self.distribuidor_tabla_compras.addWidget(QLabel(ingrediente['nombre']), numero_fila, 0)
+                self.distribuidor_tabla_compras.addWidget(QLabel(ingrediente['unidad']), numero_fila, 1)
+                etiqueta_cantidad = QLabel("{:,.2f}".format(ingrediente['cantidad']))
+                etiqueta_cantidad.setAlignment(Qt.AlignRight)
+                self.distribuidor_tabla_compras.addWidget(etiqueta_cantidad, numero_fila, 2)
+                etiqueta_valor = QLabel("${:,.2f}".format(ingrediente['valor']))
+                etiqueta_valor.setAlignment(Qt.AlignRight)
+                self.distribuidor_tabla_compras.addWidget(etiqueta_valor, numero_fila, 3)
+
+            numero_fila = numero_fila + 1
+            etiqueta_subtotal = QLabel("Subtotal {}: ${:,.2f}".format(sitio['sitio'], sitio['subtotal']))
+            etiqueta_subtotal.setAlignment(Qt.AlignRight)
+            self.distribuidor_tabla_compras.addWidget(etiqueta_subtotal, numero_fila, 0, 1, 4)
+
+        numero_fila = numero_fila + 1
+        etiqueta_total = QLabel("Total: ${:,.2f}".format(lista_compras['total']))
+        etiqueta_total.setFont(QFont("Times", weight=QFont.Bold))
+        etiqueta_total.setAlignment(Qt.AlignRight)
+        self.distribuidor_tabla_compras.addWidget(etiqueta_total, numero_fila, 0, 1, 4)
+        self.distribuidor_tabla_compras.setRowStretch(numero_fila + 1, 1)
+
+    def volver(self):
+        """
+        Esta función permite volver a la lista de recetas
+        """
+        self.hide()
+        self.interfaz.mostrar_vista_lista_recetas()
@@ -2,9 +2,9 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtGui import * 
 from PyQt5.QtCore import *
 
-from functools import partial
-
 from  .VistaCrearIngrediente import VistaCrearIngrediente
+from .ModeloTabla import ModeloTabla, crear_tabla
+from .Recursos import dar_icono
 
 
 class VistaListaIngredientes(QWidget):
@@ -30,7 +30,7 @@ class VistaListaIngredientes(QWidget):
         # inicializamos la ventana
         self.setWindowTitle(self.titulo)
         self.setFixedSize(self.width, self.height)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
          
         self.distribuidor_base = QVBoxLayout(self)        
 
@@ -42,13 +42,13 @@ class VistaListaIngredientes(QWidget):
         self.btn_agregar_ingrediente=QPushButton("Agregar ingrediente", self)
         self.btn_agregar_ingrediente.setFixedSize(170, 40)
         self.btn_agregar_ingrediente.setToolTip("Agregar ingrediente")
-        self.btn_agregar_ingrediente.setIcon(QIcon("src/recursos/006-add.png"))
+        self.btn_agregar_ingrediente.setIcon(dar_icono("006-add.png"))
         self.btn_agregar_ingrediente.clicked.connect(self.mostrar_dialogo_agregar_ingrediente)
 
         self.btn_volver = QPushButton("Volver", self)
         self.btn_volver.setFixedSize(170, 40)
         self.btn_volver.setToolTip("Volver")
-        self.btn_volver.setIcon(QIcon("src/recursos/007-back-button.png"))
+        self.btn_volver.setIcon(dar_icono("007-back-button.png"))
         self.btn_volver.clicked.connect(self.volver)
 
 
@@ -58,57 +58,22 @@ class VistaListaIngredientes(QWidget):
         self.contenedor_tabla.setTitle('Ingredientes')
         self.distribuidor_base.addWidget(self.contenedor_tabla)
 
-        #Creación de la tabla con la lista de ingredientes
-        self.tabla_ingredientes = QScrollArea(self)
-        self.tabla_ingredientes.setWidgetResizable(True)
-        self.tabla_ingredientes.setStyleSheet('QScrollArea{border:none}')
+        #Creación de la tabla con la lista de ingredientes; se carga por páginas y sólo se pintan las filas visibles
+        self.modelo_ingredientes = ModeloTabla([
+            ("Ingrediente", 'nombre', None),
+            ("Unidad", 'unidad', None),
+            ("Valor por unidad", 'valor', None),
+            ("Sitio compra", 'sitioCompra', None),
+            ("", None, "Editar"),
+            ("", None, "Borrar")
+        ], pedir_pagina=self.interfaz.pedir_pagina_ingredientes, parent=self)
+        self.tabla_ingredientes = crear_tabla(self, self.modelo_ingredientes, [
+            (4, "004-edit-button.png", self.mostrar_dialogo_editar_ingrediente),
+            (5, "005-delete.png", self.eliminar_ingrediente)
+        ])
         self.tabla_ingredientes.setFixedSize(700, 300)
-        self.widget_tabla_ingredientes = QWidget()
-        self.distribuidor_tabla_ingredientes = QGridLayout(self.widget_tabla_ingredientes)
-        self.tabla_ingredientes.setWidget(self.widget_tabla_ingredientes)
         self.contenedor_tabla.layout().addWidget(self.tabla_ingredientes)
 
-        self.distribuidor_tabla_ingredientes.setColumnStretch(0, 1)
-        self.distribuidor_tabla_ingredientes.setColumnStretch(1, 1)
-        self.distribuidor_tabla_ingredientes.setColumnStretch(2, 1)
-        self.distribuidor_tabla_ingredientes.setColumnStretch(3, 1)
-        self.distribuidor_tabla_ingredientes.setColumnStretch(4, 1)
-        self.distribuidor_tabla_ingredientes.setColumnStretch(5, 1)
-
-        self.distribuidor_tabla_ingredientes.setSpacing(0)
-
-        #Creación de las etiquetas de encabezado
-        etiqueta_nombre = QLabel("Ingrediente")
-        etiqueta_nombre.setFixedSize(180,40)
-        etiqueta_nombre.setFont(QFont("Times",weight=QFont.Bold)) 
-        self.distribuidor_tabla_ingredientes.addWidget(etiqueta_nombre, 0, 0, Qt.AlignTop)
-
-        etiqueta_unidad = QLabel("Unidad")
-        etiqueta_unidad.setFixedSize(80,40)
-        etiqueta_unidad.setFont(QFont("Times",weight=QFont.Bold)) 
-        etiqueta_unidad.setAlignment(Qt.AlignCenter)
-        self.distribuidor_tabla_ingredientes.addWidget(etiqueta_unidad, 0, 1, Qt.AlignTop)
-        
-        etiqueta_valor = QLabel("Valor \n por unidad")
-        etiqueta_valor.setFixedSize(100,60)
-        etiqueta_valor.setFont(QFont("Times",weight=QFont.Bold)) 
-        etiqueta_valor.setAlignment(Qt.AlignCenter)
-        self.distribuidor_tabla_ingredientes.addWidget(etiqueta_valor, 0, 2, Qt.AlignTop)
-
-        etiqueta_sitio = QLabel("Sitio \n compra")
-        etiqueta_sitio.setFixedSize(180,60)
-        etiqueta_sitio.setFont(QFont("Times",weight=QFont.Bold)) 
-        etiqueta_sitio.setAlignment(Qt.AlignCenter)
-        self.distribuidor_tabla_ingredientes.addWidget(etiqueta_sitio, 0, 3, Qt.AlignTop)
-
-
-
-        etiqueta_accion = QLabel("Opciones")
-        etiqueta_accion.setFixedSize(60,40)
-        etiqueta_accion.setFont(QFont("Times",weight=QFont.Bold)) 
-        etiqueta_accion.setAlignment(Qt.AlignCenter)
-        self.distribuidor_tabla_ingredientes.addWidget(etiqueta_accion, 0, 4, 0, 2, Qt.AlignTop | Qt.AlignCenter)
-
         #Se añaden los botones a la caja de botones
         caja_botones.layout().addWidget(self.btn_agregar_ingrediente)
         caja_botones.layout().addWidget(self.btn_volver)
@@ -117,57 +82,17 @@ class VistaListaIngredientes(QWidget):
         caja_botones.setStyleSheet("#MyBox{border:3px}")
         self.distribuidor_base.addWidget(caja_botones)
 
-    def mostrar_ingredientes(self, lista_ingredientes):
+    def refrescar_ingredientes(self):
+        """
+        Esta función descarta los ingredientes cargados y vuelve a cargar la primera página
+        """
+        self.modelo_ingredientes.reiniciar()
+
+    def aplicar_cambio(self, cambio):
         """
-        Esta función muestra la lista de ingredientes
+        Esta función actualiza sólo la fila del ingrediente creado, editado o eliminado
         """
-        self.ingredientes = lista_ingredientes
-
-        #Ciclo para poblar la tabla
-        numero_fila = 0
-        for ingrediente in self.ingredientes:
-
-            etiqueta_nombre=QLabel(ingrediente["nombre"])
-            etiqueta_nombre.setWordWrap(True)
-            etiqueta_nombre.setFixedSize(180,40)
-            self.distribuidor_tabla_ingredientes.addWidget(etiqueta_nombre, numero_fila + 1, 0, Qt.AlignTop)
-
-            etiqueta_unidad=QLabel(ingrediente["unidad"])
-            etiqueta_unidad.setWordWrap(True)
-            etiqueta_unidad.setFixedSize(80,40)
-            etiqueta_unidad.setAlignment(Qt.AlignCenter)
-            self.distribuidor_tabla_ingredientes.addWidget(etiqueta_unidad, numero_fila + 1, 1, Qt.AlignTop)
-
-            etiqueta_valor=QLabel(str(ingrediente["valor"]))
-            etiqueta_valor.setWordWrap(True)
-            etiqueta_valor.setFixedSize(120,40)
-            etiqueta_valor.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.distribuidor_tabla_ingredientes.addWidget(etiqueta_valor, numero_fila + 1, 2, Qt.AlignHCenter)
-
-            etiqueta_sitioCompras=QLabel(ingrediente["sitioCompra"])
-            etiqueta_sitioCompras.setWordWrap(True)
-            etiqueta_sitioCompras.setFixedSize(180,40)
-            etiqueta_sitioCompras.setAlignment(Qt.AlignCenter)
-            self.distribuidor_tabla_ingredientes.addWidget(etiqueta_sitioCompras, numero_fila + 1, 3, Qt.AlignTop)
-
-            boton_editar=QPushButton("",self)
-            boton_editar.setToolTip("Editar")
-            boton_editar.setFixedSize(40,40)
-            boton_editar.setIcon(QIcon("src/recursos/004-edit-button.png"))
-            boton_editar.clicked.connect(partial(self.mostrar_dialogo_editar_ingrediente, numero_fila))
-            self.distribuidor_tabla_ingredientes.addWidget(boton_editar, numero_fila + 1, 4, Qt.AlignTop)
-
-            etiqueta_eliminar=QPushButton("",self)
-            etiqueta_eliminar.setToolTip("Borrar")
-            etiqueta_eliminar.setFixedSize(40,40)
-            etiqueta_eliminar.setIcon(QIcon("src/recursos/005-delete.png"))
-            etiqueta_eliminar.clicked.connect(partial(self.eliminar_ingrediente, numero_fila))
-            self.distribuidor_tabla_ingredientes.addWidget(etiqueta_eliminar, numero_fila + 1, 5, Qt.AlignTop)
-
-            numero_fila=numero_fila+1
-
-            #para ajustar la forma de la tabla (y evitar que queden muy espaciados)
-            self.distribuidor_tabla_ingredientes.layout().setRowStretch(numero_fila + 1, 1)
+        self.modelo_ingredientes.aplicar_cambio(cambio['posicion_anterior'], cambio['posicion'], cambio['ingrediente'])
 
     def mostrar_dialogo_agregar_ingrediente(self):
         """
@@ -179,18 +104,17 @@ class VistaListaIngredientes(QWidget):
             self.interfaz.crear_ingrediente(dialogo.texto_nombre.text(), dialogo.texto_unidad.text(), dialogo.texto_valor.text(),
                                           dialogo.texto_sitioCompra.text())
 
-    def mostrar_dialogo_editar_ingrediente(self, id_ingrediente):
+    def mostrar_dialogo_editar_ingrediente(self, numero_fila):
         """
         Esta función ejecuta el diálogo para editar un ingrediente
         """    
-        dialogo=VistaCrearIngrediente(self.ingredientes[id_ingrediente], self.interfaz)
+        ingrediente = self.modelo_ingredientes.dar_fila(numero_fila)
+        dialogo=VistaCrearIngrediente(ingrediente, self.interfaz)
         dialogo.exec_()
         if dialogo.resultado==1:  
-            self.interfaz.editar_ingrediente(id_ingrediente, dialogo.texto_nombre.text(), dialogo.texto_unidad.text(),dialogo.texto_valor.text(), dialogo.texto_sitioCompra.text())
-            self.hide()
-            self.interfaz.mostrar_ingredientes()
+            self.interfaz.editar_ingrediente(ingrediente['id'], dialogo.texto_nombre.text(), dialogo.texto_unidad.text(),dialogo.texto_valor.text(), dialogo.texto_sitioCompra.text())
 
-    def eliminar_ingrediente(self, indice_ingrediente):
+    def eliminar_ingrediente(self, numero_fila):
         """
         Esta función informa a la interfaz el ingrediente a eliminar
         """    
@@ -198,13 +122,11 @@ class VistaListaIngredientes(QWidget):
         mensaje_confirmacion.setIcon(QMessageBox.Question)
         mensaje_confirmacion.setText("¿Esta seguro de que desea eliminar este ingrediente?\nRecuerde que esta acción es irreversible")
         mensaje_confirmacion.setWindowTitle("¿Desea borrar este ingrediente?")
-        mensaje_confirmacion.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        mensaje_confirmacion.setWindowIcon(dar_icono("RecetarioLogo.png"))
         mensaje_confirmacion.setStandardButtons(QMessageBox.Yes | QMessageBox.No ) 
         respuesta=mensaje_confirmacion.exec_()
         if respuesta == QMessageBox.Yes:
-            self.interfaz.eliminar_ingrediente(indice_ingrediente)
-            self.hide()
-            self.interfaz.mostrar_ingredientes()
+            self.interfaz.eliminar_ingrediente(self.modelo_ingredientes.dar_fila(numero_fila)['id'])
 
     def volver(self):
         """
@@ -218,7 +140,7 @@ class VistaListaIngredientes(QWidget):
             mensaje_error.setIcon(QMessageBox.Question)
             mensaje_error.setText("Error : " + error)
             mensaje_error.setWindowTitle("Error al guardar ingrediente")
-            mensaje_error.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+            mensaje_error.setWindowIcon(dar_icono("RecetarioLogo.png"))
             mensaje_error.setStandardButtons(QMessageBox.Ok ) 
             respuesta=mensaje_error.exec_()
 
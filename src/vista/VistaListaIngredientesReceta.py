@@ -2,15 +2,15 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtGui import * 
 from PyQt5.QtCore import *
 
-from functools import partial
-
 from .VistaCrearIngReceta import VistaCrearIngReceta
+from .ModeloTabla import ModeloTabla, crear_tabla
+from .Recursos import dar_icono
 
 
 class VistaListaIngredientesReceta(QWidget):
     #Ventana que muestra la lista de ingredientes de una receta
 
-    def __init__(self, interfaz, receta, ingredientes):
+    def __init__(self, interfaz, receta, indice_ingredientes):
         """
         Constructor de la ventana
         """
@@ -20,7 +20,7 @@ class VistaListaIngredientesReceta(QWidget):
         self.titulo = 'Recetario- Ingredientes receta'
         self.interfaz = interfaz
         self.receta = receta
-        self.ingredientes= ingredientes
+        self.indice_ingredientes = indice_ingredientes
 
         self.width =720
         self.height = 560
@@ -33,7 +33,7 @@ class VistaListaIngredientesReceta(QWidget):
         # inicializamos la ventana
         self.setWindowTitle(self.titulo)
         self.setFixedSize(self.width, self.height)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
          
         self.distribuidor_base = QVBoxLayout(self)        
 
@@ -46,13 +46,13 @@ class VistaListaIngredientesReceta(QWidget):
         self.btn_agregar_ingredienteReceta=QPushButton("Agregar ingrediente", self)
         self.btn_agregar_ingredienteReceta.setFixedSize(170, 40)
         self.btn_agregar_ingredienteReceta.setToolTip("Agregar ingrediente")
-        self.btn_agregar_ingredienteReceta.setIcon(QIcon("src/recursos/006-add.png"))
+        self.btn_agregar_ingredienteReceta.setIcon(dar_icono("006-add.png"))
         self.btn_agregar_ingredienteReceta.clicked.connect(self.mostrar_dialogo_agregar_ingredienteReceta)
 
         self.btn_volver = QPushButton("Volver", self)
         self.btn_volver.setFixedSize(170, 40)
         self.btn_volver.setToolTip("Volver")
-        self.btn_volver.setIcon(QIcon("src/recursos/007-back-button.png"))
+        self.btn_volver.setIcon(dar_icono("007-back-button.png"))
         self.btn_volver.clicked.connect(self.volver)
 
         self.contenedor_tabla = QGroupBox(self)
@@ -61,39 +61,20 @@ class VistaListaIngredientesReceta(QWidget):
         self.distribuidor_base.addWidget(self.contenedor_tabla)
 
         #Creación de la tabla con la lista de ingredientes de una receta
-        self.tabla_ingReceta = QScrollArea(self)
-        self.tabla_ingReceta.setWidgetResizable(True)
-        self.tabla_ingReceta.setStyleSheet('QScrollArea{border:none}')
+        self.modelo_ings_receta = ModeloTabla([
+            ("Ingrediente", 'ingrediente', None),
+            ("Unidad", 'unidad', None),
+            ("Cantidad", 'cantidad', None),
+            ("", None, "Editar"),
+            ("", None, "Borrar")
+        ], parent=self)
+        self.tabla_ingReceta = crear_tabla(self, self.modelo_ings_receta, [
+            (3, "004-edit-button.png", self.mostrar_dialogo_editar_ingrediente_receta),
+            (4, "005-delete.png", self.eliminar_ingrediente_receta)
+        ], alto_fila=40)
         self.tabla_ingReceta.setFixedSize(620, 460)
-        self.widget_tabla_ingReceta = QWidget()
-        self.distribuidor_tabla_ingReceta = QGridLayout(self.widget_tabla_ingReceta)
-        self.tabla_ingReceta.setWidget(self.widget_tabla_ingReceta)
         self.contenedor_tabla.layout().addWidget(self.tabla_ingReceta)
 
-        self.distribuidor_tabla_ingReceta.setColumnStretch(0, 0)
-        self.distribuidor_tabla_ingReceta.setColumnStretch(1, 0)
-        self.distribuidor_tabla_ingReceta.setColumnStretch(2, 0)
-
-        self.distribuidor_tabla_ingReceta.setSpacing(0)
-
-        #Creación de las etiquetas de encabezado
-        etiqueta_ingrediente = QLabel("Ingrediente")
-        etiqueta_ingrediente.setFont(QFont("Times", weight=QFont.Bold))
-        self.distribuidor_tabla_ingReceta.addWidget(etiqueta_ingrediente, 0, 0, Qt.AlignTop)
-
-        etiqueta_unidad = QLabel("Unidad")
-        etiqueta_unidad.setFont(QFont("Times", weight=QFont.Bold))
-        self.distribuidor_tabla_ingReceta.addWidget(etiqueta_unidad, 0, 1, alignment=Qt.AlignLeft | Qt.AlignTop)
-
-        etiqueta_cantidad = QLabel("Cantiad")
-        etiqueta_cantidad.setFont(QFont("Times", weight=QFont.Bold))
-        self.distribuidor_tabla_ingReceta.addWidget(etiqueta_cantidad, 0, 2, Qt.AlignLeft | Qt.AlignTop)
-
-
-        etiqueta_accion = QLabel("Opciones")
-        etiqueta_accion.setFont(QFont("Times", weight=QFont.Bold))
-        self.distribuidor_tabla_ingReceta.addWidget(etiqueta_accion, 0, 3, 0, 2, alignment=Qt.AlignCenter | Qt.AlignTop)
-
         #Se añaden los botones a la caja de botones
         caja_botones.layout().addWidget(self.btn_agregar_ingredienteReceta)
         caja_botones.layout().addWidget(self.btn_volver)
@@ -102,77 +83,46 @@ class VistaListaIngredientesReceta(QWidget):
         caja_botones.setStyleSheet("#MyBox{border:3px}")
         self.distribuidor_base.addWidget(caja_botones)
 
+    def asignar_receta(self, receta, indice_ingredientes):
+        """
+        Esta función cambia la receta y el índice de ingredientes disponibles cuando la ventana se reutiliza
+        """
+        self.receta = receta
+        self.indice_ingredientes = indice_ingredientes
+
     def mostrar_ing_receta(self, lista_ings_receta):
         """
         Esta función muestra la lista de ingredientes de la receta
         """
 
         self.contenedor_tabla.setTitle('Ingredientes ' + self.receta['nombre'])
-        self.lista_ings_receta = lista_ings_receta
-        
+        self.modelo_ings_receta.asignar_filas(lista_ings_receta)
 
-        #Ciclo para poblar la tabla
-        numero_fila = 0
-        for ingredienteReceta in self.lista_ings_receta:
-
-            etiqueta_nombre=QLabel(ingredienteReceta['ingrediente'])
-            etiqueta_nombre.setWordWrap(True)
-            etiqueta_nombre.setFixedSize(90,40)
-            self.distribuidor_tabla_ingReceta.addWidget(etiqueta_nombre, numero_fila + 1, 0, Qt.AlignTop)
-
-            etiqueta_unidad = QLabel(ingredienteReceta['unidad'])
-            etiqueta_unidad.setWordWrap(True)
-            etiqueta_unidad.setFixedSize(90, 40)
-            self.distribuidor_tabla_ingReceta.addWidget(etiqueta_unidad, numero_fila + 1, 1, Qt.AlignTop)
-
-            etiqueta_cantidad = QLabel(str(ingredienteReceta['cantidad']))
-            etiqueta_cantidad.setWordWrap(True)
-            etiqueta_cantidad.setFixedSize(90, 40)
-            self.distribuidor_tabla_ingReceta.addWidget(etiqueta_cantidad, numero_fila + 1, 2, Qt.AlignTop)
-
-            boton_editar=QPushButton("",self)
-            boton_editar.setToolTip("Editar")
-            boton_editar.setFixedSize(30,30)
-            boton_editar.setIcon(QIcon("src/recursos/004-edit-button.png"))
-            boton_editar.clicked.connect(partial(self.mostrar_dialogo_editar_ingrediente_receta, numero_fila))
-            self.distribuidor_tabla_ingReceta.addWidget(boton_editar, numero_fila + 1, 3, Qt.AlignTop)
-
-            boton_eliminar=QPushButton("",self)
-            boton_eliminar.setToolTip("Borrar")
-            boton_eliminar.setFixedSize(30,30)
-            boton_eliminar.setIcon(QIcon("src/recursos/005-delete.png"))
-            boton_eliminar.clicked.connect(partial(self.eliminar_ingrediente_receta, numero_fila))
-            self.distribuidor_tabla_ingReceta.addWidget(boton_eliminar, numero_fila + 1, 4, Qt.AlignTop)
-
-            numero_fila=numero_fila+1
-
-
-        #Elemento para ajustar la forma de la tabla (y evitar que queden muy espaciados)
-        self.distribuidor_tabla_ingReceta.layout().setRowStretch(numero_fila + 1, 1)
+    def aplicar_cambio(self, cambio):
+        """
+        Esta función actualiza sólo la fila del ingrediente de la receta agregado, editado o eliminado
+        """
+        self.modelo_ings_receta.aplicar_cambio(cambio['posicion_anterior'], cambio['posicion'], cambio['ingrediente_receta'])
 
     def mostrar_dialogo_agregar_ingredienteReceta(self):
         """
         Esta función ejecuta el diálogo para agregar un nuevo ingrediente a una receta
         """
-        dialogo=VistaCrearIngReceta(None, self.interfaz, self.ingredientes)
+        dialogo=VistaCrearIngReceta(None, self.interfaz, self.indice_ingredientes)
         dialogo.exec_()
         if dialogo.resultado==1:
-            self.interfaz.agregar_ingrediente_receta(self.receta,self.ingredientes[dialogo.combobox_ingredientes.currentIndex()],dialogo.texto_cantidad.text())
-            self.hide()
-            self.interfaz.mostrar_ingredientes_receta(self.receta)
-            
+            #La interfaz inserta la fila nueva en la posición que informa la lógica
+            self.interfaz.agregar_ingrediente_receta(self.receta,dialogo.id_ingrediente,dialogo.texto_cantidad.text())
 
     def mostrar_dialogo_editar_ingrediente_receta(self, id_ingrediente_receta):
         """
         Esta función ejecuta el diálogo para editar un ingrediente de una receta
         """    
-        dialogo=VistaCrearIngReceta(self.lista_ings_receta[id_ingrediente_receta], self.interfaz, self.ingredientes)
+        dialogo=VistaCrearIngReceta(self.modelo_ings_receta.dar_fila(id_ingrediente_receta), self.interfaz, self.indice_ingredientes)
         dialogo.exec_()
         if dialogo.resultado==1:            
-            self.interfaz.editar_ingrediente_receta(id_ingrediente_receta,self.receta, self.ingredientes[dialogo.combobox_ingredientes.currentIndex()], dialogo.texto_cantidad.text())
-            self.hide()
-            self.interfaz.mostrar_ingredientes_receta(self.receta)
-
+            #La interfaz mueve la fila editada a la posición que informa la lógica
+            self.interfaz.editar_ingrediente_receta(id_ingrediente_receta,self.receta, dialogo.id_ingrediente, dialogo.texto_cantidad.text())
 
     def eliminar_ingrediente_receta(self, id_ingrediente_receta):
         """
@@ -182,13 +132,11 @@ class VistaListaIngredientesReceta(QWidget):
         mensaje_confirmacion.setIcon(QMessageBox.Question)
         mensaje_confirmacion.setText("¿Esta seguro de que desea eliminar este ingrediente de la receta?\nRecuerde que esta acción es irreversible")
         mensaje_confirmacion.setWindowTitle("¿Desea borrar este ingrediente de la receeta?")
-        mensaje_confirmacion.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        mensaje_confirmacion.setWindowIcon(dar_icono("RecetarioLogo.png"))
         mensaje_confirmacion.setStandardButtons(QMessageBox.Yes | QMessageBox.No ) 
         respuesta=mensaje_confirmacion.exec_()
         if respuesta == QMessageBox.Yes:
             self.interfaz.eliminar_ingrediente_receta(id_ingrediente_receta, self.receta)
-            self.hide()
-            self.interfaz.mostrar_ingredientes_receta(self.receta)
 
 
 
@@ -204,7 +152,7 @@ class VistaListaIngredientesReceta(QWidget):
             mensaje_error.setIcon(QMessageBox.Question)
             mensaje_error.setText("Error : " + error)
             mensaje_error.setWindowTitle("Error guardar ingrediente receta")
-            mensaje_error.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+            mensaje_error.setWindowIcon(dar_icono("RecetarioLogo.png"))
             mensaje_error.setStandardButtons(QMessageBox.Ok ) 
             respuesta=mensaje_error.exec_()
 
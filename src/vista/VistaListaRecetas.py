@@ -3,6 +3,8 @@ from PyQt5.QtGui import *
 from PyQt5.QtCore import *
 from functools import partial
 from .VistaPersonasPreparacion import VistaPersonasPreparacion
+from .ModeloTabla import ModeloTabla, crear_tabla
+from .Recursos import dar_icono, dar_logo
 
 
 class VistaListaRecetas(QWidget):
@@ -27,14 +29,13 @@ class VistaListaRecetas(QWidget):
         #inicializamos la ventana
         self.setWindowTitle(self.title)
         self.setFixedSize(self.width, self.height)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
          
         self.distribuidor_base = QVBoxLayout(self)
 
         #Creación del logo de encabezado
         self.logo=QLabel(self)
-        self.pixmap = QPixmap("src/recursos/RecetarioLogo.png")
-        self.pixmap = self.pixmap.scaled(488,158, Qt.KeepAspectRatio)
+        self.pixmap = dar_logo(488, 158)
         self.logo.setPixmap(self.pixmap)
         self.logo.setAlignment(Qt.AlignCenter)
         self.distribuidor_base.addWidget(self.logo,alignment=Qt.AlignCenter)
@@ -53,7 +54,7 @@ class VistaListaRecetas(QWidget):
         self.btn_crear_receta=QPushButton("Crear receta",self)
         self.btn_crear_receta.setFixedSize(288,48)
         self.btn_crear_receta.setToolTip("Crear receta")
-        self.btn_crear_receta.setIcon(QIcon("src/recursos/006-add.png"))
+        self.btn_crear_receta.setIcon(dar_icono("006-add.png"))
         self.btn_crear_receta.setIconSize(QSize(120,120))
         self.distribuidor_botones.addWidget(self.btn_crear_receta,0,1,Qt.AlignLeft)
         self.btn_crear_receta.clicked.connect(self.crear_receta)
@@ -61,97 +62,104 @@ class VistaListaRecetas(QWidget):
         self.btn_ver_ingredientes=QPushButton("Ingredientes",self)
         self.btn_ver_ingredientes.setFixedSize(288,48)
         self.btn_ver_ingredientes.setToolTip("Ingredientes")
-        self.btn_ver_ingredientes.setIcon(QIcon("src/recursos/010-ingredientes.png"))
+        self.btn_ver_ingredientes.setIcon(dar_icono("010-ingredientes.png"))
         self.btn_ver_ingredientes.setIconSize(QSize(30,30))
         self.distribuidor_botones.addWidget(self.btn_ver_ingredientes,0,2,Qt.AlignRight)
-        self.distribuidor_base.addWidget(self.widget_botones,Qt.AlignCenter)
         self.btn_ver_ingredientes.clicked.connect(self.mostrar_ingredientes)
 
-        #Creación del área con la información de las recetas
-        self.tabla_recetas = QScrollArea(self)
-        self.tabla_recetas.setWidgetResizable(True)
-        self.tabla_recetas.setFixedSize(840, 400)
-        self.widget_tabla_recetas = QWidget()
-        self.distribuidor_tabla_recetas = QGridLayout()
-        self.widget_tabla_recetas.setLayout(self.distribuidor_tabla_recetas);
-        self.tabla_recetas.setWidget(self.widget_tabla_recetas)
+        self.btn_lista_compras=QPushButton("Lista de compras",self)
+        self.btn_lista_compras.setFixedSize(288,48)
+        self.btn_lista_compras.setToolTip("Lista de compras")
+        self.btn_lista_compras.setIcon(dar_icono("reporte.png"))
+        self.btn_lista_compras.setIconSize(QSize(30,30))
+        self.distribuidor_botones.addWidget(self.btn_lista_compras,1,1,1,2,Qt.AlignCenter)
+        self.distribuidor_base.addWidget(self.widget_botones,Qt.AlignCenter)
+        self.btn_lista_compras.clicked.connect(self.mostrar_lista_compras)
+
+        #Creación de la caja de búsqueda; la búsqueda se hace cuando el usuario deja de escribir
+        self.texto_busqueda = ""
+        self.caja_busqueda = QLineEdit(self)
+        self.caja_busqueda.setPlaceholderText("Buscar recetas por nombre o preparación")
+        self.caja_busqueda.setClearButtonEnabled(True)
+        self.caja_busqueda.setFixedWidth(840)
+        self.distribuidor_base.addWidget(self.caja_busqueda, alignment=Qt.AlignCenter)
+
+        self.temporizador_busqueda = QTimer(self)
+        self.temporizador_busqueda.setSingleShot(True)
+        self.temporizador_busqueda.setInterval(250)
+        self.temporizador_busqueda.timeout.connect(self.buscar_recetas)
+        self.caja_busqueda.textChanged.connect(self.temporizador_busqueda.start)
+
+        #Creación de la tabla con la información de las recetas; sólo se pintan las filas visibles
+        self.modelo_recetas = ModeloTabla([
+            ("Nombre", 'nombre', None),
+            ("", None, "Editar"),
+            ("", None, "Borrar"),
+            ("", None, "Preparar")
+        ], pedir_pagina=self.pedir_pagina_recetas, parent=self)
+        self.modelo_recetas.modelReset.connect(self.actualizar_visibilidad_tabla)
+        self.modelo_recetas.pagina_cargada.connect(self.actualizar_visibilidad_tabla)
+
+        self.tabla_recetas = crear_tabla(self, self.modelo_recetas, [
+            (1, "004-edit-button.png", partial(self.ejecutar_accion, self.mostrar_receta)),
+            (2, "005-delete.png", partial(self.ejecutar_accion, self.eliminar_receta)),
+            (3, "002-preparar.png", partial(self.ejecutar_accion, self.mostrar_ventana_preparar))
+        ])
+        self.tabla_recetas.setFixedSize(840, 370)
         self.distribuidor_base.addWidget(self.tabla_recetas)
 
         #Hacemos la ventana visible
         self.show()
 
+    def pedir_pagina_recetas(self, tamano_pagina, despues_de, entregar):
+        """
+        Esta función pide a la interfaz la siguiente página de recetas, o de resultados si hay una búsqueda
+        """
+        if self.texto_busqueda != "":
+            self.interfaz.buscar_recetas(self.texto_busqueda, tamano_pagina, despues_de, entregar)
+        else:
+            self.interfaz.pedir_pagina_recetas(tamano_pagina, despues_de, entregar)
+
+    def buscar_recetas(self):
+        """
+        Esta función vuelve a cargar la tabla con las recetas que coinciden con el texto de búsqueda
+        """
+        texto = self.caja_busqueda.text().strip()
+        if texto != self.texto_busqueda:
+            self.texto_busqueda = texto
+            self.modelo_recetas.reiniciar()
+
+    def refrescar_recetas(self):
+        """
+        Esta función descarta las recetas cargadas y vuelve a cargar la primera página
+        """
+        self.modelo_recetas.reiniciar()
 
     def mostrar_recetas(self, lista_recetas):
         """
-        Esta función puebla la tabla con las recetas
-        """
-        self.recetas = lista_recetas
-        numero_fila=0
-
-        self.distribuidor_tabla_recetas.setColumnStretch(0,1)
-        self.distribuidor_tabla_recetas.setColumnStretch(1,1)
-        self.distribuidor_tabla_recetas.setColumnStretch(2,0)
-        self.distribuidor_tabla_recetas.setColumnStretch(3,0)
-        self.distribuidor_tabla_recetas.setColumnStretch(4,0)
-        self.distribuidor_tabla_recetas.setColumnStretch(5,0)
-
-        #Ciclo para llenar la tabla
-        if (self.recetas!= None and len(self.recetas)>0) :
-            self.tabla_recetas.setVisible(True)
-
-            #Creación de las etiquetas
-            etiqueta_nombre=QLabel("Nombre")
-            etiqueta_nombre.setMinimumSize(QSize(0,0))
-            etiqueta_nombre.setMaximumSize(QSize(65525,65525))
-            etiqueta_nombre.setAlignment(Qt.AlignCenter)
-            etiqueta_nombre.setFont(QFont("Times",weight=QFont.Bold)) 
-            self.distribuidor_tabla_recetas.addWidget(etiqueta_nombre, 0,0, Qt.AlignLeft)
-
-            etiqueta_acciones=QLabel("Opciones")                      
-            etiqueta_acciones.setMinimumSize(QSize(0,0))
-            etiqueta_acciones.setMaximumSize(QSize(65525,65525))
-            etiqueta_acciones.setAlignment(Qt.AlignCenter)
-            etiqueta_acciones.setFont(QFont("Times",weight=QFont.Bold))               
-            self.distribuidor_tabla_recetas.addWidget(etiqueta_acciones, 0,2,1,3, Qt.AlignCenter)
-       
-            for dic_receta in self.recetas:
-                numero_fila=numero_fila+1
-
-                etiqueta_nombre=QLabel(dic_receta['nombre'] )
-                etiqueta_nombre.setWordWrap(True)
-                self.distribuidor_tabla_recetas.addWidget(etiqueta_nombre,numero_fila,0)
-
-                #Creación de los botones asociados a cada acción
-
-
-                btn_editar_receta=QPushButton("",self)
-                btn_editar_receta.setToolTip("Editar")
-                btn_editar_receta.setFixedSize(40,40)
-                btn_editar_receta.setIcon(QIcon("src/recursos/004-edit-button.png"))
-                btn_editar_receta.clicked.connect(partial(self.mostrar_receta,numero_fila-1) )
-                self.distribuidor_tabla_recetas.addWidget(btn_editar_receta,numero_fila,2,Qt.AlignCenter)
-
-                btn_eliminar=QPushButton("",self)
-                btn_eliminar.setToolTip("Borrar")
-                btn_eliminar.setFixedSize(40,40)
-                btn_eliminar.setIcon(QIcon("src/recursos/005-delete.png"))
-                btn_eliminar.clicked.connect(partial(self.eliminar_receta,numero_fila -1) )
-                self.distribuidor_tabla_recetas.addWidget(btn_eliminar,numero_fila,3,Qt.AlignCenter)
-
-                btn_preparar_receta = QPushButton("", self)
-                btn_preparar_receta.setToolTip("Preparar")
-                btn_preparar_receta.setFixedSize(40, 40)
-                btn_preparar_receta.setIcon(QIcon("src/recursos/002-preparar.png"))
-                btn_preparar_receta.clicked.connect(
-                    partial(self.mostrar_ventana_preparar, numero_fila - 1))
-                self.distribuidor_tabla_recetas.addWidget(btn_preparar_receta, numero_fila, 4,
-                                                           Qt.AlignCenter)
+        Esta función puebla la tabla con una lista completa de recetas
+        """
+        self.modelo_recetas.asignar_filas(lista_recetas)
 
-        else:
-                self.tabla_recetas.setVisible(False)
+    def aplicar_cambio(self, cambio):
+        """
+        Esta función actualiza sólo la fila de la receta creada, editada o eliminada. Las posiciones
+        que informa la lógica son las de la lista completa; durante una búsqueda se recargan los resultados
+        """
+        if self.texto_busqueda != "":
+            self.modelo_recetas.reiniciar()
+            return
+        self.modelo_recetas.aplicar_cambio(cambio['posicion_anterior'], cambio['posicion'], cambio['receta'])
+        self.actualizar_visibilidad_tabla()
+
+    def actualizar_visibilidad_tabla(self):
+        self.tabla_recetas.setVisible(self.modelo_recetas.rowCount() > 0 or self.modelo_recetas.cargando)
 
-        #persona para ajustar la forma de la tabla (y evitar que queden muy espaciados)
-        self.distribuidor_tabla_recetas.layout().setRowStretch(numero_fila+2, 1)
+    def ejecutar_accion(self, accion, numero_fila):
+        """
+        Esta función ejecuta la acción del botón presionado sobre la receta de esa fila
+        """
+        accion(self.modelo_recetas.dar_fila(numero_fila)['id'])
 
     def crear_receta(self):
         """
@@ -176,13 +184,11 @@ class VistaListaRecetas(QWidget):
         mensaje_confirmacion.setText(
             "¿Esta seguro de que desea borrar esta receta?\nRecuerde que esta acción es irreversible")
         mensaje_confirmacion.setWindowTitle("¿Desea borrar esta receta?")
-        mensaje_confirmacion.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        mensaje_confirmacion.setWindowIcon(dar_icono("RecetarioLogo.png"))
         mensaje_confirmacion.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
         respuesta = mensaje_confirmacion.exec_()
         if respuesta == QMessageBox.Yes:
             self.interfaz.eliminar_receta(indice)
-            self.hide()
-            self.interfaz.mostrar_vista_lista_recetas()
 
     def mostrar_ingredientes(self):
         """
@@ -193,6 +199,13 @@ class VistaListaRecetas(QWidget):
  
 
 
+    def mostrar_lista_compras(self):
+        """
+        Esta función informa a la interfaz para desplegar la ventana de lista de compras
+        """
+        self.hide()
+        self.interfaz.mostrar_lista_compras()
+
     def mostrar_ventana_preparar(self,id_receta):
         """
         Esta función informa a la interfaz para desplegar la ventana de preparación de una receta
@@ -1,5 +1,6 @@
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
+from .Recursos import dar_icono
 
 
 class VistaPersonasPreparacion(QDialog):
@@ -15,7 +16,7 @@ class VistaPersonasPreparacion(QDialog):
         self.cantidad_personas = 0
 
         self.setFixedSize(300, 150)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
 
         self.resultado = ""
 
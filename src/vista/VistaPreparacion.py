@@ -2,6 +2,7 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import QWidget
+from .Recursos import dar_icono
 
 
 class VistaPreparacion(QWidget):
@@ -20,9 +21,8 @@ class VistaPreparacion(QWidget):
         self.width = 800
         self.height = 560
         self.interfaz = interfaz
-    
-
-        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.etiquetas_datos = []
+        self.fila_estirada = 0
 
         self.inicializar_GUI()
         self.show()
@@ -32,7 +32,7 @@ class VistaPreparacion(QWidget):
         # inicializamos la ventana
         self.setWindowTitle(self.titulo)
         self.setFixedSize(self.width, self.height)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
 
         self.distribuidor_base = QVBoxLayout(self)
 
@@ -113,7 +113,7 @@ class VistaPreparacion(QWidget):
         self.btn_volver = QPushButton("Volver", self)
         self.btn_volver.setFixedSize(200, 40)
         self.btn_volver.setToolTip("Volver")
-        self.btn_volver.setIcon(QIcon("src/recursos/007-back-button.png"))
+        self.btn_volver.setIcon(dar_icono("007-back-button.png"))
         self.btn_volver.setIconSize(QSize(120, 120))
         self.btn_volver.clicked.connect(self.volver)
         self.distribuidor_base.addWidget(self.btn_volver)
@@ -123,23 +123,35 @@ class VistaPreparacion(QWidget):
         """
         Esta función pobla el reporte con la información
         """
-      
+
+        #La ventana se reutiliza entre recetas: se quitan los datos de la preparación anterior
+        self.setWindowTitle("Recetario - Preparación receta  " + datos_preparacion['receta'])
+        for etiqueta in self.etiquetas_datos:
+            etiqueta.setParent(None)
+            etiqueta.deleteLater()
+        self.etiquetas_datos = []
+        self.distribuidor_tabla.setRowStretch(self.fila_estirada, 0)
+
         #Mostrar información básica
         etiqueta_detalle = QLabel(str(datos_preparacion['personas']))
         etiqueta_detalle.setWordWrap(True)
         self.distribuidor_tabla_reporte.addWidget(etiqueta_detalle, 0, 1, Qt.AlignTop)
+        self.etiquetas_datos.append(etiqueta_detalle)
 
         etiqueta_detalle = QLabel(str(datos_preparacion['calorias']))
         etiqueta_detalle.setWordWrap(True)
         self.distribuidor_tabla_reporte.addWidget(etiqueta_detalle, 1, 1, Qt.AlignTop)
+        self.etiquetas_datos.append(etiqueta_detalle)
 
         etiqueta_detalle = QLabel("${:,.2f}".format(datos_preparacion['costo']))
         etiqueta_detalle.setWordWrap(True)
         self.distribuidor_tabla_reporte.addWidget(etiqueta_detalle, 2, 1, Qt.AlignTop)
+        self.etiquetas_datos.append(etiqueta_detalle)
 
         etiqueta_detalle = QLabel(str(datos_preparacion['tiempo_preparacion']))
         etiqueta_detalle.setWordWrap(True)
         self.distribuidor_tabla_reporte.addWidget(etiqueta_detalle, 3, 1, Qt.AlignTop)
+        self.etiquetas_datos.append(etiqueta_detalle)
 
         # Elemento para ajustar la forma de la tabla (y evitar que queden muy espaciados)
         self.distribuidor_tabla_reporte.layout().setRowStretch(0, 1)
@@ -154,23 +166,27 @@ class VistaPreparacion(QWidget):
             etiqueta_nombre.setWordWrap(True)
             etiqueta_nombre.setFixedSize(90, 40)
             self.distribuidor_tabla.addWidget(etiqueta_nombre, numero_fila + 1, 0, Qt.AlignTop)
+            self.etiquetas_datos.append(etiqueta_nombre)
 
             etiqueta_unidad = QLabel(str(ingrediente['unidad']))
             etiqueta_unidad.setWordWrap(True)
             etiqueta_unidad.setFixedSize(90, 40)
             self.distribuidor_tabla.addWidget(etiqueta_unidad, numero_fila + 1, 1, Qt.AlignTop)
+            self.etiquetas_datos.append(etiqueta_unidad)
 
             etiqueta_cantidad = QLabel(str(ingrediente['cantidad']))
             etiqueta_cantidad.setWordWrap(True)
             etiqueta_cantidad.setFixedSize(90, 40)
             etiqueta_cantidad.setAlignment(Qt.AlignCenter)
             self.distribuidor_tabla.addWidget(etiqueta_cantidad, numero_fila + 1, 2, Qt.AlignTop)
+            self.etiquetas_datos.append(etiqueta_cantidad)
 
             etiqueta_valor = QLabel("${:,.2f}".format(ingrediente['valor']))
             etiqueta_valor.setWordWrap(True)
             etiqueta_valor.setFixedSize(90, 40)
             etiqueta_valor.setAlignment(Qt.AlignRight)
             self.distribuidor_tabla.addWidget(etiqueta_valor, numero_fila + 1, 3, Qt.AlignTop)
+            self.etiquetas_datos.append(etiqueta_valor)
             numero_fila = numero_fila + 1
 
 
@@ -180,9 +196,11 @@ class VistaPreparacion(QWidget):
         etiqueta_total.setFont(QFont("Times", weight=QFont.Bold))
         etiqueta_total.setAlignment(Qt.AlignRight)
         self.distribuidor_tabla.addWidget(etiqueta_total, numero_fila + 1, 3, Qt.AlignTop)
+        self.etiquetas_datos.append(etiqueta_total)
 
         # Elemento para ajustar la forma de la tabla (y evitar que queden muy espaciados)
         self.distribuidor_tabla.layout().setRowStretch(numero_fila + 1, 1)
+        self.fila_estirada = numero_fila + 1
         
     def volver(self):
         """
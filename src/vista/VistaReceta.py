@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
 from PyQt5.QtCore import *
+from .Recursos import dar_icono
 
 
 class VistaReceta(QWidget):
@@ -13,7 +14,6 @@ class VistaReceta(QWidget):
         super().__init__()
 
         self.titulo = 'Recetario- Receta'
-        self.setAttribute(Qt.WA_DeleteOnClose)
 
         self.interfaz=interfaz
         self.receta = None
@@ -30,7 +30,7 @@ class VistaReceta(QWidget):
         # inicializamos la ventana
         self.setWindowTitle(self.titulo)
         self.setFixedSize(self.width, self.height)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
 
         self.distribuidor_base = QVBoxLayout(self)
 
@@ -88,7 +88,7 @@ class VistaReceta(QWidget):
         self.btn_ingredientes_receta = QPushButton("Ingredientes", self)
         self.btn_ingredientes_receta.setFixedSize(130, 40)
         self.btn_ingredientes_receta.setToolTip("Ingredientes")
-        self.btn_ingredientes_receta.setIcon(QIcon("src/recursos/010-ingredientes.png"))
+        self.btn_ingredientes_receta.setIcon(dar_icono("010-ingredientes.png"))
         self.btn_ingredientes_receta.setDisabled(True)
         self.distribuidor_botones.addWidget(self.btn_ingredientes_receta, 0, 0, Qt.AlignCenter)
         self.btn_ingredientes_receta.clicked.connect(self.mostrar_ventana_ingredientes_receta)
@@ -96,7 +96,7 @@ class VistaReceta(QWidget):
         self.btn_guardar_receta = QPushButton("Guardar receta", self)
         self.btn_guardar_receta.setFixedSize(130, 40)
         self.btn_guardar_receta.setToolTip("Guardar receta")
-        self.btn_guardar_receta.setIcon(QIcon("src/recursos/floppy-disk.png"))
+        self.btn_guardar_receta.setIcon(dar_icono("floppy-disk.png"))
         self.distribuidor_botones.addWidget(self.btn_guardar_receta, 0, 1, Qt.AlignCenter)
         self.btn_guardar_receta.clicked.connect(self.guardar_cambios)
 
@@ -104,7 +104,7 @@ class VistaReceta(QWidget):
         self.btn_volver = QPushButton("Volver", self)
         self.btn_volver.setFixedSize(130, 40)
         self.btn_volver.setToolTip("Volver")
-        self.btn_volver.setIcon(QIcon("src/recursos/007-back-button.png"))
+        self.btn_volver.setIcon(dar_icono("007-back-button.png"))
         self.distribuidor_botones.addWidget(self.btn_volver, 0, 2, Qt.AlignCenter)
         self.btn_volver.clicked.connect(self.volver)
 
@@ -118,6 +118,12 @@ class VistaReceta(QWidget):
             self.texto_calorias.setText(str(self.receta["calorias"]))
             self.texto_preparacion.setText(self.receta["preparacion"])
             self.btn_ingredientes_receta.setEnabled(True)
+        else:
+            # La ventana se reutiliza: para una receta nueva se limpian los datos de la anterior
+            for campo in [self.texto_nombre_receta, self.texto_tiempo_preparacion, self.texto_personas,
+                          self.texto_calorias, self.texto_preparacion]:
+                campo.clear()
+            self.btn_ingredientes_receta.setDisabled(True)
         
 
 
@@ -153,7 +159,7 @@ class VistaReceta(QWidget):
         mensaje_error.setIcon(QMessageBox.Question)
         mensaje_error.setText("Error: " + error)
         mensaje_error.setWindowTitle("Error al guardar receta")
-        mensaje_error.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        mensaje_error.setWindowIcon(dar_icono("RecetarioLogo.png"))
         mensaje_error.setStandardButtons(QMessageBox.Ok ) 
         respuesta=mensaje_error.exec_()
 
@@ -162,7 +168,7 @@ class VistaReceta(QWidget):
         mensaje.setIcon(QMessageBox.Question)
         mensaje.setText("Receta guardada ")
         mensaje.setWindowTitle("Receta guradada")
-        mensaje.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        mensaje.setWindowIcon(dar_icono("RecetarioLogo.png"))
         mensaje.setStandardButtons(QMessageBox.Ok ) 
         respuesta=mensaje.exec_()
 
@@ -0,0 +1,67 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stderr
+
+# Las pruebas usan una base de datos en memoria y no la aplicacion.sqlite de la aplicación
+os.environ.setdefault('RECETARIO_DB_URL', 'sqlite://')
+
+from benchmarks.benchmark_logica import TAMANOS_COMPLETOS, comparar, main
+
+
+def dar_resultados(**operaciones):
+    return {'semilla': 15, 'resultados': {'1000': operaciones}}
+
+
+def dar_medicion(p50_ms=10.0, memoria_pico_kb=100.0, consultas=1):
+    return {'p50_ms': p50_ms, 'p95_ms': p50_ms, 'consultas': consultas, 'memoria_pico_kb': memoria_pico_kb,
+            'repeticiones': 30}
+
+
+class BenchmarkLogicaTestCase(unittest.TestCase):
+
+    def test_comparar_sin_cambios(self):
+        base = dar_resultados(dar_receta=dar_medicion())
+
+        self.assertEqual(comparar(dar_resultados(dar_receta=dar_medicion()), base), [])
+
+    def test_comparar_tiempo_sobre_la_tolerancia(self):
+        base = dar_resultados(dar_receta=dar_medicion(p50_ms=10.0), dar_recetas=dar_medicion(p50_ms=10.0))
+        resultados = dar_resultados(dar_receta=dar_medicion(p50_ms=14.9), dar_recetas=dar_medicion(p50_ms=15.1))
+
+        self.assertEqual(comparar(resultados, base), [('1000', 'dar_recetas', 'p50_ms', 10.0, 15.1)])
+        self.assertEqual(len(comparar(resultados, base, tolerancia=0.4)), 2)
+
+    def test_comparar_ignora_diferencias_menores_al_ruido(self):
+        base = dar_resultados(dar_receta=dar_medicion(p50_ms=0.1, memoria_pico_kb=10.0))
+        # El tiempo se cuadruplica y la memoria se multiplica por siete, pero por debajo del piso de ruido
+        resultados = dar_resultados(dar_receta=dar_medicion(p50_ms=0.4, memoria_pico_kb=70.0))
+
+        self.assertEqual(comparar(resultados, base), [])
+
+    def test_comparar_memoria(self):
+        base = dar_resultados(dar_receta=dar_medicion(memoria_pico_kb=1000.0))
+
+        self.assertEqual(comparar(dar_resultados(dar_receta=dar_medicion(memoria_pico_kb=1200.0)), base), [])
+        self.assertEqual(comparar(dar_resultados(dar_receta=dar_medicion(memoria_pico_kb=1300.0)), base),
+                         [('1000', 'dar_receta', 'memoria_pico_kb', 1000.0, 1300.0)])
+
+    def test_comparar_cualquier_consulta_adicional(self):
+        base = dar_resultados(dar_receta=dar_medicion(consultas=1), dar_recetas=dar_medicion(consultas=2))
+        resultados = dar_resultados(dar_receta=dar_medicion(consultas=2), dar_recetas=dar_medicion(consultas=1))
+
+        self.assertEqual(comparar(resultados, base), [('1000', 'dar_receta', 'consultas', 1, 2)])
+
+    def test_comparar_omite_lo_que_no_esta_en_la_base(self):
+        base = dar_resultados(dar_receta=dar_medicion())
+        resultados = {'semilla': 15, 'resultados': {
+            '1000': {'dar_receta': dar_medicion(), 'dar_recetas': dar_medicion(p50_ms=100.0)},
+            '10000': {'dar_receta': dar_medicion(p50_ms=100.0)}
+        }}
+
+        self.assertEqual(comparar(resultados, base), [])
+
+    def test_completo_y_tamanos_son_excluyentes(self):
+        self.assertEqual(TAMANOS_COMPLETOS, [1000, 10000, 100000, 1000000])
+        with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+            main(['--completo', '--tamanos', '1000'])
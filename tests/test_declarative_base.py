@@ -0,0 +1,95 @@
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+# Las pruebas usan una base de datos en memoria y no la aplicacion.sqlite de la aplicación
+os.environ.setdefault('RECETARIO_DB_URL', 'sqlite://')
+
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from src.logica.logica_recetario import LogicaRecetario
+from src.modelo.declarative_base import URL_POR_DEFECTO, crear_motor, dar_configuracion, dar_pragmas
+
+
+class DeclarativeBaseTestCase(unittest.TestCase):
+
+    def test_dar_configuracion_por_defecto(self):
+        configuracion = dar_configuracion({})
+
+        self.assertEqual(configuracion['url'], URL_POR_DEFECTO)
+        self.assertEqual(configuracion['journal_mode'], None)
+
+    def test_dar_configuracion_desde_entorno(self):
+        configuracion = dar_configuracion({'RECETARIO_DB_URL': 'sqlite://',
+                                           'RECETARIO_SQLITE_JOURNAL_MODE': 'wal',
+                                           'RECETARIO_SQLITE_BUSY_TIMEOUT': '5000'})
+
+        self.assertEqual(configuracion['url'], 'sqlite://')
+        self.assertEqual(dar_pragmas(configuracion), ['PRAGMA journal_mode = WAL', 'PRAGMA busy_timeout = 5000'])
+
+    def test_dar_pragmas_valida_valores(self):
+        with self.assertRaises(ValueError):
+            dar_pragmas({'synchronous': 'NORMAL; DROP TABLE receta'})
+        with self.assertRaises(ValueError):
+            dar_pragmas({'cache_size': '-2000; DROP TABLE receta'})
+
+    def test_motor_en_memoria_compartido(self):
+        motor = crear_motor(url='sqlite://')
+        self.assertIsInstance(motor.pool, StaticPool)
+
+        with motor.begin() as conexion:
+            conexion.execute('CREATE TABLE prueba (id INTEGER PRIMARY KEY)')
+            conexion.execute('INSERT INTO prueba (id) VALUES (1)')
+        with motor.connect() as conexion:
+            self.assertEqual(conexion.execute('SELECT COUNT(*) FROM prueba').scalar(), 1)
+
+    def test_motor_aplica_pragmas(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            motor = crear_motor(url='sqlite:///' + os.path.join(directorio, 'pragmas.sqlite'),
+                                journal_mode='wal', synchronous='normal', cache_size=-8000,
+                                mmap_size=1048576, busy_timeout=2500)
+            with motor.connect() as conexion:
+                self.assertEqual(conexion.execute('PRAGMA journal_mode').scalar(), 'wal')
+                self.assertEqual(conexion.execute('PRAGMA synchronous').scalar(), 1)
+                self.assertEqual(conexion.execute('PRAGMA cache_size').scalar(), -8000)
+                self.assertEqual(conexion.execute('PRAGMA mmap_size').scalar(), 1048576)
+                self.assertEqual(conexion.execute('PRAGMA busy_timeout').scalar(), 2500)
+            motor.dispose()
+
+    def test_motor_con_pool_configurado(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            motor = crear_motor(url='sqlite:///' + os.path.join(directorio, 'pool.sqlite'), pool='queue', pool_size=3)
+            self.assertIsInstance(motor.pool, QueuePool)
+            self.assertEqual(motor.pool.size(), 3)
+            motor.dispose()
+
+    def test_motor_archivo_usa_queue_pool_entre_hilos(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            motor = crear_motor(url='sqlite:///' + os.path.join(directorio, 'hilos.sqlite'))
+            self.assertIsInstance(motor.pool, QueuePool)
+            logica = LogicaRecetario(motor)
+            logica.crear_receta('Ajiaco', '01:00:00', 4, 200, 'Hervir')
+            errores = []
+
+            def consultar():
+                try:
+                    for _ in range(5):
+                        self.assertEqual(len(logica.dar_recetas()), 1)
+                        self.assertEqual(len(logica.buscar_recetas('ajiaco')), 1)
+                except Exception as error:
+                    errores.append(error)
+
+            # Más hilos que conexiones en el pool: ninguno debe cerrar las conexiones de otro. assertNoLogs
+            # no existe en Python 3.9; con assertLogs el único registro de error debe ser el centinela
+            with self.assertLogs('sqlalchemy.pool', level='ERROR') as registros:
+                hilos = [threading.Thread(target=consultar) for _ in range(12)]
+                for hilo in hilos:
+                    hilo.start()
+                for hilo in hilos:
+                    hilo.join()
+                logging.getLogger('sqlalchemy.pool').error('centinela')
+            self.assertEqual(registros.output, ['ERROR:sqlalchemy.pool:centinela'])
+            self.assertEqual(errores, [])
+            motor.dispose()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+import warnings
+
+# Las pruebas usan una base de datos en memoria y no la aplicacion.sqlite de la aplicación
+os.environ.setdefault('RECETARIO_DB_URL', 'sqlite://')
+
+from sqlalchemy import create_engine, inspect
+
+from src.modelo.esquema import actualizar_esquema
+
+
+class EsquemaTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.motor = create_engine('sqlite:///' + os.path.join(self.directorio.name, 'anterior.sqlite'))
+        # Esquema de la versión anterior, sin índices
+        with self.motor.begin() as conexion:
+            conexion.execute('CREATE TABLE ingrediente (id INTEGER PRIMARY KEY, nombre VARCHAR, '
+                             '"unidadMedida" VARCHAR, "sitioCompra" VARCHAR, "valorUnidad" INTEGER)')
+            conexion.execute('CREATE TABLE receta (id INTEGER PRIMARY KEY, nombre VARCHAR, '
+                             '"tiempoPreparacion" VARCHAR, "personasBase" INTEGER, "caloriasPorcion" INTEGER, '
+                             'instrucciones VARCHAR)')
+
+    def tearDown(self):
+        self.motor.dispose()
+        self.directorio.cleanup()
+
+    def test_actualizar_esquema_agrega_indices(self):
+        actualizar_esquema(self.motor)
+
+        inspector = inspect(self.motor)
+        indices = {indice['name']: indice for indice in inspector.get_indexes('ingrediente')}
+        self.assertIn('ux_ingrediente_nombre_unidad', indices)
+        self.assertTrue(indices['ux_ingrediente_nombre_unidad']['unique'])
+        self.assertIn('ix_receta_nombre', [indice['name'] for indice in inspector.get_indexes('receta')])
+        self.assertIn('ingrediente_receta', inspector.get_table_names())
+
+    def test_actualizar_esquema_calcula_costos_existentes(self):
+        with self.motor.begin() as conexion:
+            conexion.execute('CREATE TABLE ingrediente_receta (id INTEGER PRIMARY KEY, cantidad FLOAT, '
+                             'receta INTEGER, ingrediente INTEGER)')
+            conexion.execute('INSERT INTO ingrediente (id, nombre, "unidadMedida", "sitioCompra", "valorUnidad") '
+                             "VALUES (1, 'Papa', 'libra', 'Plaza', 1000)")
+            conexion.execute('INSERT INTO receta (id, nombre, "tiempoPreparacion", "personasBase", '
+                             '"caloriasPorcion", instrucciones) '
+                             "VALUES (1, 'Ajiaco', '01:00:00', 6, 200, 'Hervir'), (2, 'Agua', '00:10:00', 1, 10, 'Hervir')")
+            conexion.execute('INSERT INTO ingrediente_receta (cantidad, receta, ingrediente) VALUES (3, 1, 1)')
+
+        actualizar_esquema(self.motor)
+
+        with self.motor.begin() as conexion:
+            costos = conexion.execute('SELECT receta, costo FROM receta_costo ORDER BY receta').fetchall()
+            self.assertEqual([tuple(costo) for costo in costos], [(1, 3000), (2, 0)])
+
+            conexion.execute('INSERT INTO ingrediente_receta (cantidad, receta, ingrediente) VALUES (1, 2, 1)')
+            self.assertEqual(conexion.execute('SELECT costo FROM receta_costo WHERE receta = 2').scalar(), 1000)
+
+    def test_actualizar_esquema_indexa_recetas_existentes(self):
+        with self.motor.begin() as conexion:
+            conexion.execute('INSERT INTO receta (id, nombre, "tiempoPreparacion", "personasBase", '
+                             '"caloriasPorcion", instrucciones) '
+                             "VALUES (1, 'Ajiaco santafereño', '01:00:00', 6, 200, 'Hervir')")
+
+        actualizar_esquema(self.motor)
+        actualizar_esquema(self.motor)
+
+        with self.motor.begin() as conexion:
+            consulta = "SELECT rowid FROM receta_fts WHERE receta_fts MATCH 'santafereno'"
+            self.assertEqual(conexion.execute(consulta).fetchall(), [(1,)])
+            conexion.execute("UPDATE receta SET nombre = 'Ajiaco' WHERE id = 1")
+            self.assertEqual(conexion.execute(consulta).fetchall(), [])
+
+    def test_actualizar_esquema_es_idempotente(self):
+        actualizar_esquema(self.motor)
+        actualizar_esquema(self.motor)
+
+        indices = [indice['name'] for indice in inspect(self.motor).get_indexes('ingrediente')]
+        self.assertEqual(len(indices), len(set(indices)))
+
+    def test_actualizar_esquema_con_ingredientes_repetidos(self):
+        with self.motor.begin() as conexion:
+            for i in range(0, 2):
+                conexion.execute('INSERT INTO ingrediente (nombre, "unidadMedida", "sitioCompra", "valorUnidad") '
+                                 "VALUES ('Papa', 'libra', 'Plaza', 1000)")
+
+        with warnings.catch_warnings(record=True) as advertencias:
+            warnings.simplefilter('always')
+            actualizar_esquema(self.motor)
+
+        self.assertEqual(len(advertencias), 1)
+        indices = [indice['name'] for indice in inspect(self.motor).get_indexes('ingrediente')]
+        self.assertNotIn('ux_ingrediente_nombre_unidad', indices)
+        self.assertIn('ix_ingrediente_nombre_unidad_sitio', indices)
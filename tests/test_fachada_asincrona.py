@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtWidgets import QApplication
+
+from src.logica.LogicaMock import LogicaMock
+from src.vista.FachadaAsincrona import FachadaAsincrona
+
+
+class LogicaLenta(LogicaMock):
+    # Mock que registra en qué hilo y cuántas veces se consulta
+
+    def __init__(self):
+        super().__init__()
+        self.hilos = []
+        self.consultas = 0
+
+    def dar_recetas(self):
+        time.sleep(0.05)
+        self.hilos.append(threading.current_thread())
+        self.consultas += 1
+        return super().dar_recetas()
+
+    def dar_receta(self, id_receta):
+        if id_receta >= len(self.recetas):
+            raise IndexError('No existe la receta')
+        return super().dar_receta(id_receta)
+
+
+class FachadaAsincronaTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.aplicacion = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.logica = LogicaLenta()
+        self.fachada = FachadaAsincrona(self.logica)
+
+    def esperar(self):
+        self.fachada.esperar()
+        QCoreApplication.processEvents()
+
+    def test_resultado_en_hilo_de_interfaz(self):
+        resultados = []
+
+        self.fachada.llamar('dar_recetas', al_terminar=lambda recetas: resultados.append(
+            (recetas, threading.current_thread())))
+        self.assertEqual(resultados, [])
+        self.esperar()
+
+        self.assertEqual(len(resultados), 1)
+        self.assertEqual(resultados[0][0][0]['nombre'], 'Ajiaco')
+        self.assertIs(resultados[0][1], threading.main_thread())
+        self.assertIsNot(self.logica.hilos[0], threading.main_thread())
+
+    def test_consultas_repetidas_se_agrupan(self):
+        resultados = []
+
+        for _ in range(5):
+            self.fachada.llamar('dar_recetas', al_terminar=resultados.append)
+        self.fachada.llamar('dar_recetas', al_terminar=lambda recetas: resultados.append('otra'))
+        self.esperar()
+
+        self.assertEqual(self.logica.consultas, 1)
+        self.assertEqual(len(resultados), 2)
+
+    def test_escritura_no_se_agrupa_con_consultas_anteriores(self):
+        resultados = []
+
+        self.fachada.llamar('dar_recetas', al_terminar=lambda recetas: resultados.append(len(recetas)))
+        self.fachada.llamar('crear_receta', 'Sancocho', '02:00:00', 8, 300, 'Hervir')
+        self.fachada.llamar('dar_recetas', al_terminar=lambda recetas: resultados.append(len(recetas)))
+        self.esperar()
+
+        self.assertEqual(self.logica.consultas, 2)
+        self.assertEqual(resultados, [2, 3])
+
+    def test_error_se_entrega_al_fallar(self):
+        errores = []
+
+        self.fachada.llamar('dar_receta', 10, al_fallar=errores.append)
+        self.esperar()
+
+        self.assertIsInstance(errores[0], IndexError)
+        self.assertEqual(self.fachada.tareas, set())
@@ -0,0 +1,53 @@
+import unittest
+
+from src.logica.indice_prefijos import IndicePrefijos, normalizar
+
+
+def crear_ingrediente(id_ingrediente, nombre, unidad='libra', sitio='Plaza'):
+    return {'id': id_ingrediente, 'nombre': nombre, 'unidad': unidad, 'valor': 1000, 'sitioCompra': sitio}
+
+
+class IndicePrefijosTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.indice = IndicePrefijos([
+            crear_ingrediente(1, 'Papa pastusa'),
+            crear_ingrediente(2, 'Papa criolla'),
+            crear_ingrediente(3, 'Ají'),
+            crear_ingrediente(4, 'Papaya'),
+            crear_ingrediente(5, 'Papa criolla', 'kilo'),
+        ])
+
+    def dar_ids(self, texto, limite=50):
+        return [ingrediente['id'] for ingrediente in self.indice.buscar(texto, limite)]
+
+    def test_normalizar(self):
+        self.assertEqual(normalizar('Ají Ñame'), 'aji name')
+
+    def test_buscar_por_prefijo_en_el_orden_de_la_lista(self):
+        self.assertEqual(self.dar_ids('papa'), [5, 2, 1, 4])
+        self.assertEqual(self.dar_ids('PAPA C'), [5, 2])
+        self.assertEqual(self.dar_ids('aji'), [3])
+        self.assertEqual(self.dar_ids('yuca'), [])
+
+    def test_buscar_por_cualquier_palabra_del_nombre(self):
+        self.assertEqual(self.dar_ids('crio'), [5, 2])
+        self.assertEqual(self.dar_ids('past'), [1])
+
+    def test_buscar_respeta_el_limite_sin_repetir(self):
+        self.assertEqual(len(self.dar_ids('', 3)), 3)
+        self.assertEqual(sorted(self.dar_ids('')), [1, 2, 3, 4, 5])
+
+    def test_aplicar_cambios_sin_reconstruir(self):
+        self.indice.aplicar_cambio({'ingrediente': crear_ingrediente(6, 'Pimentón'), 'posicion_anterior': None, 'posicion': 0})
+        self.assertEqual(self.dar_ids('pimenton'), [6])
+
+        self.indice.aplicar_cambio({'ingrediente': crear_ingrediente(1, 'Yuca'), 'posicion_anterior': 2, 'posicion': 5})
+        self.assertEqual(self.dar_ids('past'), [])
+        self.assertEqual(self.dar_ids('yu'), [1])
+
+        self.indice.aplicar_cambio({'ingrediente': crear_ingrediente(4, 'Papaya'), 'posicion_anterior': 3, 'posicion': None})
+        self.assertEqual(self.dar_ids('papa'), [5, 2])
+        self.assertEqual(self.indice.dar_ingrediente(4), None)
+        self.assertEqual(len(self.indice), 5)
+        self.assertEqual(len(self.indice.llaves), 7)
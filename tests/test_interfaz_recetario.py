@@ -0,0 +1,91 @@
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+# Las pruebas usan una base de datos en memoria y no la aplicacion.sqlite de la aplicación
+os.environ.setdefault('RECETARIO_DB_URL', 'sqlite://')
+
+from PyQt5.QtCore import QModelIndex
+from PyQt5.QtWidgets import QApplication
+
+from src.logica.logica_recetario import LogicaRecetario
+from src.logica.logica_recetario_cache import LogicaRecetarioCache
+from src.modelo.declarative_base import crear_motor
+from src.vista.FachadaAsincrona import FachadaAsincrona
+from src.vista.InterfazRecetario import App_Recetario
+from src.vista.Navegador import Navegador
+from src.vista.VistaPreparacion import VistaPreparacion
+
+
+class InterfazPrueba():
+    """
+    Reúne los métodos de App_Recetario que se prueban, sin crear una segunda QApplication
+    """
+
+    mostrar_preparacion = App_Recetario.mostrar_preparacion
+    mostrar_ingredientes = App_Recetario.mostrar_ingredientes
+    pedir_pagina_ingredientes = App_Recetario.pedir_pagina_ingredientes
+
+    def __init__(self, logica):
+        self.logica = logica
+        self.navegador = Navegador(logica.dar_contador_cambios)
+        self.fachada_asincrona = FachadaAsincrona(logica)
+        self.errores = []
+        self.listas_mostradas = 0
+
+    def mostrar_error(self, error):
+        self.errores.append(error)
+
+    def mostrar_vista_lista_recetas(self):
+        self.listas_mostradas += 1
+
+
+class InterfazRecetarioTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.aplicacion = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        logica = LogicaRecetario(crear_motor(url='sqlite://'))
+        self.id_receta = logica.crear_receta('Arroz con leche', '00:40:00', 4, 300, 'Hervir')['receta']['id']
+        logica.crear_ingrediente('Arroz', 'libra', 3000, 'Plaza')
+        logica.agregar_ingrediente_receta({'id': self.id_receta}, 'Arroz', 1)
+        self.logica = logica
+        self.interfaz = InterfazPrueba(LogicaRecetarioCache(logica))
+
+    def esperar_consultas(self):
+        self.interfaz.fachada_asincrona.pool.waitForDone()
+        self.aplicacion.processEvents()
+
+    def test_mostrar_preparacion_con_la_logica_en_cache(self):
+        self.interfaz.mostrar_preparacion(self.id_receta, 8)
+
+        vista = self.interfaz.navegador.dar_vista('preparacion')
+        self.assertEqual(self.interfaz.errores, [])
+        self.assertIsInstance(vista, VistaPreparacion)
+        self.assertTrue(vista.isVisible())
+        self.assertEqual(vista.windowTitle(), 'Recetario - Preparación receta  Arroz con leche')
+        self.assertEqual(self.interfaz.datos_preparacion['personas'], 8)
+
+    def test_mostrar_preparacion_receta_inexistente(self):
+        self.interfaz.mostrar_preparacion(self.id_receta + 1, 8)
+
+        self.assertEqual(self.interfaz.errores, ['La receta no existe'])
+        self.assertEqual(self.interfaz.listas_mostradas, 1)
+        self.assertEqual(self.interfaz.navegador.dar_vista('preparacion'), None)
+
+    def test_lista_ingredientes_por_paginas(self):
+        for i in range(120):
+            self.logica.crear_ingrediente('Ingrediente {:03d}'.format(i), 'libra', 1000, 'Plaza')
+
+        self.interfaz.mostrar_ingredientes()
+        self.esperar_consultas()
+        modelo = self.interfaz.navegador.dar_vista('lista_ingredientes').modelo_ingredientes
+
+        self.assertEqual(modelo.rowCount(), 100)
+        self.assertEqual(modelo.dar_fila(0)['nombre'], 'Arroz')
+        modelo.fetchMore(QModelIndex())
+        self.esperar_consultas()
+        self.assertEqual(modelo.rowCount(), 121)
+        self.assertFalse(modelo.canFetchMore(QModelIndex()))
@@ -15,3 +15,22 @@ class LogicaMockTestCase(unittest.TestCase):
         self.assertEqual(receta["nombre"], "Ajiaco")
 
 
+
+    def test_dar_lista_compras(self):
+        lista = self.logica.dar_lista_compras([(0, 12)])
+        self.assertEqual([sitio['sitio'] for sitio in lista['sitios']], ['Plaza Concordia'])
+        self.assertEqual(lista['total'], lista['sitios'][0]['subtotal'])
+
+    def test_escrituras_retornan_la_posicion_en_la_lista(self):
+        cambio = self.logica.crear_receta('Arepa', '00:20', 2, 150, 'Asar')
+        self.assertEqual(cambio['posicion'], 1)
+        self.assertEqual(self.logica.dar_recetas_pagina(10)[cambio['posicion']]['nombre'], 'Arepa')
+
+        cambio = self.logica.eliminar_receta(0)
+        self.assertEqual((cambio['receta']['nombre'], cambio['posicion_anterior'], cambio['posicion']), ('Ajiaco', 0, None))
+
+    def test_buscar_recetas_sin_tildes(self):
+        recetas = self.logica.buscar_recetas('MOZZARELLA berenjenas')
+        self.assertEqual([receta['nombre'] for receta in recetas], ['Berenjenas parmesanas'])
+        self.assertEqual(len(self.logica.buscar_recetas('cáscara')), 2)
+        self.assertEqual(self.logica.buscar_recetas(''), [])
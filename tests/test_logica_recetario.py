@@ -1,16 +1,26 @@
+import os
 import unittest
 
+# Las pruebas usan una base de datos en memoria y no la aplicacion.sqlite de la aplicación
+os.environ.setdefault('RECETARIO_DB_URL', 'sqlite://')
+
 from src.logica.logica_recetario import LogicaRecetario
 from src.modelo.ingrediente import Ingrediente
 from src.modelo.ingrediente_receta import IngredienteReceta
 from src.modelo.receta import Receta
-from src.modelo.declarative_base import Session
+from src.modelo.declarative_base import Session, crear_motor, engine
+from src.modelo.receta_costo import RecetaCosto, reconstruir_costos, verificar_costos
 from faker import Faker
 from faker_food import FoodProvider
 from faker.providers import company
-from sqlalchemy import asc, desc
+from sqlalchemy import asc, desc, event
 
+import csv
+import json
 import re
+import tempfile
+import threading
+from unittest import mock
 
 class LogicaRecetarioTestCase(unittest.TestCase):
 
@@ -192,6 +202,11 @@ class LogicaRecetarioTestCase(unittest.TestCase):
           valor = '12345'
           self.assertEqual(self.logica.crear_ingrediente('Arroz', 'libra' ,valor,''), False)
 
+     def test_crear_ingrediente_valor_decimal(self):
+          self.assertEqual(self.logica.validar_crear_editar_ingrediente('Arroz', 'libra', 2500.75, 'Plaza'), 'Valor incorrecto')
+          self.assertEqual(self.logica.validar_crear_editar_ingrediente('Arroz', 'libra', '2500.75', 'Plaza'), 'Valor incorrecto')
+          self.assertEqual(self.logica.validar_crear_editar_ingrediente('Arroz', 'libra', 2500.0, 'Plaza'), '')
+
      def test_crear_ingrediente_valor_mayor_cero(self):
           valor = 0
           self.assertEqual(self.logica.crear_ingrediente('Arroz', 'libra' ,valor,''), False)
@@ -216,10 +231,10 @@ class LogicaRecetarioTestCase(unittest.TestCase):
 
      def test_validar_crear_ingrediente_cuando_hay_ingredientes_igual_nombre_diferente_unidad(self):
           nombre = self.fake.unique.ingredient()
-          self.assertEqual(self.logica.crear_ingrediente(nombre, self.fake.unique.metric_measurement(), str(self.fake.random_int(100, 250000)), self.fake.company()), True)
+          self.assertIsInstance(self.logica.crear_ingrediente(nombre, self.fake.unique.metric_measurement(), str(self.fake.random_int(100, 250000)), self.fake.company()), dict)
           unidad =self.fake.unique.metric_measurement()
           self.assertEqual(self.logica.validar_crear_editar_ingrediente(nombre, unidad, str(self.fake.random_int(100, 250000)), self.fake.company()), '')
-          self.assertEqual(self.logica.crear_ingrediente(nombre, unidad, str(self.fake.random_int(100, 250000)), self.fake.company()), True)
+          self.assertIsInstance(self.logica.crear_ingrediente(nombre, unidad, str(self.fake.random_int(100, 250000)), self.fake.company()), dict)
     
      def test_validar_crear_ingrediente_cuando_hay_ingredientes_igual_nombre_igual_unidad(self):
           nombre = self.fake.unique.ingredient()
@@ -228,12 +243,12 @@ class LogicaRecetarioTestCase(unittest.TestCase):
           self.assertEqual(self.logica.validar_crear_editar_ingrediente(nombre, unidad, self.fake.random_int(100, 250000), self.fake.company()), 'Ingrediente ya existe')
 
      def test_crear_ingrediente_exitosamente(self):
-          self.assertEqual(self.logica.crear_ingrediente(self.fake.unique.ingredient(),self.fake.metric_measurement(),str(self.fake.random_int(100, 250000)), self.fake.company()), True)
+          self.assertIsInstance(self.logica.crear_ingrediente(self.fake.unique.ingredient(),self.fake.metric_measurement(),str(self.fake.random_int(100, 250000)), self.fake.company()), dict)
 
      def test_crear_ingrediente_fallido(self):
           nombre = self.fake.unique.ingredient()
           unidad = self.fake.metric_measurement()
-          self.assertEqual(self.logica.crear_ingrediente(nombre, unidad, str(self.fake.random_int(100, 250000)), self.fake.company()), True)
+          self.assertIsInstance(self.logica.crear_ingrediente(nombre, unidad, str(self.fake.random_int(100, 250000)), self.fake.company()), dict)
           self.assertEqual(self.logica.crear_ingrediente(nombre, unidad, str(self.fake.random_int(100, 250000)), self.fake.company()), False)
 
      def test_verificar_almacenamiento_crear_ingrediente(self):
@@ -345,13 +360,12 @@ class LogicaRecetarioTestCase(unittest.TestCase):
           self.assertEqual(self.logica.validar_crear_editar_receta(0, 'Ajiaco', '01:00:00', '1', '1', instrucciones ), "Instrucciones Receta Invalido")
 
      def test_crear_receta(self):
-        self.assertEqual(self.logica.crear_receta( self.fake.unique.dish(),str(self.fake.time_object())[0:8], self.fake.random_int(1,6), self.fake.random_int(100, 2500), self.fake.paragraph(nb_sentences=5, variable_nb_sentences=False)) , '')
+        self.assertIsInstance(self.logica.crear_receta( self.fake.unique.dish(),str(self.fake.time_object())[0:8], self.fake.random_int(1,6), self.fake.random_int(100, 2500), self.fake.paragraph(nb_sentences=5, variable_nb_sentences=False)), dict)
 
      def test_crear_receta_repetida(self):
         nombre= self.fake.unique.dish()
         self.logica.crear_receta(nombre,str(self.fake.time_object())[0:8], self.fake.random_int(1,6), self.fake.random_int(100, 2500), self.fake.paragraph(nb_sentences=5, variable_nb_sentences=False))
-        receta_id = self.session.query(Receta).filter(Receta.nombre == nombre).first().id
-        self.assertEqual(self.logica.validar_crear_editar_receta(receta_id, nombre,str(self.fake.time_object())[0:8], self.fake.random_int(1,6), self.fake.random_int(100, 2500), self.fake.paragraph(nb_sentences=5, variable_nb_sentences=False)), "Receta ya existe")
+        self.assertEqual(self.logica.validar_crear_editar_receta(-1, nombre,str(self.fake.time_object())[0:8], self.fake.random_int(1,6), self.fake.random_int(100, 2500), self.fake.paragraph(nb_sentences=5, variable_nb_sentences=False)), "Receta ya existe")
 
      def test_verificar_almacenamiento_crear_receta(self):
         nombre= self.fake.unique.dish()
@@ -406,7 +420,7 @@ class LogicaRecetarioTestCase(unittest.TestCase):
           self.session.add(ingrediente_receta)
           self.session.commit()
 
-          ingredientes_receta = self.logica.dar_ingredientes_receta(recetas_guardadas[0].id -1)
+          ingredientes_receta = self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)
 
           self.assertEqual(len(ingredientes_receta),1)
           
@@ -447,7 +461,7 @@ class LogicaRecetarioTestCase(unittest.TestCase):
           
           
 
-          ingredientes_receta = self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)
+          ingredientes_receta = self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)
 
           self.assertEqual(len(ingredientes_receta),10)
 
@@ -485,16 +499,16 @@ class LogicaRecetarioTestCase(unittest.TestCase):
           
           ingredientes_receta= sorted(ingredientes, key=lambda x: x.nombre)
 
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[0]['ingrediente'], ingredientes_receta[0].nombre)
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[1]['ingrediente'], ingredientes_receta[1].nombre)
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[2]['ingrediente'], ingredientes_receta[2].nombre)
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[3]['ingrediente'], ingredientes_receta[3].nombre)
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[4]['ingrediente'], ingredientes_receta[4].nombre)
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[5]['ingrediente'], ingredientes_receta[5].nombre)
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[6]['ingrediente'], ingredientes_receta[6].nombre)
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[7]['ingrediente'], ingredientes_receta[7].nombre)
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[8]['ingrediente'], ingredientes_receta[8].nombre)
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[9]['ingrediente'], ingredientes_receta[9].nombre)
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[0]['ingrediente'], ingredientes_receta[0].nombre)
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[1]['ingrediente'], ingredientes_receta[1].nombre)
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[2]['ingrediente'], ingredientes_receta[2].nombre)
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[3]['ingrediente'], ingredientes_receta[3].nombre)
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[4]['ingrediente'], ingredientes_receta[4].nombre)
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[5]['ingrediente'], ingredientes_receta[5].nombre)
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[6]['ingrediente'], ingredientes_receta[6].nombre)
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[7]['ingrediente'], ingredientes_receta[7].nombre)
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[8]['ingrediente'], ingredientes_receta[8].nombre)
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[9]['ingrediente'], ingredientes_receta[9].nombre)
      
      def test_verificar_lista_ingredientes_receta_varios_ingredientes_organizados_nombre_unidad(self):
           receta = Receta(nombre = self.fake.unique.dish(),
@@ -538,16 +552,16 @@ class LogicaRecetarioTestCase(unittest.TestCase):
           
           ingredientes_receta_ordenadas= sorted(ingredientes_recetas_guardadas, key=lambda x: (x['ingrediente'], x['cantidad']))
 
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[0]['cantidad'], ingredientes_receta_ordenadas[0]['cantidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[1]['cantidad'], ingredientes_receta_ordenadas[1]['cantidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[2]['cantidad'], ingredientes_receta_ordenadas[2]['cantidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[3]['cantidad'], ingredientes_receta_ordenadas[3]['cantidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[4]['cantidad'], ingredientes_receta_ordenadas[4]['cantidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[5]['cantidad'], ingredientes_receta_ordenadas[5]['cantidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[6]['cantidad'], ingredientes_receta_ordenadas[6]['cantidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[7]['cantidad'], ingredientes_receta_ordenadas[7]['cantidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[8]['cantidad'], ingredientes_receta_ordenadas[8]['cantidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[9]['cantidad'], ingredientes_receta_ordenadas[9]['cantidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[0]['cantidad'], ingredientes_receta_ordenadas[0]['cantidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[1]['cantidad'], ingredientes_receta_ordenadas[1]['cantidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[2]['cantidad'], ingredientes_receta_ordenadas[2]['cantidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[3]['cantidad'], ingredientes_receta_ordenadas[3]['cantidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[4]['cantidad'], ingredientes_receta_ordenadas[4]['cantidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[5]['cantidad'], ingredientes_receta_ordenadas[5]['cantidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[6]['cantidad'], ingredientes_receta_ordenadas[6]['cantidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[7]['cantidad'], ingredientes_receta_ordenadas[7]['cantidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[8]['cantidad'], ingredientes_receta_ordenadas[8]['cantidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[9]['cantidad'], ingredientes_receta_ordenadas[9]['cantidad'])
      
      def test_verificar_lista_ingredientes_receta_varios_ingredientes_organizados_nombre_unidad_cantidad(self):
           receta = Receta(nombre = self.fake.unique.dish(),
@@ -562,7 +576,7 @@ class LogicaRecetarioTestCase(unittest.TestCase):
           for i in range(0,10):
                ingrediente = Ingrediente(
                     nombre = 'Cebolla',
-                    unidadMedida = self.fake.metric_measurement(),
+                    unidadMedida = self.fake.metric_measurement() + ' ' + str(i),
                     sitioCompra =  self.fake.company(),
                     valorUnidad = self.fake.random_int(100, 250000)
                )
@@ -593,16 +607,16 @@ class LogicaRecetarioTestCase(unittest.TestCase):
           
           ingredientes_receta_ordenadas= sorted(ingredientes_recetas_guardadas, key=lambda x: (x['ingrediente'], x['unidad'], x['cantidad']))
 
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[0]['unidad'], ingredientes_receta_ordenadas[0]['unidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[1]['unidad'], ingredientes_receta_ordenadas[1]['unidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[2]['unidad'], ingredientes_receta_ordenadas[2]['unidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[3]['unidad'], ingredientes_receta_ordenadas[3]['unidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[4]['unidad'], ingredientes_receta_ordenadas[4]['unidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[5]['unidad'], ingredientes_receta_ordenadas[5]['unidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[6]['unidad'], ingredientes_receta_ordenadas[6]['unidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[7]['unidad'], ingredientes_receta_ordenadas[7]['unidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[8]['unidad'], ingredientes_receta_ordenadas[8]['unidad'])
-          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id - 1)[9]['unidad'], ingredientes_receta_ordenadas[9]['unidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[0]['unidad'], ingredientes_receta_ordenadas[0]['unidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[1]['unidad'], ingredientes_receta_ordenadas[1]['unidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[2]['unidad'], ingredientes_receta_ordenadas[2]['unidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[3]['unidad'], ingredientes_receta_ordenadas[3]['unidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[4]['unidad'], ingredientes_receta_ordenadas[4]['unidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[5]['unidad'], ingredientes_receta_ordenadas[5]['unidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[6]['unidad'], ingredientes_receta_ordenadas[6]['unidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[7]['unidad'], ingredientes_receta_ordenadas[7]['unidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[8]['unidad'], ingredientes_receta_ordenadas[8]['unidad'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas_guardadas[0].id)[9]['unidad'], ingredientes_receta_ordenadas[9]['unidad'])
 
 
      def test_dar_receta_id_invalido(self):
@@ -633,11 +647,34 @@ class LogicaRecetarioTestCase(unittest.TestCase):
                self.session.add(receta)
                self.session.commit()
           receta_mostrar = self.session.query(Receta).all()[8]
-          self.assertEqual(self.logica.dar_receta(8)['nombre'], receta_mostrar.nombre)
-          self.assertEqual(self.logica.dar_receta(8)['tiempo'], receta_mostrar.tiempoPreparacion)
-          self.assertEqual(self.logica.dar_receta(8)['personas'], receta_mostrar.personasBase)
-          self.assertEqual(self.logica.dar_receta(8)['calorias'], receta_mostrar.caloriasPorcion)
-          self.assertEqual(self.logica.dar_receta(8)['preparacion'], receta_mostrar.instrucciones)
+          self.assertEqual(self.logica.dar_receta(receta_mostrar.id)['nombre'], receta_mostrar.nombre)
+          self.assertEqual(self.logica.dar_receta(receta_mostrar.id)['tiempo'], receta_mostrar.tiempoPreparacion)
+          self.assertEqual(self.logica.dar_receta(receta_mostrar.id)['personas'], receta_mostrar.personasBase)
+          self.assertEqual(self.logica.dar_receta(receta_mostrar.id)['calorias'], receta_mostrar.caloriasPorcion)
+          self.assertEqual(self.logica.dar_receta(receta_mostrar.id)['preparacion'], receta_mostrar.instrucciones)
+
+     def test_dar_receta_id_despues_de_eliminar_recetas(self):
+          recetas = []
+          for i in range(0,5):
+               receta = Receta(
+                    nombre = self.fake.unique.dish(),
+                         tiempoPreparacion =str(self.fake.time_object())[0:8],
+                         personasBase = self.fake.random_int(1,6),
+                         caloriasPorcion = self.fake.random_int(100, 2500),
+                         instrucciones = self.fake.paragraph(nb_sentences=5, variable_nb_sentences=False)
+               )
+               self.session.add(receta)
+               recetas.append(receta)
+          self.session.commit()
+
+          self.session.delete(recetas[0])
+          self.session.delete(recetas[2])
+          self.session.commit()
+
+          self.assertEqual(self.logica.dar_receta(recetas[4].id)['nombre'], recetas[4].nombre)
+          self.assertEqual(self.logica.dar_receta(recetas[4].id)['id'], recetas[4].id)
+          ids_lista = [receta['id'] for receta in self.logica.dar_recetas()]
+          self.assertCountEqual(ids_lista, [recetas[1].id, recetas[3].id, recetas[4].id])
 
      def test_validar_crear_editar_ingrediente_receta_lista_ingrediente_vacia(self):
 
@@ -924,8 +961,819 @@ class LogicaRecetarioTestCase(unittest.TestCase):
                 }
                 )
           
-          self.assertEqual(self.logica.agregar_ingrediente_receta(receta_seleccionada, ingrediente_valido,150.0), True)
+          self.assertIsInstance(self.logica.agregar_ingrediente_receta(receta_seleccionada, ingrediente_valido,150.0), dict)
           
           ingredientes_receta = self.session.query(IngredienteReceta).filter(IngredienteReceta.cantidad == 150.0, IngredienteReceta.receta == 1).all()
 
-          self.assertEqual(len(ingredientes_receta), 1)
\ No newline at end of file
+          self.assertEqual(len(ingredientes_receta), 1)
+
+     def test_verificar_lista_ingredientes_receta_ids_ingredientes_no_consecutivos(self):
+          receta = Receta(nombre = self.fake.unique.dish(),
+                         tiempoPreparacion =str(self.fake.time_object())[0:8],
+                         personasBase = self.fake.random_int(1,6),
+                         caloriasPorcion = self.fake.random_int(100, 2500),
+                         instrucciones = self.fake.paragraph(nb_sentences=5, variable_nb_sentences=False)
+                         )
+          self.session.add(receta)
+
+          ingredientes = []
+          for i in range(0,5):
+               ingrediente = Ingrediente(
+                    nombre = self.fake.unique.ingredient(),
+                    unidadMedida = self.fake.metric_measurement(),
+                    sitioCompra =  self.fake.company(),
+                    valorUnidad = self.fake.random_int(100, 250000)
+               )
+               self.session.add(ingrediente)
+               ingredientes.append(ingrediente)
+          self.session.commit()
+
+          self.session.delete(ingredientes[1])
+          self.session.delete(ingredientes[2])
+          self.session.commit()
+
+          ingrediente_receta = IngredienteReceta(
+               cantidad=self.fake.random_int(1, 2000),
+               receta=receta.id,
+               ingrediente=ingredientes[4].id
+          )
+          self.session.add(ingrediente_receta)
+          self.session.commit()
+
+          ingredientes_receta = self.logica.dar_ingredientes_receta(receta.id)
+
+          self.assertEqual(len(ingredientes_receta), 1)
+          self.assertEqual(ingredientes_receta[0]['ingrediente'], ingredientes[4].nombre)
+          self.assertEqual(ingredientes_receta[0]['unidad'], ingredientes[4].unidadMedida)
+
+     def test_verificar_lista_ingredientes_receta_una_consulta_sin_importar_catalogo(self):
+          receta = Receta(nombre = self.fake.unique.dish(),
+                         tiempoPreparacion =str(self.fake.time_object())[0:8],
+                         personasBase = self.fake.random_int(1,6),
+                         caloriasPorcion = self.fake.random_int(100, 2500),
+                         instrucciones = self.fake.paragraph(nb_sentences=5, variable_nb_sentences=False)
+                         )
+          self.session.add(receta)
+          self.session.commit()
+          id_receta = receta.id
+
+          consultas = []
+
+          def contar_consultas(conn, cursor, statement, parameters, context, executemany):
+               consultas.append(statement)
+
+          consultas_por_catalogo = []
+          for tamano_catalogo in (10, 200):
+               for i in range(0, tamano_catalogo):
+                    ingrediente = Ingrediente(
+                         nombre = 'Ingrediente ' + str(tamano_catalogo) + '-' + str(i),
+                         unidadMedida = self.fake.metric_measurement(),
+                         sitioCompra =  self.fake.company(),
+                         valorUnidad = self.fake.random_int(100, 250000)
+                    )
+                    self.session.add(ingrediente)
+                    self.session.flush()
+                    self.session.add(IngredienteReceta(cantidad=i + 1, receta=id_receta, ingrediente=ingrediente.id))
+               self.session.commit()
+
+               consultas.clear()
+               event.listen(engine, 'before_cursor_execute', contar_consultas)
+               try:
+                    self.logica.dar_ingredientes_receta(id_receta)
+               finally:
+                    event.remove(engine, 'before_cursor_execute', contar_consultas)
+               consultas_por_catalogo.append(len([c for c in consultas if c.lstrip().upper().startswith('SELECT')]))
+
+          self.assertEqual(consultas_por_catalogo, [1, 1])
+
+     def test_dar_recetas_pagina_recorre_lista_ordenada(self):
+          for i in range(0,10):
+               receta = Receta(nombre = self.fake.unique.dish(),
+                         tiempoPreparacion =str(self.fake.time_object())[0:8],
+                         personasBase = self.fake.random_int(1,6),
+                         caloriasPorcion = self.fake.random_int(100, 2500),
+                         instrucciones = self.fake.paragraph(nb_sentences=5, variable_nb_sentences=False))
+               self.session.add(receta)
+          self.session.commit()
+
+          paginas = []
+          pagina = self.logica.dar_recetas_pagina(3)
+          while len(pagina) > 0:
+               self.assertLessEqual(len(pagina), 3)
+               paginas.append(pagina)
+               pagina = self.logica.dar_recetas_pagina(3, pagina[-1])
+
+          self.assertEqual(len(paginas), 4)
+          self.assertEqual([receta for pagina in paginas for receta in pagina], self.logica.dar_recetas())
+
+     def test_dar_ingredientes_pagina_recorre_lista_ordenada(self):
+          for i in range(0,10):
+               ingrediente = Ingrediente(
+                    nombre = self.fake.unique.ingredient(),
+                    unidadMedida = self.fake.metric_measurement(),
+                    sitioCompra =  self.fake.company(),
+                    valorUnidad = self.fake.random_int(100, 250000)
+               )
+               self.session.add(ingrediente)
+          self.session.commit()
+
+          paginas = []
+          pagina = self.logica.dar_ingredientes_pagina(4)
+          while len(pagina) > 0:
+               self.assertLessEqual(len(pagina), 4)
+               paginas.append(pagina)
+               pagina = self.logica.dar_ingredientes_pagina(4, pagina[-1])
+
+          self.assertEqual(len(paginas), 3)
+          self.assertEqual([ingrediente for pagina in paginas for ingrediente in pagina], self.logica.dar_ingredientes())
+
+     def test_crear_ingrediente_repetido_despues_de_validar(self):
+          nombre = self.fake.unique.ingredient()
+          unidad = self.fake.metric_measurement()
+          self.assertIsInstance(self.logica.crear_ingrediente(nombre, unidad, str(self.fake.random_int(100, 250000)), self.fake.company()), dict)
+
+          # Simula que otro proceso creó el ingrediente entre la validación y la inserción
+          self.logica.validar_crear_editar_ingrediente = lambda nombre, unidad, valor, sitioCompra: ''
+          self.assertEqual(self.logica.crear_ingrediente(nombre, unidad, str(self.fake.random_int(100, 250000)), self.fake.company()), False)
+
+          self.assertEqual(self.session.query(Ingrediente).filter(Ingrediente.nombre == nombre).count(), 1)
+          self.assertEqual(len(self.logica.dar_ingredientes()), 1)
+
+     def test_importar_ingredientes_csv(self):
+          self.logica.crear_ingrediente('Papa criolla', 'libra', '4090', 'Plaza Concordia')
+
+          with tempfile.TemporaryDirectory() as directorio:
+               ruta = os.path.join(directorio, 'ingredientes.csv')
+               with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+                    archivo.write('nombre,unidad,valor,sitioCompra\n')
+                    archivo.write('Tomate chonto,libra,5000,Fruver El mejor\n')
+                    archivo.write('Cebolla larga,libra,cero,Fruver El mejor\n')
+                    archivo.write('Papa criolla,libra,4100,Plaza Concordia\n')
+                    archivo.write('Tomate chonto,libra,5200,Plaza Concordia\n')
+                    archivo.write('Aguacate,unidad,5000,Plaza Concordia\n')
+
+               reporte = self.logica.importar_ingredientes(ruta, tamano_lote=2)
+
+          self.assertEqual(reporte['importados'], 2)
+          # Los números de fila son líneas del archivo: el encabezado es la línea 1
+          self.assertEqual(reporte['errores'], [
+               {'fila': 3, 'error': 'Valor incorrecto'},
+               {'fila': 4, 'error': 'Ingrediente ya existe'},
+               {'fila': 5, 'error': 'Ingrediente ya existe'}
+          ])
+          nombres = [ingrediente['nombre'] for ingrediente in self.logica.dar_ingredientes()]
+          self.assertEqual(nombres, ['Aguacate', 'Papa criolla', 'Tomate chonto'])
+          tomate = self.session.query(Ingrediente).filter(Ingrediente.nombre == 'Tomate chonto').one()
+          self.assertEqual(tomate.valorUnidad, 5000)
+
+     def test_importar_ingredientes_json_lines(self):
+          with tempfile.TemporaryDirectory() as directorio:
+               ruta = os.path.join(directorio, 'ingredientes.jsonl')
+               with open(ruta, 'w', encoding='utf-8') as archivo:
+                    archivo.write(json.dumps({'nombre': 'Berenjenas', 'unidad': 'libra', 'valor': 3800, 'sitioCompra': 'Plaza Concordia'}) + '\n')
+                    archivo.write('{"nombre": "Arroz", \n')
+                    archivo.write('\n')
+                    archivo.write(json.dumps({'nombre': 'Arroz', 'unidad': 'libra', 'valor': 2500}) + '\n')
+                    archivo.write(json.dumps({'nombre': 'Lentejas', 'unidad': 'libra', 'valor': 2500.75, 'sitioCompra': 'Plaza Concordia'}) + '\n')
+
+               reporte = self.logica.importar_ingredientes(ruta)
+
+          # La línea en blanco también cuenta: el error de Arroz es de la línea 4
+          self.assertEqual(reporte['importados'], 1)
+          self.assertEqual(reporte['errores'], [
+               {'fila': 2, 'error': 'Formato de fila incorrecto'},
+               {'fila': 4, 'error': 'Sitio de compra incorrecto'},
+               {'fila': 5, 'error': 'Valor incorrecto'}
+          ])
+          self.assertEqual(self.session.query(Ingrediente).count(), 1)
+
+     def test_importar_recetas_json_lines(self):
+          self.logica.crear_ingrediente('Papa criolla', 'libra', '4090', 'Plaza Concordia')
+          self.logica.crear_ingrediente('Aguacate', 'unidad', '5000', 'Plaza Concordia')
+          self.logica.crear_receta('Sancocho', '02:00:00', 8, 400, 'Hervir')
+
+          ajiaco = {'nombre': 'Ajiaco', 'tiempo': '01:00:00', 'personas': 6, 'calorias': 200, 'preparacion': 'Hervir',
+                    'ingredientes': [{'nombre': 'Papa criolla', 'unidad': 'libra', 'cantidad': 2},
+                                     {'nombre': 'Aguacate', 'unidad': 'unidad', 'cantidad': 1}]}
+          with tempfile.TemporaryDirectory() as directorio:
+               ruta = os.path.join(directorio, 'recetas.jsonl')
+               with open(ruta, 'w', encoding='utf-8') as archivo:
+                    archivo.write(json.dumps(ajiaco) + '\n')
+                    archivo.write(json.dumps(dict(ajiaco, nombre='Sancocho')) + '\n')
+                    archivo.write(json.dumps(dict(ajiaco, nombre='Tamal', tiempo='1 hora')) + '\n')
+                    archivo.write(json.dumps(dict(ajiaco, nombre='Arepa', ingredientes=[{'nombre': 'Maiz', 'unidad': 'libra', 'cantidad': 1}])) + '\n')
+                    archivo.write(json.dumps(dict(ajiaco, nombre='Guacamole', ingredientes=[{'nombre': 'Aguacate', 'unidad': 'unidad', 'cantidad': 0}])) + '\n')
+                    archivo.write(json.dumps(ajiaco) + '\n')
+                    archivo.write(json.dumps(dict(ajiaco, nombre='Puré', ingredientes=[{'nombre': 'Papa criolla', 'unidad': 'libra', 'cantidad': 3}])) + '\n')
+
+               reporte = self.logica.importar_recetas(ruta, tamano_lote=3)
+
+          self.assertEqual(reporte['importados'], 2)
+          self.assertEqual(reporte['errores'], [
+               {'fila': 2, 'error': 'Receta ya existe'},
+               {'fila': 3, 'error': 'Tiempo Preparacion Invalido'},
+               {'fila': 4, 'error': 'Ingrediente Invalido'},
+               {'fila': 5, 'error': 'Cantidad invalido'},
+               {'fila': 6, 'error': 'Receta ya existe'}
+          ])
+
+          recetas = {receta['nombre']: receta for receta in self.logica.dar_recetas()}
+          self.assertEqual(sorted(recetas), ['Ajiaco', 'Puré', 'Sancocho'])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas['Ajiaco']['id']), [
+               {'ingrediente': 'Aguacate', 'unidad': 'unidad', 'cantidad': 1.0},
+               {'ingrediente': 'Papa criolla', 'unidad': 'libra', 'cantidad': 2.0}
+          ])
+          self.assertEqual(self.logica.dar_ingredientes_receta(recetas['Puré']['id']), [
+               {'ingrediente': 'Papa criolla', 'unidad': 'libra', 'cantidad': 3.0}
+          ])
+          self.assertEqual(self.logica.dar_receta(recetas['Puré']['id'])['personas'], 6)
+
+     def test_importar_recetas_ingrediente_con_nombre_no_texto(self):
+          self.logica.crear_ingrediente('Papa criolla', 'libra', '4090', 'Plaza Concordia')
+
+          with tempfile.TemporaryDirectory() as directorio:
+               ruta = os.path.join(directorio, 'recetas.jsonl')
+               with open(ruta, 'w', encoding='utf-8') as archivo:
+                    receta = {'nombre': 'X', 'tiempo': '01:00:00', 'personas': 2, 'calorias': 200, 'preparacion': 'Hervir'}
+                    archivo.write(json.dumps(dict(receta, ingredientes=[{'nombre': ['a'], 'unidad': 'libra', 'cantidad': 1}])) + '\n')
+                    archivo.write(json.dumps(dict(receta, nombre='Y', ingredientes=[{'nombre': 'Papa criolla', 'unidad': 'libra', 'cantidad': 1}])) + '\n')
+                    archivo.write(json.dumps(dict(receta, nombre='Z', ingredientes=[{'nombre': 'Papa criolla', 'unidad': {}, 'cantidad': 1}])) + '\n')
+
+               reporte = self.logica.importar_recetas(ruta)
+
+          self.assertEqual(reporte['importados'], 1)
+          self.assertEqual(reporte['errores'], [
+               {'fila': 1, 'error': 'Ingrediente Invalido'},
+               {'fila': 3, 'error': 'Ingrediente Invalido'}
+          ])
+          self.assertEqual([receta['nombre'] for receta in self.logica.dar_recetas()], ['Y'])
+
+     def test_exportar_recetario_json_lines_e_importar(self):
+          self.logica.crear_ingrediente('Papa criolla', 'libra', '4090', 'Plaza Concordia')
+          self.logica.crear_ingrediente('Aguacate', 'unidad', '5000', 'Plaza Concordia')
+          self.logica.crear_receta('Ajiaco', '01:00:00', 6, 200, 'Hervir')
+          self.logica.crear_receta('Arepa', '00:20:00', 2, 150, 'Asar')
+          id_ajiaco = self.session.query(Receta).filter(Receta.nombre == 'Ajiaco').one().id
+          ingredientes = self.logica.dar_ingredientes()
+          self.logica.agregar_ingrediente_receta(self.logica.dar_receta(id_ajiaco), ingredientes[0], 1)
+          self.logica.agregar_ingrediente_receta(self.logica.dar_receta(id_ajiaco), ingredientes[1], 2)
+
+          with tempfile.TemporaryDirectory() as directorio:
+               cantidades = self.logica.exportar_recetario(directorio)
+               self.assertEqual(cantidades, {'ingredientes': 2, 'recetas': 2})
+
+               with open(os.path.join(directorio, 'recetas.jsonl'), encoding='utf-8') as archivo:
+                    recetas = [json.loads(linea) for linea in archivo]
+               self.assertEqual(recetas[0]['nombre'], 'Ajiaco')
+               self.assertEqual(recetas[0]['ingredientes'], [
+                    {'nombre': 'Aguacate', 'unidad': 'unidad', 'cantidad': 1.0},
+                    {'nombre': 'Papa criolla', 'unidad': 'libra', 'cantidad': 2.0}
+               ])
+               self.assertEqual(recetas[1]['ingredientes'], [])
+
+               # Se importa en una base de datos nueva en memoria, sin tocar la de las pruebas
+               logica_importacion = LogicaRecetario(crear_motor(url='sqlite://'))
+               self.assertEqual(logica_importacion.importar_ingredientes(os.path.join(directorio, 'ingredientes.jsonl'))['importados'], 2)
+               self.assertEqual(logica_importacion.importar_recetas(os.path.join(directorio, 'recetas.jsonl'))['importados'], 2)
+
+          recetas = {receta['nombre']: receta['id'] for receta in logica_importacion.dar_recetas()}
+          self.assertEqual(sorted(recetas), ['Ajiaco', 'Arepa'])
+          self.assertEqual(logica_importacion.dar_ingredientes_receta(recetas['Ajiaco']), [
+               {'ingrediente': 'Aguacate', 'unidad': 'unidad', 'cantidad': 1.0},
+               {'ingrediente': 'Papa criolla', 'unidad': 'libra', 'cantidad': 2.0}
+          ])
+
+     def test_exportar_recetario_csv(self):
+          self.logica.crear_ingrediente('Papa criolla', 'libra', '4090', 'Plaza Concordia')
+          self.logica.crear_receta('Ajiaco', '01:00:00', 6, 200, 'Hervir')
+          id_ajiaco = self.session.query(Receta).filter(Receta.nombre == 'Ajiaco').one().id
+          self.logica.agregar_ingrediente_receta(self.logica.dar_receta(id_ajiaco), self.logica.dar_ingredientes()[0], 3)
+
+          with tempfile.TemporaryDirectory() as directorio:
+               cantidades = self.logica.exportar_recetario(directorio, 'csv')
+               self.assertEqual(cantidades, {'ingredientes': 1, 'recetas': 1, 'ingredientes_receta': 1})
+
+               with open(os.path.join(directorio, 'ingredientes_receta.csv'), encoding='utf-8', newline='') as archivo:
+                    filas = list(csv.DictReader(archivo))
+          self.assertEqual(filas, [{'receta': 'Ajiaco', 'ingrediente': 'Papa criolla', 'unidad': 'libra', 'cantidad': '3.0'}])
+
+     def crear_receta_para_preparar(self):
+          self.logica.crear_ingrediente('Papa criolla', 'libra', '1000', 'Plaza Concordia')
+          self.logica.crear_ingrediente('Aguacate', 'unidad', '5000', 'Plaza Concordia')
+          self.logica.crear_receta('Ajiaco', '01:00:00', 4, 200, 'Hervir')
+          id_receta = self.session.query(Receta).filter(Receta.nombre == 'Ajiaco').one().id
+          aguacate, papa = self.logica.dar_ingredientes()
+          self.logica.agregar_ingrediente_receta(self.logica.dar_receta(id_receta), papa, 2)
+          self.logica.agregar_ingrediente_receta(self.logica.dar_receta(id_receta), aguacate, 1)
+          return id_receta
+
+     def test_dar_preparacion(self):
+          id_receta = self.crear_receta_para_preparar()
+
+          preparacion = self.logica.dar_preparacion(id_receta, 8)
+
+          self.assertEqual(preparacion['receta'], 'Ajiaco')
+          self.assertEqual(preparacion['personas'], 8)
+          self.assertEqual(preparacion['calorias'], 200)
+          self.assertEqual(preparacion['calorias_totales'], 1600)
+          self.assertEqual(preparacion['costo'], 14000)
+          self.assertEqual(preparacion['tiempo_preparacion'], '2:00:00')
+          self.assertEqual(preparacion['datos_ingredientes'], [
+               {'nombre': 'Aguacate', 'unidad': 'unidad', 'cantidad': 2.0, 'valor': 10000.0},
+               {'nombre': 'Papa criolla', 'unidad': 'libra', 'cantidad': 4.0, 'valor': 4000.0}
+          ])
+
+     def test_dar_preparacion_varios_escenarios(self):
+          id_receta = self.crear_receta_para_preparar()
+
+          escenarios = self.logica.dar_preparacion(id_receta, [2, 6, 200])
+
+          self.assertEqual([escenario['personas'] for escenario in escenarios], [2, 6, 200])
+          self.assertEqual([escenario['costo'] for escenario in escenarios], [3500, 10500, 350000])
+          self.assertEqual([escenario['tiempo_preparacion'] for escenario in escenarios], ['0:30:00', '1:30:00', '50:00:00'])
+          self.assertEqual(escenarios[1], self.logica.dar_preparacion(id_receta, 6))
+
+     def test_dar_preparacion_receta_sin_ingredientes(self):
+          self.logica.crear_receta('Agua de panela', '00:10:00', 3, 100, 'Hervir')
+          id_receta = self.session.query(Receta).filter(Receta.nombre == 'Agua de panela').one().id
+
+          preparacion = self.logica.dar_preparacion(id_receta, 7)
+
+          self.assertEqual(preparacion['costo'], 0)
+          self.assertEqual(preparacion['tiempo_preparacion'], '0:23:20')
+          self.assertEqual(preparacion['datos_ingredientes'], [])
+
+     def test_dar_preparacion_receta_no_existe(self):
+          self.assertEqual(self.logica.dar_preparacion(999999, 4), False)
+
+     def test_dar_preparacion_receta_sin_personas_base(self):
+          id_ajiaco = self.crear_receta_para_preparar()
+          receta = Receta(nombre='Tamal', tiempoPreparacion='01:00:00', personasBase=0, caloriasPorcion=300, instrucciones='Envolver')
+          self.session.add(receta)
+          self.session.commit()
+
+          self.assertEqual(self.logica.dar_preparacion(receta.id, 4), 'Numero de Personas Invalido')
+          preparaciones = self.logica.dar_preparaciones([(receta.id, 4), (id_ajiaco, 4)])
+          self.assertEqual(preparaciones[0], 'Numero de Personas Invalido')
+          self.assertEqual(preparaciones[1]['costo'], 7000)
+
+     def test_dar_preparacion_cantidad_personas_invalida(self):
+          id_ajiaco = self.crear_receta_para_preparar()
+
+          self.assertEqual(self.logica.dar_preparacion(id_ajiaco, '8'), 'Numero de Personas Invalido')
+          self.assertEqual(self.logica.dar_preparacion(id_ajiaco, 0), 'Numero de Personas Invalido')
+          self.assertEqual(self.logica.dar_preparacion(id_ajiaco, -3), 'Numero de Personas Invalido')
+          self.assertEqual(self.logica.dar_preparacion(id_ajiaco, 2.5), 'Numero de Personas Invalido')
+          self.assertEqual(self.logica.dar_preparacion(999999, -3), False)
+          preparaciones = self.logica.dar_preparaciones([(id_ajiaco, '8'), (id_ajiaco, 4), (id_ajiaco, -3)])
+          self.assertEqual(preparaciones[0], 'Numero de Personas Invalido')
+          self.assertEqual(preparaciones[1]['costo'], 7000)
+          self.assertEqual(preparaciones[2], 'Numero de Personas Invalido')
+
+     def test_dar_preparaciones_varias_recetas(self):
+          id_ajiaco = self.crear_receta_para_preparar()
+          self.logica.crear_receta('Agua de panela', '00:10:00', 3, 100, 'Hervir')
+          id_agua = self.session.query(Receta).filter(Receta.nombre == 'Agua de panela').one().id
+
+          preparaciones = self.logica.dar_preparaciones([(id_agua, 6), (id_ajiaco, 8), (999999, 2), (id_ajiaco, 2)])
+
+          self.assertEqual(len(preparaciones), 4)
+          self.assertEqual(preparaciones[0], self.logica.dar_preparacion(id_agua, 6))
+          self.assertEqual(preparaciones[1], self.logica.dar_preparacion(id_ajiaco, 8))
+          self.assertEqual(preparaciones[2], False)
+          self.assertEqual(preparaciones[3]['costo'], 3500)
+          self.assertEqual(preparaciones[3]['datos_ingredientes'], [
+               {'nombre': 'Aguacate', 'unidad': 'unidad', 'cantidad': 0.5, 'valor': 2500.0},
+               {'nombre': 'Papa criolla', 'unidad': 'libra', 'cantidad': 1.0, 'valor': 1000.0}
+          ])
+
+     def test_dar_preparaciones_una_consulta(self):
+          id_ajiaco = self.crear_receta_para_preparar()
+          consultas = []
+
+          def registrar(conexion, cursor, sentencia, parametros, contexto, executemany):
+               consultas.append(sentencia)
+
+          event.listen(engine, 'before_cursor_execute', registrar)
+          try:
+               self.logica.dar_preparaciones([(id_ajiaco, personas) for personas in range(1, 50)])
+          finally:
+               event.remove(engine, 'before_cursor_execute', registrar)
+          self.assertEqual(len([sentencia for sentencia in consultas if sentencia.startswith('SELECT')]), 1)
+
+     def test_dar_preparaciones_vacia(self):
+          self.assertEqual(self.logica.dar_preparaciones([]), [])
+
+     def dar_costo_guardado(self, id_receta):
+          return Session().query(RecetaCosto.costo).filter(RecetaCosto.receta == id_receta).scalar()
+
+     def test_costo_receta_se_mantiene_al_agregar_ingredientes(self):
+          id_receta = self.crear_receta_para_preparar()
+
+          self.assertEqual(self.dar_costo_guardado(id_receta), 7000)
+
+     def test_costo_receta_se_mantiene_al_cambiar_valor_ingrediente(self):
+          id_receta = self.crear_receta_para_preparar()
+
+          papa = self.session.query(Ingrediente).filter(Ingrediente.nombre == 'Papa criolla').one()
+          papa.valorUnidad = 1500
+          self.session.commit()
+
+          self.assertEqual(self.dar_costo_guardado(id_receta), 8000)
+
+     def test_costo_receta_se_mantiene_al_editar_y_eliminar_lineas(self):
+          id_receta = self.crear_receta_para_preparar()
+          lineas = self.session.query(IngredienteReceta).filter(IngredienteReceta.receta == id_receta).all()
+          linea_papa = [linea for linea in lineas if linea.cantidad == 2][0]
+
+          linea_papa.cantidad = 5
+          self.session.commit()
+          self.assertEqual(self.dar_costo_guardado(id_receta), 10000)
+
+          self.session.delete(linea_papa)
+          self.session.commit()
+          self.assertEqual(self.dar_costo_guardado(id_receta), 5000)
+
+     def test_costo_receta_se_elimina_con_la_receta(self):
+          id_receta = self.crear_receta_para_preparar()
+
+          self.session.delete(self.session.query(Receta).get(id_receta))
+          self.session.commit()
+
+          self.assertEqual(self.dar_costo_guardado(id_receta), None)
+
+     def test_dar_recetas_por_costo(self):
+          id_ajiaco = self.crear_receta_para_preparar()
+          self.logica.crear_receta('Agua de panela', '00:10:00', 3, 100, 'Hervir')
+
+          recetas = self.logica.dar_recetas_por_costo()
+          self.assertEqual([(receta['nombre'], receta['costo']) for receta in recetas],
+                           [('Agua de panela', 0), ('Ajiaco', 7000)])
+          self.assertEqual([receta['nombre'] for receta in self.logica.dar_recetas_por_costo(descendente=True)],
+                           ['Ajiaco', 'Agua de panela'])
+          self.assertEqual([receta['id'] for receta in self.logica.dar_recetas_por_costo(costo_minimo=1)], [id_ajiaco])
+          self.assertEqual(self.logica.dar_recetas_por_costo(costo_maximo=6999)[0]['nombre'], 'Agua de panela')
+
+     def test_verificar_y_reconstruir_costos(self):
+          id_receta = self.crear_receta_para_preparar()
+          with engine.begin() as conexion:
+               conexion.execute('UPDATE receta_costo SET costo = 1 WHERE receta = ?', id_receta)
+               self.assertEqual(verificar_costos(conexion), [
+                    {'receta': id_receta, 'costo_guardado': 1, 'costo_calculado': 7000}
+               ])
+
+               reconstruir_costos(conexion)
+               self.assertEqual(verificar_costos(conexion), [])
+          self.assertEqual(self.dar_costo_guardado(id_receta), 7000)
+
+     def test_dar_lista_compras(self):
+          id_ajiaco = self.crear_receta_para_preparar()
+          self.logica.crear_ingrediente('Panela', 'libra', '3000', 'Tienda')
+          self.logica.crear_receta('Agua de panela', '00:10:00', 2, 100, 'Hervir')
+          id_agua = self.session.query(Receta).filter(Receta.nombre == 'Agua de panela').one().id
+          panela = [ingrediente for ingrediente in self.logica.dar_ingredientes() if ingrediente['nombre'] == 'Panela'][0]
+          self.logica.agregar_ingrediente_receta(self.logica.dar_receta(id_agua), panela, 1)
+
+          lista = self.logica.dar_lista_compras([(id_ajiaco, 8), (id_agua, 3), (id_ajiaco, 4)])
+
+          self.assertEqual(lista, {
+               'sitios': [
+                    {'sitio': 'Plaza Concordia', 'subtotal': 21000, 'ingredientes': [
+                         {'nombre': 'Aguacate', 'unidad': 'unidad', 'cantidad': 3.0, 'valor': 15000.0},
+                         {'nombre': 'Papa criolla', 'unidad': 'libra', 'cantidad': 6.0, 'valor': 6000.0}
+                    ]},
+                    {'sitio': 'Tienda', 'subtotal': 4500, 'ingredientes': [
+                         {'nombre': 'Panela', 'unidad': 'libra', 'cantidad': 1.5, 'valor': 4500.0}
+                    ]}
+               ],
+               'total': 25500
+          })
+
+     def test_dar_lista_compras_suma_ingrediente_de_varias_recetas(self):
+          id_ajiaco = self.crear_receta_para_preparar()
+          self.logica.crear_receta('Sopa de papa', '00:40:00', 2, 150, 'Hervir')
+          id_sopa = self.session.query(Receta).filter(Receta.nombre == 'Sopa de papa').one().id
+          papa = [ingrediente for ingrediente in self.logica.dar_ingredientes() if ingrediente['nombre'] == 'Papa criolla'][0]
+          self.logica.agregar_ingrediente_receta(self.logica.dar_receta(id_sopa), papa, 3)
+
+          lista = self.logica.dar_lista_compras([(id_ajiaco, 4), (id_sopa, 4), (999999, 10)])
+
+          self.assertEqual(lista['sitios'][0]['ingredientes'][1], {'nombre': 'Papa criolla', 'unidad': 'libra', 'cantidad': 8.0, 'valor': 8000.0})
+          self.assertEqual(lista['total'], 13000)
+
+     def test_dar_lista_compras_omite_recetas_sin_personas_base(self):
+          id_ajiaco = self.crear_receta_para_preparar()
+          papa = [ingrediente for ingrediente in self.logica.dar_ingredientes() if ingrediente['nombre'] == 'Papa criolla'][0]
+          recetas = [Receta(nombre='Tamal', tiempoPreparacion='01:00:00', personasBase=0, caloriasPorcion=300, instrucciones='Envolver'),
+                     Receta(nombre='Arepa', tiempoPreparacion='00:20:00', personasBase=None, caloriasPorcion=150, instrucciones='Asar')]
+          self.session.add_all(recetas)
+          self.session.commit()
+          for receta in recetas:
+               self.logica.agregar_ingrediente_receta({'id': receta.id}, papa['id'], 5)
+
+          lista = self.logica.dar_lista_compras([(id_ajiaco, 4)] + [(receta.id, 4) for receta in recetas])
+
+          self.assertEqual(lista, self.logica.dar_lista_compras([(id_ajiaco, 4)]))
+          self.assertEqual(lista['total'], 7000)
+
+     def test_dar_lista_compras_vacia(self):
+          self.assertEqual(self.logica.dar_lista_compras([]), {'sitios': [], 'total': 0})
+
+     def test_dar_lista_compras_personas_invalidas(self):
+          id_ajiaco = self.crear_receta_para_preparar()
+
+          self.assertEqual(self.logica.dar_lista_compras([(id_ajiaco, 4), (id_ajiaco, 'cuatro')]), 'Numero de Personas Invalido')
+          self.assertEqual(self.logica.dar_lista_compras([(id_ajiaco, None)]), 'Numero de Personas Invalido')
+          self.assertEqual(self.logica.dar_lista_compras([(id_ajiaco, -2)]), 'Numero de Personas Invalido')
+          self.assertEqual(self.logica.dar_lista_compras([(id_ajiaco, 4)])['total'], 7000)
+
+     def test_unidad_de_trabajo_cierra_la_sesion(self):
+          self.logica.crear_receta('Ajiaco', '01:00:00', 4, 200, 'Hervir')
+          self.logica.dar_recetas()
+
+          self.assertEqual(getattr(self.logica.estado_hilo, 'session', None), None)
+          with self.assertRaises(RuntimeError):
+               self.logica.session
+
+     def test_unidad_de_trabajo_revierte_si_hay_error(self):
+          with self.assertRaises(ValueError):
+               with self.logica.unidad_de_trabajo() as session:
+                    session.add(Receta(nombre='Ajiaco', tiempoPreparacion='01:00:00', personasBase=4,
+                                       caloriasPorcion=200, instrucciones='Hervir'))
+                    session.flush()
+                    raise ValueError()
+
+          self.assertEqual(self.logica.dar_recetas(), [])
+
+     def test_unidad_de_trabajo_anidada_usa_la_misma_sesion(self):
+          with self.logica.unidad_de_trabajo() as externa:
+               with self.logica.unidad_de_trabajo() as interna:
+                    self.assertIs(interna, externa)
+               self.assertIs(self.logica.session, externa)
+               self.logica.dar_recetas()
+               self.assertIs(self.logica.session, externa)
+
+     def test_unidad_de_trabajo_una_sesion_por_hilo(self):
+          sesiones = []
+
+          def consultar():
+               with self.logica.unidad_de_trabajo() as session:
+                    sesiones.append(session)
+                    self.logica.dar_recetas()
+
+          with self.logica.unidad_de_trabajo() as session:
+               hilo = threading.Thread(target=consultar)
+               hilo.start()
+               hilo.join()
+               self.assertIsNot(sesiones[0], session)
+
+     def test_sesion_por_hilo_con_scoped_session(self):
+          logica = LogicaRecetario(sesion_por_hilo=True)
+          logica.crear_receta('Ajiaco', '01:00:00', 4, 200, 'Hervir')
+
+          with logica.unidad_de_trabajo() as session:
+               self.assertIs(session, logica.fabrica_sesiones())
+          self.assertEqual(logica.fabrica_sesiones.registry.has(), False)
+          self.assertEqual(len(logica.dar_recetas()), 1)
+
+     def test_contador_cambios_aumenta_solo_con_escrituras(self):
+          inicial = self.logica.dar_contador_cambios()
+          self.logica.dar_recetas()
+          self.logica.dar_ingredientes()
+          self.assertEqual(self.logica.dar_contador_cambios(), inicial)
+
+          self.logica.crear_ingrediente('Papa', 'libra', 1000, 'Plaza')
+          self.assertEqual(self.logica.dar_contador_cambios(), inicial + 1)
+
+          '''Los cambios hechos por fuera de la lógica sobre el mismo motor también se cuentan'''
+          self.session.add(Receta(nombre='Ajiaco', tiempoPreparacion='01:00:00', personasBase=4,
+                                  caloriasPorcion=200, instrucciones='Hervir'))
+          self.session.commit()
+          self.assertEqual(self.logica.dar_contador_cambios(), inicial + 2)
+
+     def test_contador_cambios_no_cuenta_escrituras_revertidas(self):
+          inicial = self.logica.dar_contador_cambios()
+          with self.assertRaises(ZeroDivisionError):
+               with self.logica.unidad_de_trabajo() as session:
+                    session.add(Receta(nombre='Ajiaco', tiempoPreparacion='01:00:00', personasBase=4,
+                                       caloriasPorcion=200, instrucciones='Hervir'))
+                    session.flush()
+                    1 / 0
+          self.assertEqual(self.logica.dar_contador_cambios(), inicial)
+
+     def test_escrituras_de_ingredientes_retornan_el_cambio_con_su_posicion(self):
+          for nombre in ['Papa', 'Arroz', 'Tomate']:
+               self.logica.crear_ingrediente(nombre, 'libra', 1000, 'Plaza')
+
+          cambio = self.logica.crear_ingrediente('Cebolla', 'libra', 2000, 'Plaza')
+          self.assertEqual(cambio['posicion_anterior'], None)
+          self.assertEqual(self.logica.dar_ingredientes()[cambio['posicion']], cambio['ingrediente'])
+
+          cambio = self.logica.editar_ingrediente(cambio['ingrediente']['id'], 'Zanahoria', 'libra', 3000, 'Fruver')
+          self.assertEqual((cambio['posicion_anterior'], cambio['posicion']), (1, 3))
+          self.assertEqual(self.logica.dar_ingredientes()[3], cambio['ingrediente'])
+
+          cambio = self.logica.eliminar_ingrediente(cambio['ingrediente']['id'])
+          self.assertEqual((cambio['posicion_anterior'], cambio['posicion']), (3, None))
+          self.assertEqual([ingrediente['nombre'] for ingrediente in self.logica.dar_ingredientes()], ['Arroz', 'Papa', 'Tomate'])
+          self.assertEqual(self.logica.eliminar_ingrediente(cambio['ingrediente']['id']), False)
+
+     def test_escrituras_de_recetas_retornan_el_cambio_con_su_posicion(self):
+          self.logica.crear_receta('Ajiaco', '01:00:00', 4, 200, 'Hervir')
+          cambio = self.logica.crear_receta('Sancocho', '02:00:00', 8, 400, 'Hervir')
+          self.assertEqual(cambio['posicion'], 1)
+
+          cambio = self.logica.editar_receta(cambio['receta']['id'], 'Aborrajado', '00:20:00', 2, 150, 'Asar')
+          self.assertEqual((cambio['posicion_anterior'], cambio['posicion']), (1, 0))
+          self.assertEqual(self.logica.dar_recetas()[0], cambio['receta'])
+
+          cambio = self.logica.eliminar_receta(cambio['receta']['id'])
+          self.assertEqual((cambio['receta']['nombre'], cambio['posicion_anterior']), ('Aborrajado', 0))
+          self.assertEqual([receta['nombre'] for receta in self.logica.dar_recetas()], ['Ajiaco'])
+
+     def test_buscar_recetas_por_nombre_e_instrucciones(self):
+          self.logica.crear_receta('Arroz con pollo', '01:00:00', 4, 300, 'Cocinar el arroz en el caldo')
+          self.logica.crear_receta('Sancocho', '02:00:00', 8, 400, 'Agregar el pollo al final')
+          self.logica.crear_receta('Ajiaco', '01:00:00', 6, 200, 'Hervir las papas')
+
+          recetas = self.logica.buscar_recetas('pollo')
+          # Las recetas con la palabra en el nombre van primero
+          self.assertEqual([receta['nombre'] for receta in recetas], ['Arroz con pollo', 'Sancocho'])
+          self.assertIn('relevancia', recetas[0])
+          self.assertEqual(self.logica.buscar_recetas('pollo arroz')[0]['nombre'], 'Arroz con pollo')
+          self.assertEqual(self.logica.buscar_recetas('lentejas'), [])
+          self.assertEqual(self.logica.buscar_recetas('  '), [])
+
+     def test_buscar_recetas_sin_tildes_y_por_prefijo(self):
+          self.logica.crear_receta('Canción de limón', '00:30:00', 2, 100, 'Exprimir los limones')
+
+          self.assertEqual(len(self.logica.buscar_recetas('CANCION LIMON')), 1)
+          self.assertEqual(len(self.logica.buscar_recetas('canc')), 1)
+          self.assertEqual(len(self.logica.buscar_recetas('exprim')), 1)
+          # Los operadores de FTS5 se toman como texto
+          self.assertEqual(len(self.logica.buscar_recetas('limón" OR "x')), 0)
+          self.assertEqual(len(self.logica.buscar_recetas('limón*')), 1)
+
+     def test_buscar_recetas_por_paginas(self):
+          for i in range(0, 7):
+               self.logica.crear_receta('Sopa {}'.format(i), '00:30:00', 2, 100, 'Hervir ' * (i + 1))
+
+          recetas = []
+          pagina = self.logica.buscar_recetas('hervir', 3)
+          while len(pagina) > 0:
+               recetas.extend(pagina)
+               pagina = self.logica.buscar_recetas('hervir', 3, pagina[-1])
+          self.assertEqual(len(recetas), 7)
+          self.assertEqual(len({receta['id'] for receta in recetas}), 7)
+          relevancias = [(receta['relevancia'], receta['id']) for receta in recetas]
+          self.assertEqual(relevancias, sorted(relevancias))
+
+          # Con más coincidencias que el límite se pagina por id sin calcular la relevancia
+          with mock.patch('src.logica.logica_recetario.LIMITE_RELEVANCIA', 4):
+               primera = self.logica.buscar_recetas('hervir', 5)
+               segunda = self.logica.buscar_recetas('hervir', 5, primera[-1])
+          self.assertEqual([receta['id'] for receta in primera + segunda], sorted(receta['id'] for receta in recetas))
+          self.assertEqual({receta['relevancia'] for receta in primera}, {None})
+
+     def test_buscar_recetas_conserva_el_orden_entre_paginas(self):
+          for i in range(0, 3):
+               self.logica.crear_receta('Sopa {}'.format(i), '00:30:00', 2, 100, 'Hervir ' * (i + 1))
+
+          with mock.patch('src.logica.logica_recetario.LIMITE_RELEVANCIA', 4):
+               primera = self.logica.buscar_recetas('hervir', 2)
+               # Entre páginas las coincidencias pasan el límite: la búsqueda sigue ordenada por relevancia
+               for i in range(3, 6):
+                    self.logica.crear_receta('Sopa {}'.format(i), '00:30:00', 2, 100, 'Hervir')
+               segunda = self.logica.buscar_recetas('hervir', 2, primera[-1])
+
+               # Y una búsqueda que empezó por id sigue por id aunque queden menos coincidencias
+               por_id = self.logica.buscar_recetas('hervir', 2)
+               for receta in self.logica.buscar_recetas('hervir', 10, por_id[-1])[:3]:
+                    self.logica.eliminar_receta(receta['id'])
+               siguiente = self.logica.buscar_recetas('hervir', 10, por_id[-1])
+
+          self.assertNotIn(None, [receta['relevancia'] for receta in primera + segunda])
+          relevancias = [(receta['relevancia'], receta['id']) for receta in primera + segunda]
+          self.assertEqual(relevancias, sorted(relevancias))
+          self.assertEqual({receta['relevancia'] for receta in por_id + siguiente}, {None})
+          self.assertEqual(len(siguiente), 1)
+          self.assertGreater(siguiente[0]['id'], por_id[-1]['id'])
+
+     def test_buscar_recetas_sin_indice_escapa_comodines(self):
+          self.logica.crear_receta('Sopa_de_pollo', '00:30:00', 2, 100, 'Hervir')
+          self.logica.crear_receta('Sopa de pollo', '00:30:00', 2, 100, 'Hervir')
+
+          with mock.patch.object(self.logica, 'busqueda_texto_completo', False):
+               recetas = self.logica.buscar_recetas('sopa_de')
+
+          self.assertEqual([(receta['nombre'], receta['relevancia']) for receta in recetas], [('Sopa_de_pollo', None)])
+
+     def test_buscar_recetas_despues_de_editar_y_eliminar(self):
+          cambio = self.logica.crear_receta('Ajiaco', '01:00:00', 6, 200, 'Hervir las papas')
+          id_receta = cambio['receta']['id']
+
+          self.logica.editar_receta(id_receta, 'Sancocho', '02:00:00', 8, 400, 'Hervir la yuca')
+          self.assertEqual(self.logica.buscar_recetas('ajiaco'), [])
+          self.assertEqual(self.logica.buscar_recetas('papas'), [])
+          self.assertEqual([receta['id'] for receta in self.logica.buscar_recetas('sancocho yuca')], [id_receta])
+
+          self.logica.eliminar_receta(id_receta)
+          self.assertEqual(self.logica.buscar_recetas('sancocho'), [])
+
+     def test_agregar_ingrediente_receta_con_el_id_del_ingrediente(self):
+          id_receta = self.logica.crear_receta('Ajiaco', '01:00:00', 4, 200, 'Hervir')['receta']['id']
+          id_papa = self.logica.crear_ingrediente('Papa', 'libra', 1000, 'Plaza')['ingrediente']['id']
+          receta = self.logica.dar_receta(id_receta)
+
+          self.assertEqual(self.logica.validar_crear_editar_ingReceta(receta, id_papa, 2), '')
+          self.assertEqual(self.logica.validar_crear_editar_ingReceta(receta, id_papa + 1, 2), 'Ingrediente Invalido')
+          self.assertEqual(self.logica.validar_crear_editar_ingReceta(receta, None, 2), 'Ingrediente Invalido')
+          self.assertEqual(self.logica.agregar_ingrediente_receta(receta, id_papa, 2),
+                           {'ingrediente_receta': {'ingrediente': 'Papa', 'unidad': 'libra', 'cantidad': 2},
+                            'posicion_anterior': None, 'posicion': 0})
+          self.assertEqual(self.logica.dar_ingredientes_receta(id_receta), [{'ingrediente': 'Papa', 'unidad': 'libra', 'cantidad': 2}])
+          self.assertEqual(self.logica.agregar_ingrediente_receta(receta, id_papa + 1, 2), False)
+
+     def test_agregar_ingrediente_receta_repetido_queda_despues(self):
+          id_receta = self.logica.crear_receta('Ajiaco', '01:00:00', 4, 200, 'Hervir')['receta']['id']
+          id_papa = self.logica.crear_ingrediente('Papa', 'libra', 1000, 'Plaza')['ingrediente']['id']
+          id_yuca = self.logica.crear_ingrediente('Yuca', 'libra', 2000, 'Plaza')['ingrediente']['id']
+          receta = self.logica.dar_receta(id_receta)
+          self.logica.agregar_ingrediente_receta(receta, id_papa, 2)
+          self.logica.agregar_ingrediente_receta(receta, id_yuca, 1)
+
+          # La línea idéntica a una existente va después de ella, como en el orden de dar_ingredientes_receta
+          cambio = self.logica.agregar_ingrediente_receta(receta, id_papa, 2)
+
+          self.assertEqual(cambio, {'ingrediente_receta': {'ingrediente': 'Papa', 'unidad': 'libra', 'cantidad': 2},
+                                    'posicion_anterior': None, 'posicion': 1})
+          self.assertEqual([linea['ingrediente'] for linea in self.logica.dar_ingredientes_receta(id_receta)],
+                           ['Papa', 'Papa', 'Yuca'])
+
+     def test_validar_editar_ingrediente_sin_cambiar_nombre_ni_unidad(self):
+          id_papa = self.logica.crear_ingrediente('Papa', 'libra', '1000', 'Plaza')['ingrediente']['id']
+          id_yuca = self.logica.crear_ingrediente('Yuca', 'libra', '2000', 'Plaza')['ingrediente']['id']
+
+          self.assertEqual(self.logica.validar_crear_editar_ingrediente('Papa', 'libra', '1200', 'Tienda'), 'Ingrediente ya existe')
+          self.assertEqual(self.logica.validar_crear_editar_ingrediente('Papa', 'libra', '1200', 'Tienda', id_papa), '')
+          self.assertEqual(self.logica.validar_crear_editar_ingrediente('Papa', 'libra', '1200', 'Tienda', id_yuca), 'Ingrediente ya existe')
+
+     def test_validar_editar_receta_sin_cambiar_nombre(self):
+          id_ajiaco = self.logica.crear_receta('Ajiaco', '01:00:00', 4, 500, 'Hervir')['receta']['id']
+          id_tamal = self.logica.crear_receta('Tamal', '02:00:00', 6, 700, 'Envolver')['receta']['id']
+
+          self.assertEqual(self.logica.validar_crear_editar_receta(-1, 'Ajiaco', '01:30:00', 6, 450, 'Hervir'), 'Receta ya existe')
+          self.assertEqual(self.logica.validar_crear_editar_receta(id_ajiaco, 'Ajiaco', '01:30:00', 6, 450, 'Hervir'), '')
+          self.assertEqual(self.logica.validar_crear_editar_receta(id_tamal, 'Ajiaco', '01:30:00', 6, 450, 'Hervir'), 'Receta ya existe')
+
+          self.logica.editar_receta(id_ajiaco, 'Ajiaco', '01:30:00', 6, 450, 'Hervir')
+          self.assertEqual(self.logica.dar_receta(id_ajiaco)['personas'], 6)
+
+     def test_editar_ingrediente_receta_retorna_el_cambio(self):
+          id_receta = self.crear_receta_para_preparar()
+          receta = self.logica.dar_receta(id_receta)
+          papa = [ingrediente for ingrediente in self.logica.dar_ingredientes() if ingrediente['nombre'] == 'Papa criolla'][0]
+
+          cambio = self.logica.editar_ingrediente_receta(0, receta, papa['id'], '3')
+
+          self.assertEqual(cambio, {'ingrediente_receta': {'ingrediente': 'Papa criolla', 'unidad': 'libra', 'cantidad': 3.0},
+                                    'posicion_anterior': 0, 'posicion': 1})
+          self.assertEqual(self.logica.dar_ingredientes_receta(id_receta), [
+               {'ingrediente': 'Papa criolla', 'unidad': 'libra', 'cantidad': 2.0},
+               {'ingrediente': 'Papa criolla', 'unidad': 'libra', 'cantidad': 3.0}
+          ])
+          self.assertEqual(self.logica.dar_preparacion(id_receta, 4)['costo'], 5000)
+          self.assertEqual(self.logica.editar_ingrediente_receta(2, receta, papa['id'], 1), False)
+          self.assertEqual(self.logica.editar_ingrediente_receta(0, receta, papa['id'], 0), False)
+
+     def test_eliminar_ingrediente_receta_retorna_el_cambio(self):
+          id_receta = self.crear_receta_para_preparar()
+          receta = self.logica.dar_receta(id_receta)
+
+          cambio = self.logica.eliminar_ingrediente_receta(1, receta)
+
+          self.assertEqual(cambio, {'ingrediente_receta': {'ingrediente': 'Papa criolla', 'unidad': 'libra', 'cantidad': 2.0},
+                                    'posicion_anterior': 1, 'posicion': None})
+          self.assertEqual(self.logica.dar_ingredientes_receta(id_receta), [
+               {'ingrediente': 'Aguacate', 'unidad': 'unidad', 'cantidad': 1.0}
+          ])
+          self.assertEqual(self.logica.dar_preparacion(id_receta, 4)['costo'], 5000)
+          self.assertEqual(self.logica.eliminar_ingrediente_receta(1, receta), False)
+
+     def test_listas_de_recetas_no_cargan_las_instrucciones(self):
+          id_receta = self.logica.crear_receta('Ajiaco', '01:00:00', 4, 200, 'Hervir ' * 1000)['receta']['id']
+          sentencias = []
+          registrar = lambda conexion, cursor, sentencia, *args: sentencias.append(sentencia)
+          event.listen(engine, 'before_cursor_execute', registrar)
+          try:
+               recetas = self.logica.dar_recetas()
+               pagina = self.logica.dar_recetas_pagina(10)
+               encontradas = self.logica.buscar_recetas('ajiaco')
+          finally:
+               event.remove(engine, 'before_cursor_execute', registrar)
+
+          self.assertEqual(recetas, [{'id': id_receta, 'nombre': 'Ajiaco'}])
+          self.assertEqual(pagina, recetas)
+          self.assertEqual(encontradas[0]['id'], id_receta)
+          self.assertFalse(any('instrucciones' in sentencia for sentencia in sentencias if 'receta_fts' not in sentencia))
+          self.assertEqual(self.logica.dar_receta(id_receta)['preparacion'], 'Hervir ' * 1000)
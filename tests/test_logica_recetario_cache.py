@@ -0,0 +1,111 @@
+import threading
+import unittest
+
+from src.logica.LogicaMock import LogicaMock
+from src.logica.logica_recetario_cache import LogicaRecetarioCache
+
+
+class LogicaRecetarioCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.mock = LogicaMock()
+        self.logica = LogicaRecetarioCache(self.mock, tamano_maximo=3)
+
+    def test_consulta_repetida_es_acierto(self):
+        primera = self.logica.dar_recetas()
+        segunda = self.logica.dar_recetas()
+
+        self.assertIs(primera, segunda)
+        self.assertEqual(self.logica.dar_estadisticas_cache()['aciertos'], 1)
+        self.assertEqual(self.logica.dar_estadisticas_cache()['fallos'], 1)
+
+    def test_llave_incluye_argumentos(self):
+        self.logica.dar_receta(0)
+        self.logica.dar_receta(1)
+        self.logica.dar_recetas_pagina(1, self.logica.dar_recetas()[0])
+        self.logica.dar_recetas_pagina(1, self.logica.dar_recetas()[0])
+
+        self.assertEqual(self.logica.dar_receta(1)['nombre'], 'Berenjenas parmesanas')
+        self.assertEqual(self.logica.dar_estadisticas_cache()['fallos'], 4)
+
+    def test_resultados_inmutables(self):
+        recetas = self.logica.dar_recetas()
+
+        with self.assertRaises(TypeError):
+            recetas[0]['nombre'] = 'Otra'
+        with self.assertRaises(AttributeError):
+            recetas.append({})
+        self.assertEqual(self.logica.dar_recetas()[0]['nombre'], 'Ajiaco')
+
+    def test_escritura_invalida(self):
+        self.logica.dar_recetas()
+        self.logica.crear_receta('Sancocho', '02:00:00', 8, 300, 'Hervir')
+
+        self.assertEqual(len(self.logica.dar_recetas()), 3)
+        self.assertEqual(self.logica.dar_estadisticas_cache()['version'], 1)
+        self.assertEqual(self.logica.dar_estadisticas_cache()['aciertos'], 0)
+
+    def test_agregar_ingrediente_receta_invalida(self):
+        receta = self.logica.dar_receta(0)
+        ingredientes_antes = self.logica.dar_ingredientes_receta(0)
+        self.logica.agregar_ingrediente_receta(receta, self.logica.dar_ingredientes()[0], 3)
+
+        self.assertEqual(len(self.logica.dar_ingredientes_receta(0)), len(ingredientes_antes) + 1)
+
+    def test_limite_lru(self):
+        self.logica.dar_receta(0)
+        self.logica.dar_receta(1)
+        self.logica.dar_recetas()
+        self.logica.dar_receta(0)
+        self.logica.dar_ingredientes()
+
+        self.assertEqual(self.logica.dar_estadisticas_cache()['tamano'], 3)
+        self.logica.dar_receta(0)
+        self.assertEqual(self.logica.dar_estadisticas_cache()['aciertos'], 2)
+        self.logica.dar_receta(1)
+        self.assertEqual(self.logica.dar_estadisticas_cache()['fallos'], 5)
+
+    def test_metodos_sin_cache_se_delegan(self):
+        self.assertEqual(self.logica.validar_crear_editar_receta(-1, 'Sancocho', '02:00:00', 8, 300, 'Hervir'), '')
+        self.assertEqual(self.logica.dar_estadisticas_cache()['fallos'], 0)
+
+    def test_consulta_no_guarda_resultado_si_hubo_escritura(self):
+        dar_recetas = self.mock.dar_recetas
+
+        def dar_recetas_con_escritura():
+            # Otra escritura termina mientras la consulta está en curso
+            recetas = dar_recetas()
+            self.logica.crear_receta('Sancocho', '02:00:00', 8, 300, 'Hervir')
+            return recetas
+
+        self.mock.dar_recetas = dar_recetas_con_escritura
+        self.assertEqual(len(self.logica.dar_recetas()), 2)
+        self.mock.dar_recetas = dar_recetas
+
+        self.assertEqual(self.logica.dar_estadisticas_cache()['tamano'], 0)
+        self.assertEqual(len(self.logica.dar_recetas()), 3)
+
+    def test_consulta_no_bloquea_otros_hilos(self):
+        en_consulta = threading.Event()
+        continuar = threading.Event()
+        dar_recetas = self.mock.dar_recetas
+
+        def dar_recetas_lenta():
+            en_consulta.set()
+            continuar.wait(5)
+            return dar_recetas()
+
+        self.mock.dar_recetas = dar_recetas_lenta
+        hilo = threading.Thread(target=self.logica.dar_recetas)
+        hilo.start()
+        try:
+            self.assertTrue(en_consulta.wait(5))
+            # Mientras la consulta del otro hilo sigue en curso, este hilo consulta y escribe
+            self.assertEqual(self.logica.dar_receta(0)['nombre'], 'Ajiaco')
+            self.logica.crear_receta('Sancocho', '02:00:00', 8, 300, 'Hervir')
+        finally:
+            continuar.set()
+            hilo.join(5)
+        self.mock.dar_recetas = dar_recetas
+
+        self.assertEqual(len(self.logica.dar_recetas()), 3)
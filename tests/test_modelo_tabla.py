@@ -0,0 +1,137 @@
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QModelIndex, QPoint, Qt
+from PyQt5.QtGui import QIcon
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication, QTableView
+
+from src.logica.LogicaMock import LogicaMock
+from src.vista.ModeloTabla import DelegadoBoton, ModeloTabla
+
+COLUMNAS = [("Nombre", 'nombre', None), ("", None, "Editar")]
+
+
+class ModeloTablaTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.aplicacion = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.recetas = [{'id': i, 'nombre': 'Receta {:03d}'.format(i)} for i in range(25)]
+        self.pedidos = []
+
+    def pedir_pagina(self, tamano_pagina, despues_de, entregar):
+        inicio = 0 if despues_de == None else despues_de['id'] + 1
+        self.pedidos.append((tamano_pagina, despues_de, entregar))
+        entregar(self.recetas[inicio:inicio + tamano_pagina])
+
+    def test_carga_por_paginas(self):
+        modelo = ModeloTabla(COLUMNAS, pedir_pagina=self.pedir_pagina, tamano_pagina=10)
+
+        while modelo.canFetchMore(QModelIndex()):
+            modelo.fetchMore(QModelIndex())
+
+        self.assertEqual(modelo.rowCount(), 25)
+        self.assertEqual(len(self.pedidos), 3)
+        self.assertEqual(modelo.data(modelo.index(12, 0)), 'Receta 012')
+        self.assertEqual(modelo.data(modelo.index(12, 1), Qt.ToolTipRole), 'Editar')
+        self.assertEqual(modelo.headerData(0, Qt.Horizontal), 'Nombre')
+
+    def test_pagina_de_generacion_anterior_se_descarta(self):
+        pendientes = []
+        modelo = ModeloTabla(COLUMNAS, pedir_pagina=lambda tamano, despues, entregar: pendientes.append(entregar),
+                             tamano_pagina=10)
+
+        modelo.fetchMore(QModelIndex())
+        self.assertFalse(modelo.canFetchMore(QModelIndex()))
+        modelo.reiniciar()
+        pendientes[0](self.recetas[:10])
+        self.assertEqual(modelo.rowCount(), 0)
+
+        pendientes[1](self.recetas[:3])
+        self.assertEqual(modelo.rowCount(), 3)
+        self.assertFalse(modelo.canFetchMore(QModelIndex()))
+
+    def test_asignar_filas(self):
+        modelo = ModeloTabla(COLUMNAS)
+        modelo.asignar_filas(LogicaMock().dar_recetas())
+
+        self.assertEqual(modelo.rowCount(), 2)
+        self.assertEqual(modelo.dar_fila(1)['nombre'], 'Berenjenas parmesanas')
+        self.assertFalse(modelo.canFetchMore(QModelIndex()))
+
+    def test_delegado_emite_fila_presionada(self):
+        modelo = ModeloTabla(COLUMNAS)
+        modelo.asignar_filas(self.recetas[:5])
+        tabla = QTableView()
+        tabla.setModel(modelo)
+        delegado = DelegadoBoton(QIcon(), tabla)
+        tabla.setItemDelegateForColumn(1, delegado)
+        tabla.resize(400, 400)
+        tabla.show()
+        filas = []
+        delegado.presionado.connect(filas.append)
+
+        centro = tabla.visualRect(modelo.index(3, 1)).center()
+        QTest.mouseClick(tabla.viewport(), Qt.LeftButton, Qt.NoModifier, centro)
+        QTest.mouseClick(tabla.viewport(), Qt.LeftButton, Qt.NoModifier,
+                         tabla.visualRect(modelo.index(3, 1)).topLeft() + QPoint(1, 1))
+
+        self.assertEqual(filas, [3])
+
+    def test_cambios_de_una_fila_no_reinician_el_modelo(self):
+        modelo = ModeloTabla(COLUMNAS)
+        modelo.asignar_filas(self.recetas[:5])
+        senales = []
+        modelo.modelReset.connect(lambda: senales.append('reset'))
+        modelo.rowsInserted.connect(lambda padre, inicio, fin: senales.append(('insertada', inicio, fin)))
+        modelo.rowsRemoved.connect(lambda padre, inicio, fin: senales.append(('eliminada', inicio, fin)))
+        modelo.dataChanged.connect(
+            lambda inicio, fin, roles=[]: senales.append(('cambiada', inicio.row(), fin.row(), fin.column())))
+
+        modelo.insertar_fila(2, {'id': 99, 'nombre': 'Nueva'})
+        modelo.actualizar_fila(4, {'id': 3, 'nombre': 'Editada'})
+        modelo.eliminar_fila(0)
+
+        self.assertEqual(senales, [('insertada', 2, 2), ('cambiada', 4, 4, 1), ('eliminada', 0, 0)])
+        self.assertEqual([fila['nombre'] for fila in modelo.filas],
+                         ['Receta 001', 'Nueva', 'Receta 002', 'Editada', 'Receta 004'])
+
+    def test_aplicar_cambio_ignora_filas_fuera_de_las_paginas_cargadas(self):
+        modelo = ModeloTabla(COLUMNAS, pedir_pagina=self.pedir_pagina, tamano_pagina=10)
+        modelo.fetchMore(QModelIndex())
+        nueva = {'id': 99, 'nombre': 'Nueva'}
+
+        modelo.aplicar_cambio(None, 10, nueva)
+        self.assertEqual(modelo.rowCount(), 10)
+        modelo.aplicar_cambio(None, 3, nueva)
+        modelo.aplicar_cambio(3, 3, dict(nueva, nombre='Editada'))
+        self.assertEqual(modelo.dar_fila(3)['nombre'], 'Editada')
+        modelo.aplicar_cambio(3, 25, nueva)
+        self.assertEqual(modelo.rowCount(), 10)
+        modelo.aplicar_cambio(0, None, None)
+        self.assertEqual(modelo.dar_fila(0)['nombre'], 'Receta 001')
+
+    def test_aplicar_cambio_con_pagina_en_camino_vuelve_a_pedirla(self):
+        pendientes = []
+        modelo = ModeloTabla(COLUMNAS, pedir_pagina=lambda tamano, despues, entregar: pendientes.append((despues, entregar)),
+                             tamano_pagina=10)
+        modelo.fetchMore(QModelIndex())
+        pendientes[0][1](self.recetas[:10])
+
+        # Se pide la segunda página y, antes de que llegue, se crea una fila justo después de las cargadas
+        modelo.fetchMore(QModelIndex())
+        nueva = {'id': 99, 'nombre': 'Receta 009b'}
+        modelo.aplicar_cambio(None, 10, nueva)
+
+        self.assertEqual(len(pendientes), 3)
+        self.assertEqual(pendientes[2][0], self.recetas[9])
+        pendientes[1][1](self.recetas[10:20])
+        self.assertEqual(modelo.rowCount(), 10)
+        pendientes[2][1]([nueva] + self.recetas[10:19])
+        self.assertEqual(modelo.dar_fila(10), nueva)
+        self.assertEqual(modelo.rowCount(), 20)
@@ -0,0 +1,69 @@
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from src.vista.Navegador import Navegador
+
+
+class NavegadorTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.aplicacion = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.contador = 0
+        self.cargas = []
+        self.creadas = 0
+        self.navegador = Navegador(lambda: self.contador)
+
+    def crear(self):
+        self.creadas += 1
+        return QWidget()
+
+    def mostrar(self, nombre, llave=None, recargar=False):
+        return self.navegador.mostrar(nombre, self.crear, lambda vista: self.cargas.append(nombre),
+                                      llave=llave, recargar=recargar)
+
+    def test_ida_y_vuelta_sin_cambios_no_recarga(self):
+        lista = self.mostrar('lista')
+        receta = self.mostrar('receta', llave=1)
+        self.assertIs(self.mostrar('lista'), lista)
+        self.assertIs(self.mostrar('receta', llave=1), receta)
+
+        self.assertEqual(self.creadas, 2)
+        self.assertEqual(self.cargas, ['lista', 'receta'])
+        self.assertTrue(receta.isVisible())
+        self.assertFalse(lista.isVisible())
+
+    def test_recarga_si_cambia_el_contador_o_la_llave(self):
+        self.mostrar('receta', llave=1)
+        self.mostrar('receta', llave=2)
+        self.contador += 1
+        self.mostrar('receta', llave=2)
+        self.mostrar('receta', llave=2, recargar=True)
+
+        self.assertEqual(self.cargas, ['receta'] * 4)
+        self.assertEqual(self.creadas, 1)
+
+    def test_marcar_vigente_evita_recargar_despues_de_un_cambio_aplicado(self):
+        self.mostrar('lista')
+        self.mostrar('otra')
+        anterior = self.contador
+        self.contador += 1
+        self.navegador.marcar_vigente('lista', anterior)
+        self.navegador.marcar_vigente('otra', anterior - 1)
+        self.mostrar('lista')
+        self.mostrar('otra')
+
+        self.assertEqual(self.cargas, ['lista', 'otra', 'otra'])
+
+    def test_refrescar_solo_vistas_creadas(self):
+        self.navegador.refrescar('lista')
+        self.mostrar('lista')
+        self.navegador.refrescar('lista')
+
+        self.assertEqual(self.cargas, ['lista', 'lista'])
@@ -0,0 +1,115 @@
+import os
+import re
+import unittest
+from contextlib import contextmanager
+
+# Las pruebas usan una base de datos en memoria y no la aplicacion.sqlite de la aplicación
+os.environ.setdefault('RECETARIO_DB_URL', 'sqlite://')
+
+from sqlalchemy import event
+
+from src.logica.logica_recetario import LogicaRecetario
+from src.modelo.declarative_base import Session, engine
+from src.modelo.ingrediente import Ingrediente
+from src.modelo.ingrediente_receta import IngredienteReceta
+from src.modelo.receta import Receta
+
+# Un paso del plan es un recorrido completo cuando SQLite lee la tabla sin usar un índice
+RECORRIDO_TABLA = re.compile(r'^SCAN (TABLE )?(?!CONSTANT ROW)\w+( AS \w+)?$')
+
+
+@contextmanager
+def capturar_consultas(motor):
+    '''Registra las sentencias SELECT (con sus parámetros) que se ejecutan sobre el motor'''
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            consultas.append((statement, parameters))
+
+    event.listen(motor, 'before_cursor_execute', registrar)
+    try:
+        yield consultas
+    finally:
+        event.remove(motor, 'before_cursor_execute', registrar)
+
+
+def dar_recorridos_tabla(motor, consultas):
+    '''Ejecuta EXPLAIN QUERY PLAN para cada consulta y retorna los pasos que recorren una tabla completa'''
+    recorridos = []
+    conexion = motor.raw_connection()
+    try:
+        cursor = conexion.cursor()
+        for statement, parameters in consultas:
+            for paso in cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall():
+                if RECORRIDO_TABLA.match(paso[-1]):
+                    recorridos.append((paso[-1], statement))
+    finally:
+        conexion.close()
+    return recorridos
+
+
+class PlanesConsultaTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.logica = LogicaRecetario()
+        self.session = Session()
+
+        self.receta = Receta(nombre='Ajiaco', tiempoPreparacion='01:00:00', personasBase=6,
+                             caloriasPorcion=200, instrucciones='Hervir')
+        self.ingrediente = Ingrediente(nombre='Papa criolla', unidadMedida='libra',
+                                       sitioCompra='Plaza Concordia', valorUnidad=4090)
+        self.session.add(self.receta)
+        self.session.add(self.ingrediente)
+        self.session.flush()
+        self.session.add(IngredienteReceta(receta=self.receta.id, ingrediente=self.ingrediente.id, cantidad=2))
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.query(IngredienteReceta).delete()
+        self.session.query(Ingrediente).delete()
+        self.session.query(Receta).delete()
+        self.session.commit()
+        self.session.close()
+
+    def assertSinRecorridosTabla(self, consulta_fachada):
+        with capturar_consultas(engine) as consultas:
+            consulta_fachada()
+        self.assertGreater(len(consultas), 0)
+        self.assertEqual(dar_recorridos_tabla(engine, consultas), [])
+
+    def test_plan_dar_receta(self):
+        id_receta = self.receta.id
+        self.assertSinRecorridosTabla(lambda: self.logica.dar_receta(id_receta))
+
+    def test_plan_dar_ingredientes_receta(self):
+        id_receta = self.receta.id
+        self.assertSinRecorridosTabla(lambda: self.logica.dar_ingredientes_receta(id_receta))
+
+    def test_plan_dar_recetas_pagina(self):
+        primera_pagina = self.logica.dar_recetas_pagina(1)
+        self.assertSinRecorridosTabla(lambda: self.logica.dar_recetas_pagina(10, primera_pagina[-1]))
+
+    def test_plan_dar_ingredientes_pagina(self):
+        primera_pagina = self.logica.dar_ingredientes_pagina(1)
+        self.assertSinRecorridosTabla(lambda: self.logica.dar_ingredientes_pagina(10, primera_pagina[-1]))
+
+    def test_plan_validar_crear_editar_ingrediente(self):
+        self.assertSinRecorridosTabla(
+            lambda: self.logica.validar_crear_editar_ingrediente('Papa criolla', 'libra', 4090, 'Plaza Concordia'))
+
+    def test_plan_validar_crear_editar_receta(self):
+        self.assertSinRecorridosTabla(
+            lambda: self.logica.validar_crear_editar_receta(-1, 'Ajiaco', '01:00:00', '6', '200', 'Hervir'))
+
+    def test_plan_ingredientes_receta_de_un_ingrediente(self):
+        # Consulta que usa la cascada de Ingrediente.ingredientesRecetas al eliminar un ingrediente
+        ingrediente = self.session.query(Ingrediente).get(self.ingrediente.id)
+        self.assertSinRecorridosTabla(lambda: list(ingrediente.ingredientesRecetas))
+
+    def test_plan_dar_recetas_por_costo(self):
+        self.assertSinRecorridosTabla(lambda: self.logica.dar_recetas_por_costo(1000, 10000))
+
+    def test_plan_dar_lista_compras(self):
+        id_receta = self.receta.id
+        self.assertSinRecorridosTabla(lambda: self.logica.dar_lista_compras([(id_receta, 12)]))
@@ -0,0 +1,42 @@
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+from src.vista import Recursos
+
+
+class RecursosTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.aplicacion = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        Recursos.limpiar()
+
+    def test_icono_compartido(self):
+        icono = Recursos.dar_icono('006-add.png')
+
+        self.assertIs(Recursos.dar_icono('006-add.png'), icono)
+        self.assertFalse(icono.isNull())
+
+    def test_logo_escalado_una_vez(self):
+        logo = Recursos.dar_logo(488, 158)
+
+        self.assertIs(Recursos.dar_logo(488, 158), logo)
+        self.assertLessEqual(logo.width(), 488)
+        self.assertLessEqual(logo.height(), 158)
+        self.assertTrue(logo.width() == 488 or logo.height() == 158)
+
+    def test_ruta_de_archivo_sin_paquete_compilado(self):
+        compilado = Recursos.recursos_rc
+        Recursos.recursos_rc = None
+        try:
+            ruta = Recursos.dar_ruta('RecetarioLogo.png')
+        finally:
+            Recursos.recursos_rc = compilado
+
+        self.assertTrue(os.path.isfile(ruta))
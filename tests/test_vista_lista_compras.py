@@ -0,0 +1,63 @@
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QModelIndex, Qt
+from PyQt5.QtWidgets import QApplication
+
+from src.vista.VistaListaCompras import COLUMNA_PERSONAS, ModeloMenu
+
+
+class ModeloMenuTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.aplicacion = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.recetas = [{'id': i, 'nombre': 'Receta {:03d}'.format(i)} for i in range(25)]
+        self.pedidos = 0
+
+    def pedir_pagina(self, tamano_pagina, despues_de, entregar):
+        inicio = 0 if despues_de == None else despues_de['id'] + 1
+        self.pedidos += 1
+        entregar(self.recetas[inicio:inicio + tamano_pagina])
+
+    def test_carga_recetas_por_paginas(self):
+        modelo = ModeloMenu(self.pedir_pagina)
+        modelo.tamano_pagina = 10
+        modelo.fetchMore(QModelIndex())
+
+        self.assertEqual(modelo.rowCount(), 10)
+        self.assertTrue(modelo.canFetchMore(QModelIndex()))
+        self.assertEqual(modelo.data(modelo.index(3, 0)), 'Receta 003')
+        self.assertEqual(modelo.data(modelo.index(3, COLUMNA_PERSONAS)), 0)
+        self.assertTrue(modelo.flags(modelo.index(3, COLUMNA_PERSONAS)) & Qt.ItemIsEditable)
+        self.assertFalse(modelo.flags(modelo.index(3, 0)) & Qt.ItemIsEditable)
+
+    def test_personas_del_menu(self):
+        modelo = ModeloMenu(self.pedir_pagina)
+        modelo.tamano_pagina = 10
+        modelo.fetchMore(QModelIndex())
+
+        self.assertTrue(modelo.setData(modelo.index(2, COLUMNA_PERSONAS), 4))
+        self.assertTrue(modelo.setData(modelo.index(5, COLUMNA_PERSONAS), 6))
+        self.assertTrue(modelo.setData(modelo.index(5, COLUMNA_PERSONAS), 0))
+        self.assertFalse(modelo.setData(modelo.index(7, 0), 'Otra'))
+        # Las personas se conservan al cargar más páginas
+        modelo.fetchMore(QModelIndex())
+
+        self.assertEqual(modelo.data(modelo.index(2, COLUMNA_PERSONAS), Qt.EditRole), 4)
+        self.assertEqual(modelo.dar_menu(), [(2, 4)])
+
+    def test_reiniciar_descarta_el_menu(self):
+        modelo = ModeloMenu(self.pedir_pagina)
+        modelo.fetchMore(QModelIndex())
+        modelo.setData(modelo.index(2, COLUMNA_PERSONAS), 4)
+
+        modelo.reiniciar()
+
+        self.assertEqual(modelo.dar_menu(), [])
+        self.assertEqual(modelo.rowCount(), 25)
+        self.assertEqual(self.pedidos, 2)